@@ -1,6 +1,17 @@
 import os
+import tempfile
+import time
+import pandas as pd
 import streamlit as st
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+
+# Constants
+CHUNK_ROWS = 5000  # rows read from the CSV and sent per batch request
+POOL_SIZE = 8  # pooled connections, and concurrent requests without a batch route
+METADATA_TTL = 600  # seconds
+PREDICTION_FIELD = "readmission_probability"
 
 st.title("🏥 Readmission Predictor")
 
@@ -9,43 +20,162 @@ default_api_host = os.getenv("API_HOST", "http://localhost:8000")
 
 # Sidebar for host config
 st.sidebar.header("API Endpoint Settings")
-host = st.sidebar.text_input("API Host", default_api_host)
-
-# Form inputs
-st.header("Patient Features")
-age = st.number_input("Age", min_value=0, max_value=120, value=65)
-gender = st.selectbox("Gender", ["Unknown", "m", "f"])
-race = st.selectbox(
-    "Race", ["Unknown", "white", "native", "other", "hawaiian", "asian", "black"]
-)
-ethnicity = st.selectbox("Ethnicity", ["Unknown", "hispanic", "nonhispanic"])
-has_diabetes = st.checkbox("Has Diabetes? (Doesn't seem to influence prediction)")
-has_hypertension = st.checkbox(
-    "Has Hypertension? (Doesn't seem to influence prediction)"
-)
-num_meds = st.number_input("Number of Medications", 0, 100, 5)
-num_procedures = st.number_input("Number of Procedures", 0, 50, 2)
-
-# Submit button
-if st.button("Predict Readmission Probability"):
-    data = {
-        "age": age,
-        "gender": gender,
-        "race": race,
-        "ethnicity": ethnicity,
-        "has_diabetes": has_diabetes,
-        "has_hypertension": has_hypertension,
-        "num_meds": num_meds,
-        "num_procedures": num_procedures,
-    }
+host = st.sidebar.text_input("API Host", default_api_host).rstrip("/")
+mode = st.sidebar.radio("Mode", ["Single patient", "Batch (CSV)"])
+
+
+@st.cache_resource
+def _session():
+    """One pooled HTTP session shared by all reruns and users of the app."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@st.cache_data(ttl=METADATA_TTL, show_spinner=False)
+def _metadata(host):
+    """Category values served by the API (fetched once per host and TTL)."""
+    response = _session().get(f"{host}/metadata", timeout=10)
+    response.raise_for_status()
+    return response.json()
+
+
+@st.cache_data(ttl=METADATA_TTL, show_spinner=False)
+def _api_schema(host):
+    """Feature columns accepted by the API and whether it has a batch route."""
+    response = _session().get(f"{host}/openapi.json", timeout=10)
+    response.raise_for_status()
+    spec = response.json()
+    columns = list(spec["components"]["schemas"]["PatientFeatures"]["properties"])
+    return columns, "/predict/batch" in spec.get("paths", {})
+
+
+def _options(values):
+    return ["Unknown"] + sorted(values)
+
+
+def _single_page(session, metadata):
+    st.header("Patient Features")
+    age = st.number_input("Age", min_value=0, max_value=120, value=65)
+    gender = st.selectbox("Gender", _options(metadata["genders"]))
+    race = st.selectbox("Race", _options(metadata["races"]))
+    ethnicity = st.selectbox("Ethnicity", _options(metadata["ethnicities"]))
+    has_diabetes = st.checkbox("Has Diabetes? (Doesn't seem to influence prediction)")
+    has_hypertension = st.checkbox(
+        "Has Hypertension? (Doesn't seem to influence prediction)"
+    )
+    num_meds = st.number_input("Number of Medications", 0, 100, 5)
+    num_procedures = st.number_input("Number of Procedures", 0, 50, 2)
+
+    # Submit button
+    if st.button("Predict Readmission Probability"):
+        data = {
+            "age": age,
+            "gender": gender,
+            "race": race,
+            "ethnicity": ethnicity,
+            "has_diabetes": has_diabetes,
+            "has_hypertension": has_hypertension,
+            "num_meds": num_meds,
+            "num_procedures": num_procedures,
+        }
+
+        try:
+            response = session.post(f"{host}/predict", json=data, timeout=10)
+            if response.status_code == 200:
+                st.success(
+                    f"Predicted Readmission Probability: {response.json()[PREDICTION_FIELD]:.2%}"
+                )
+            else:
+                st.error(f"Error {response.status_code}: {response.text}")
+        except Exception as e:
+            st.error(f"Request failed: {e}")
+
 
+def _columns_payload(chunk, columns):
+    """Column batch body ({"age": [...], ...}) with missing values as nulls."""
+    features = chunk[[c for c in columns if c in chunk.columns]]
+    return features.astype(object).where(features.notna(), None).to_dict("list")
+
+
+def _score_batch(session, payload):
+    response = session.post(f"{host}/predict/batch", json=payload, timeout=60)
+    response.raise_for_status()
+    return response.json()[PREDICTION_FIELD]
+
+
+def _score_rows(session, pool, payload):
+    """Score a chunk with concurrent single-row requests (APIs without a batch route)."""
+    rows = [dict(zip(payload, values)) for values in zip(*payload.values())]
+
+    def score(row):
+        response = session.post(f"{host}/predict", json=row, timeout=10)
+        response.raise_for_status()
+        return response.json()[PREDICTION_FIELD]
+
+    return list(pool.map(score, rows))
+
+
+def _batch_page(session):
+    st.header("Batch Scoring")
+    columns, has_batch_route = _api_schema(host)
+    st.caption(
+        f"Upload a CSV with any of these columns: {', '.join(columns)}. "
+        "Other columns (e.g. a patient id) are kept in the output."
+    )
+    # Streamlit buffers the whole upload in memory; server.maxUploadSize (MB, set in
+    # Dockerfile.streamlit) is what bounds it
+    uploaded = st.file_uploader(
+        "Patients CSV", type="csv", help=f"Up to {st.get_option('server.maxUploadSize')} MB."
+    )
+    if uploaded is None or not st.button("Score File"):
+        return
+
+    progress = st.progress(0.0, text="Starting...")
+    status = st.empty()
+    # The upload is parsed and scored chunk by chunk and the scores appended to a
+    # temporary file, so no whole-file DataFrame is built. The upload itself and the
+    # download (st.download_button reads the file) are still held in memory whole.
+    output = tempfile.NamedTemporaryFile("w+", suffix=".csv", delete=False)
     try:
-        response = requests.post(f"{host}/predict", json=data)
-        if response.status_code == 200:
-            st.success(
-                f"Predicted Readmission Probability: {response.json()['readmission_probability']:.2%}"
+        scored, started = 0, time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=POOL_SIZE) as pool:
+                for i, chunk in enumerate(pd.read_csv(uploaded, chunksize=CHUNK_ROWS)):
+                    payload = _columns_payload(chunk, columns)
+                    scores = _score_batch(session, payload) if has_batch_route else _score_rows(session, pool, payload)
+                    chunk[PREDICTION_FIELD] = scores
+                    chunk.to_csv(output, header=i == 0, index=False)
+
+                    scored += len(chunk)
+                    elapsed = time.perf_counter() - started
+                    progress.progress(min(uploaded.tell() / max(uploaded.size, 1), 1.0), text=f"{scored:,} rows scored")
+                    status.metric("Throughput", f"{scored / elapsed:,.0f} rows/s")
+        except Exception as e:
+            st.error(f"Scoring failed after {scored:,} rows: {e}")
+            return
+        finally:
+            output.close()
+
+        progress.progress(1.0, text=f"Done: {scored:,} rows in {time.perf_counter() - started:.1f}s")
+        with open(output.name, "rb") as f:
+            st.download_button(
+                "Download Scores",
+                f,
+                file_name=f"{os.path.splitext(uploaded.name)[0]}_scores.csv",
+                mime="text/csv",
             )
-        else:
-            st.error(f"Error {response.status_code}: {response.text}")
-    except Exception as e:
-        st.error(f"Request failed: {e}")
+    finally:
+        os.remove(output.name)
+
+
+session = _session()
+try:
+    if mode == "Single patient":
+        _single_page(session, _metadata(host))
+    else:
+        _batch_page(session)
+except requests.RequestException as e:
+    st.error(f"Could not reach the API at {host}: {e}")
@@ -38,6 +38,13 @@ CREATE TABLE readmission.encounter_fact (
     had_surgery BOOL,
     had_biopsy BOOL,
 
+    -- Patient history (computed by db.temporal_features after the load)
+    prior_encounters_30d USMALLINT,
+    prior_encounters_90d USMALLINT,
+    prior_encounters_365d USMALLINT,
+    days_since_last_discharge INTEGER,
+    cumulative_chronic_dx_count USMALLINT,
+
     -- Label
     readmitted BOOL
 );
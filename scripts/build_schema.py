@@ -8,11 +8,28 @@ This script executes one or more SQL files sequentially to build or update a dat
 - The `--sql-dir` flag sets the root directory where SQL files and folders are located.
 - The database connection configuration is loaded from a YAML file via `--config-path`.
 - Progress and warnings are logged via Python's logging module.
+- With `--profile`, every statement runs under DuckDB's query profiler. A JSON report
+  (wall time, rows produced, peak memory, operator tree per statement) is written to
+  --profile-dir and diffed against the previous run; the script exits with status 1
+  if any statement slowed down beyond --threshold.
+- After the SQL files, patient history features are computed into
+  readmission.encounter_fact (see `db.temporal_features`); skip with --no-temporal.
+- The cohort aggregate cube `readmission.cohort_cube` is then rebuilt from the feature
+  store for population analytics (see `db.cohort_cube`); skip with --no-cohorts.
+- If the config sets `feature_partition_dir`, the feature store is then written there as
+  year/month partitioned Parquet behind `readmission.encounter_fact_partitioned`, which
+  training reads with partition pruning (see `db.partitioned_store`); skip with
+  --no-partitions. Each build writes a new version of the partitions; older versions
+  that no remaining snapshot reads are deleted after the snapshot is published.
+- If the config sets `snapshot_dir`, a successful build publishes a read-only snapshot
+  of the database for readers (see `db.snapshot`), keeping the newest `snapshot_retain`.
+  Use --no-snapshot to skip it (e.g. when building only part of the schema).
 
 Usage examples:
     python build_schema.py
     python build_schema.py --sql-paths model/ load/
     python build_schema.py --sql-paths model/encounter_dim.sql
+    python build_schema.py --profile --threshold 1.5
 
 Note: Ensure the feature store schema is built after required dimension tables are created.
 """
@@ -20,8 +37,13 @@ Note: Ensure the feature store schema is built after required dimension tables a
 import argparse
 import logging
 import os
+import sys
 import yaml
+from db import partitioned_store, query_profile, snapshot
+from db.cohort_cube import build_cohort_cube
+from db.temporal_features import apply_temporal_features
 from db.connection import create_db_connection
+from tabulate import tabulate
 
 # CONSTANTS
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -31,6 +53,8 @@ DEFAULT_SQL_FILES = [
     "load/clinical.sql",
     "load/readmission.sql",
 ]
+PROFILE_DIR = os.path.join("profiles", "schema_build")
+TOP_STATEMENTS = 10
 
 logging.basicConfig(level=logging.INFO)
 _logger = logging.getLogger(__name__)
@@ -62,6 +86,49 @@ def _arg_parse():
             "Directories will be recursively searched for .sql files."
         ),
     )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile each statement and compare against the previous profiled run.",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        type=str,
+        default=PROFILE_DIR,
+        help="Directory where profiling reports are stored.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=query_profile.DEFAULT_THRESHOLD,
+        help="Allowed per-statement slowdown ratio versus the previous run.",
+    )
+    parser.add_argument(
+        "--min-seconds",
+        type=float,
+        default=query_profile.DEFAULT_MIN_SECONDS,
+        help="Ignore per-statement slowdowns smaller than this many seconds.",
+    )
+    parser.add_argument(
+        "--no-temporal",
+        action="store_true",
+        help="Do not compute patient history features after the SQL files.",
+    )
+    parser.add_argument(
+        "--no-cohorts",
+        action="store_true",
+        help="Do not rebuild the cohort aggregate cube after the build.",
+    )
+    parser.add_argument(
+        "--no-partitions",
+        action="store_true",
+        help="Do not rewrite the partitioned feature store after the build.",
+    )
+    parser.add_argument(
+        "--no-snapshot",
+        action="store_true",
+        help="Do not publish a reader snapshot after the build.",
+    )
     return parser.parse_args()
 
 
@@ -100,6 +167,84 @@ def _execute_sql_files(conn, sql_files):
     _logger.info(f"✅ Successfully executed {len(sql_files)} SQL files.")
 
 
+def _profile_sql_files(conn, sql_files, base_dir):
+    """Execute SQL files statement by statement under the query profiler."""
+    raw_conn = conn.connect()
+    query_profile.enable_profiling(raw_conn)
+    statements = []
+    try:
+        for sql_file in sql_files:
+            _logger.info(f"Profiling {sql_file} ...")
+            statements.extend(query_profile.profile_file(raw_conn, sql_file, base_dir))
+    finally:
+        conn.close()
+    _logger.info(f"✅ Successfully profiled {len(statements)} statements in {len(sql_files)} SQL files.")
+    return query_profile.build_report(statements)
+
+
+def _has_feature_table(conn, step):
+    exists = conn.execute(
+        "SELECT COUNT(*) AS n FROM duckdb_tables() "
+        "WHERE schema_name = 'readmission' AND table_name = 'encounter_fact'"
+    )["n"][0]
+    if not exists:
+        _logger.warning(f"readmission.encounter_fact does not exist; skipping {step}.")
+    return exists
+
+
+def _apply_temporal_features(conn, skip):
+    if skip or not _has_feature_table(conn, "temporal features"):
+        return
+    apply_temporal_features(conn)
+
+
+def _build_cohort_cube(conn, skip):
+    if skip or not _has_feature_table(conn, "cohort cube"):
+        return
+    build_cohort_cube(conn)
+
+
+def _materialize_partitions(conn, config, skip):
+    if skip or not config.get(partitioned_store.CONFIG_KEY):
+        return
+    if _has_feature_table(conn, "feature store partitions"):
+        partitioned_store.materialize_partitions(conn, config[partitioned_store.CONFIG_KEY])
+
+
+def _publish_snapshot(config, skip):
+    if skip or not config.get("snapshot_dir"):
+        return
+    retain = config.get("snapshot_retain", snapshot.DEFAULT_RETAIN)
+    path = snapshot.publish_snapshot(config["database"], config["snapshot_dir"], retain)
+    _logger.info(f"📸 Readers now use snapshot {path}")
+
+
+def _prune_partition_versions(config):
+    # Versions that neither the current view nor a remaining snapshot reads
+    if config.get(partitioned_store.CONFIG_KEY):
+        partitioned_store.prune_versions(config[partitioned_store.CONFIG_KEY], config.get("snapshot_dir"))
+
+
+def _print_profile(report, diff):
+    slowest = sorted(report["statements"], key=lambda s: s["wall_time"], reverse=True)
+    rows = [
+        [s["file"], s["label"], f"{s['wall_time']:.3f}", s["rows"], f"{s['peak_memory'] / 2**20:.1f}"]
+        for s in slowest[:TOP_STATEMENTS]
+    ]
+    print(f"\n⏱️ Slowest statements (total {report['total_time']:.2f}s):")
+    print(tabulate(rows, headers=["File", "Statement", "Seconds", "Rows", "Peak MiB"], tablefmt="fancy_grid"))
+
+    if diff is None:
+        return
+    for s in diff["new"]:
+        _logger.info(f"📋 New statement {s['key']}: {s['label']}")
+    for r in diff["regressions"]:
+        _logger.warning(
+            f"❌ {r['key']} regressed: {r['current']:.3f}s vs {r['previous']:.3f}s "
+            f"({r['ratio']:.2f}x, rows {r['previous_rows']} -> {r['rows']}): {r['label']}"
+        )
+
+
 if __name__ == "__main__":
     args = _arg_parse()
 
@@ -110,4 +255,30 @@ if __name__ == "__main__":
 
     # Find and execute sql files
     sql_files = _get_sql_files(args.sql_dir, args.sql_paths)
-    _execute_sql_files(conn, sql_files)
+    if not args.profile:
+        _execute_sql_files(conn, sql_files)
+        _apply_temporal_features(conn, args.no_temporal)
+        _build_cohort_cube(conn, args.no_cohorts)
+        _materialize_partitions(conn, config, args.no_partitions)
+        _publish_snapshot(config, args.no_snapshot)
+        _prune_partition_versions(config)
+        sys.exit(0)
+
+    report = _profile_sql_files(conn, sql_files, args.sql_dir)
+    _apply_temporal_features(conn, args.no_temporal)
+    _build_cohort_cube(conn, args.no_cohorts)
+    _materialize_partitions(conn, config, args.no_partitions)
+    _publish_snapshot(config, args.no_snapshot)
+    _prune_partition_versions(config)
+    previous_path = query_profile.latest_report(args.profile_dir)
+    report_path = query_profile.save_report(report, args.profile_dir)
+    _logger.info(f"Profile report written to {report_path}")
+
+    diff = None
+    if previous_path:
+        _logger.info(f"Comparing against {previous_path}")
+        diff = query_profile.diff_reports(
+            report, query_profile.load_report(previous_path), args.threshold, args.min_seconds
+        )
+    _print_profile(report, diff)
+    sys.exit(1 if diff and diff["regressions"] else 0)
@@ -0,0 +1,86 @@
+"""
+Serving Bundle Exporter
+
+Packages a trained joblib model together with everything the API reads from the
+DuckDB warehouse at startup (feature order, defaults and the gender/race/ethnicity
+mappings) into a single versioned, checksummed serving bundle (see `api.bundle`).
+The API serves from it when SERVING_BUNDLE_PATH (or serving.bundle_path / --bundle-path
+of `serve_api.py`) points at the file, without opening the database.
+
+Usage examples:
+    python scripts/export_bundle.py
+    python scripts/export_bundle.py --output /srv/readmission/bundle.npz --min-gain-fraction 0.001
+"""
+
+import argparse
+import logging
+import os
+import yaml
+from api.bundle import export_bundle
+from api.db_helpers import load_dimension_mapping
+from api.endpoint import DEFAULTS, FEATURES, MAPPING_DIMENSIONS
+from db.connection import create_db_connection
+from joblib import load
+from ml.model import DEFAULT_MODEL_PATH, model_version
+from tabulate import tabulate
+
+# Constants
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(DEFAULT_MODEL_PATH), "serving_bundle.npz")
+
+logging.basicConfig(level=logging.INFO)
+_logger = logging.getLogger(__name__)
+
+
+def _arg_parse():
+    parser = argparse.ArgumentParser(
+        description="Export a trained model and its serving metadata to a self-contained bundle."
+    )
+    parser.add_argument(
+        "--model-path",
+        type=str,
+        default=DEFAULT_MODEL_PATH,
+        help="Path to the joblib model to bundle.",
+    )
+    parser.add_argument("--output", type=str, default=DEFAULT_OUTPUT, help="Output bundle path.")
+    parser.add_argument(
+        "--config-path",
+        type=str,
+        default="data/duckdb_config.yaml",
+        help="Path to db YAML configuration file (used to read the dimension mappings).",
+    )
+    parser.add_argument(
+        "--min-gain-fraction",
+        type=float,
+        default=None,
+        help="Drop boosted trees whose total gain is below this fraction of the ensemble gain.",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = _arg_parse()
+    with open(args.config_path) as f:
+        config = yaml.safe_load(f)
+    conn = create_db_connection(config, snapshot=True)
+    mappings = {name: load_dimension_mapping(conn, table, key) for name, (table, key) in MAPPING_DIMENSIONS.items()}
+
+    model = load(args.model_path)
+    header = export_bundle(
+        model,
+        args.output,
+        FEATURES,
+        DEFAULTS,
+        mappings,
+        min_gain_fraction=args.min_gain_fraction,
+        source=model_version(args.model_path),
+    )
+
+    rows = [
+        ["Source model", args.model_path],
+        ["Bundle", args.output],
+        ["Bundle size (bytes)", os.path.getsize(args.output)],
+        ["Checksum", header["checksum"]],
+    ] + [[f"{name} labels", len(mapping)] for name, mapping in mappings.items()]
+    print("\n📦 Serving Bundle:")
+    print(tabulate(rows, headers=["Item", "Value"], tablefmt="fancy_grid"))
+    _logger.info(f"✅ Bundle written to {args.output}")
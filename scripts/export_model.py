@@ -0,0 +1,90 @@
+"""
+Compact Model Exporter
+
+Converts a joblib model saved by `train_model.py` into a compact, pickle-free
+inference artifact (see `ml.artifact`) and prints a report comparing artifact size,
+load time and predictions against the original model.
+
+Usage examples:
+    python scripts/export_model.py
+    python scripts/export_model.py --model-path ml_model/xgboost_readmission_model.joblib --min-gain-fraction 0.001
+"""
+
+import argparse
+import json
+import logging
+import os
+import yaml
+from db.connection import create_db_connection
+from joblib import load
+from ml.artifact import ARTIFACT_EXTENSION, compare_artifact, export_compact_model
+from ml.model import DEFAULT_MODEL_PATH
+from tabulate import tabulate
+
+logging.basicConfig(level=logging.INFO)
+_logger = logging.getLogger(__name__)
+
+
+def _arg_parse():
+    parser = argparse.ArgumentParser(
+        description="Export a trained model to a compact inference artifact."
+    )
+    parser.add_argument(
+        "--model-path",
+        type=str,
+        default=DEFAULT_MODEL_PATH,
+        help="Path to the joblib model to export.",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        help="Output artifact path. Defaults to the model path with a .npz extension.",
+    )
+    parser.add_argument(
+        "--min-gain-fraction",
+        type=float,
+        default=None,
+        help="Drop boosted trees whose total gain is below this fraction of the ensemble gain.",
+    )
+    parser.add_argument(
+        "--config-path",
+        type=str,
+        default="data/duckdb_config.yaml",
+        help="Path to db YAML configuration file (used to sample rows for the report).",
+    )
+    parser.add_argument(
+        "--sample-rows",
+        type=int,
+        default=10000,
+        help="Number of feature store rows used to compare predictions.",
+    )
+    return parser.parse_args()
+
+
+def _load_sample(conn, features, limit):
+    columns = ", ".join(features)
+    return conn.execute(
+        f"SELECT {columns} FROM readmission.encounter_fact USING SAMPLE {int(limit)} ROWS"
+    )
+
+
+if __name__ == "__main__":
+    args = _arg_parse()
+    output = args.output or os.path.splitext(args.model_path)[0] + ARTIFACT_EXTENSION
+
+    model = load(args.model_path)
+    header = export_compact_model(model, output, min_gain_fraction=args.min_gain_fraction)
+
+    with open(args.config_path) as f:
+        config = yaml.safe_load(f)
+    conn = create_db_connection(config, snapshot=True)
+    sample = _load_sample(conn, header["feature_names"], args.sample_rows)
+
+    report = compare_artifact(model, output, sample, original_path=args.model_path)
+    report_path = os.path.splitext(output)[0] + ".report.json"
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print("\n📦 Artifact Report:")
+    print(tabulate(report.items(), headers=["Metric", "Value"], tablefmt="fancy_grid"))
+    _logger.info(f"Report saved to {report_path}")
@@ -0,0 +1,142 @@
+"""
+Prediction API Load Test
+
+Replays recorded (JSONL, one request body per line) or synthetic `PatientFeatures`
+payloads against the prediction API and reports throughput, latency percentiles
+and error rates. Load is either open-loop at a fixed arrival rate (--rate) or
+closed-loop at a fixed number of concurrent clients (--concurrency).
+
+- By default it targets a service already running at --url.
+- With --serve, it starts the API locally with `serve_api.py` (optionally with several
+  pre-forked --server-workers), waits for /healthz, and stops it afterwards.
+- --output saves the results as JSON; --compare prints them next to a previous run.
+
+Usage examples:
+    python scripts/load_test.py --rate 200 --duration 30
+    python scripts/load_test.py --concurrency 32 --payloads traffic.jsonl --output load.json
+    python scripts/load_test.py --serve --server-workers 4 --rate 500 --compare load.json
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import subprocess
+import sys
+import httpx
+from bench.harness import load_results, save_results
+from bench.load import (
+    DEFAULT_ROUTE,
+    flatten,
+    load_payloads,
+    run_load,
+    synthetic_payloads,
+    wait_until_healthy,
+)
+from tabulate import tabulate
+
+# Constants
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(SCRIPT_DIR, "..", "src")
+DEFAULT_URL = "http://127.0.0.1:8000"
+
+logging.basicConfig(level=logging.INFO)
+_logger = logging.getLogger(__name__)
+
+
+def _arg_parse():
+    parser = argparse.ArgumentParser(
+        description="Load test the prediction API with recorded or synthetic traffic."
+    )
+    load = parser.add_mutually_exclusive_group(required=True)
+    load.add_argument("--rate", type=float, help="Open-loop arrival rate (requests/second).")
+    load.add_argument("--concurrency", type=int, help="Closed-loop number of concurrent clients.")
+    parser.add_argument("--url", type=str, default=DEFAULT_URL, help="Base URL of the service.")
+    parser.add_argument("--route", type=str, default=DEFAULT_ROUTE, help="Route payloads are POSTed to.")
+    parser.add_argument(
+        "--payloads",
+        type=str,
+        help="JSONL file of request bodies to replay (default: synthetic payloads).",
+    )
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        default=1000,
+        help="Number of distinct synthetic payloads when --payloads is not given.",
+    )
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds of load.")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Unmeasured warm-up seconds.")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Per-request timeout in seconds.")
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Start a local API server (scripts/serve_api.py) at --url for the test.",
+    )
+    parser.add_argument(
+        "--server-workers",
+        type=int,
+        default=1,
+        help="Number of pre-forked worker processes when using --serve.",
+    )
+    parser.add_argument("--output", type=str, help="Optional path to write results as JSON.")
+    parser.add_argument("--compare", type=str, help="Previous results JSON to compare against.")
+    return parser.parse_args()
+
+
+def _start_server(url, workers):
+    """Start the pre-fork API server on the host/port of url and wait until healthy."""
+    parsed = httpx.URL(url)
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [SRC_DIR, os.getenv("PYTHONPATH")]))}
+    cmd = [
+        sys.executable, os.path.join(SCRIPT_DIR, "serve_api.py"),
+        "--host", parsed.host, "--port", str(parsed.port or 80), "--workers", str(workers),
+    ]
+    server = subprocess.Popen(cmd, env=env)
+    wait_until_healthy(url, server)
+    _logger.info(f"Server ready at {url} with {workers} worker(s)")
+    return server
+
+
+def _print_results(summary, results, previous):
+    rows = []
+    for name, value in results.items():
+        before = previous.get(name)
+        change = f"{value / before:.2f}x" if before else "--"
+        rows.append([name, f"{value:.6f}", f"{before:.6f}" if before is not None else "--", change])
+    print(f"\n🚦 Load test: {summary['requests']} requests, outcomes {summary['outcomes']}")
+    print(tabulate(rows, headers=["Metric", "Current", "Previous", "Ratio"], tablefmt="fancy_grid"))
+
+
+if __name__ == "__main__":
+    args = _arg_parse()
+    payloads = load_payloads(args.payloads) if args.payloads else synthetic_payloads(args.synthetic)
+    _logger.info(f"Loaded {len(payloads)} payloads")
+
+    server = _start_server(args.url, args.server_workers) if args.serve else None
+    try:
+        summary = asyncio.run(
+            run_load(
+                args.url,
+                payloads,
+                duration=args.duration,
+                rate=args.rate,
+                concurrency=args.concurrency,
+                route=args.route,
+                warmup=args.warmup,
+                timeout=args.timeout,
+            )
+        )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    results = flatten(summary)
+    previous = load_results(args.compare) if args.compare else {}
+    _print_results(summary, results, previous)
+
+    if args.output:
+        meta = {k: summary[k] for k in ("mode", "route", "target_rate", "concurrency", "duration")}
+        meta.update({"url": args.url, "payloads": args.payloads or "synthetic", "outcomes": summary["outcomes"]})
+        save_results(args.output, results, extra_meta=meta)
+        _logger.info(f"✅ Results written to {args.output}")
@@ -0,0 +1,114 @@
+"""
+Cohort Readmission Query
+
+Prints encounter counts and readmission rates per cohort. Queries that only group
+and filter by cube dimensions (gender/race/ethnicity key, age band, chronic
+conditions) are answered from `readmission.cohort_cube`; others scan
+`readmission.encounter_fact` (see `db.cohort_cube`). Queries read the current reader
+snapshot.
+
+- `--refresh` first adds encounters appended to the build database since the cube was
+  last built or refreshed (rebuilding it if counted encounters changed), `--rebuild`
+  rebuilds it in full. Either publishes a new reader snapshot afterwards if the
+  config sets `snapshot_dir` (skip with --no-snapshot).
+- `--base` answers from the base table even when the cube covers the query.
+
+Usage examples:
+    python scripts/query_cohorts.py --group-by gender_key age_band
+    python scripts/query_cohorts.py --group-by race_key --where has_diabetes=true age_band=70
+    python scripts/query_cohorts.py --refresh --group-by start_year
+"""
+
+import argparse
+import logging
+import sys
+import time
+import yaml
+from db import snapshot
+from db.cohort_cube import (
+    build_cohort_cube,
+    cohort_query,
+    dimension_names,
+    parse_filters,
+    query_cohorts,
+    refresh_cohort_cube,
+)
+from db.connection import create_db_connection
+from tabulate import tabulate
+
+logging.basicConfig(level=logging.INFO)
+_logger = logging.getLogger(__name__)
+
+
+def _arg_parse():
+    parser = argparse.ArgumentParser(description="Query readmission rates per cohort from the cohort cube.")
+    parser.add_argument(
+        "--config-path",
+        type=str,
+        default="data/duckdb_config.yaml",
+        help="Path to db YAML configuration file.",
+    )
+    parser.add_argument(
+        "--group-by",
+        nargs="*",
+        default=[],
+        choices=dimension_names(),
+        metavar="DIMENSION",
+        help=f"Dimensions to group by: {', '.join(dimension_names())}.",
+    )
+    parser.add_argument(
+        "--where",
+        nargs="*",
+        default=[],
+        metavar="DIMENSION=VALUE",
+        help="Equality filters, e.g. has_diabetes=true age_band=70.",
+    )
+    parser.add_argument("--base", action="store_true", help="Answer from the base table, not the cube.")
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Add newly appended encounters to the cube before querying.",
+    )
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild the cube in full before querying.")
+    parser.add_argument(
+        "--no-snapshot",
+        action="store_true",
+        help="Do not publish a reader snapshot after --refresh or --rebuild.",
+    )
+    return parser.parse_args()
+
+
+def _update_cube(config, rebuild, skip_snapshot):
+    conn = create_db_connection(config)
+    if rebuild:
+        build_cohort_cube(conn)
+    else:
+        _logger.info(f"Cube refresh: {refresh_cohort_cube(conn)}")
+    conn.close()
+    if config.get("snapshot_dir") and not skip_snapshot:
+        retain = config.get("snapshot_retain", snapshot.DEFAULT_RETAIN)
+        path = snapshot.publish_snapshot(config["database"], config["snapshot_dir"], retain)
+        _logger.info(f"📸 Readers now use snapshot {path}")
+
+
+if __name__ == "__main__":
+    args = _arg_parse()
+    with open(args.config_path) as f:
+        config = yaml.safe_load(f)
+    try:
+        filters = parse_filters(args.where)
+        # Rejects unknown dimensions before anything is rebuilt
+        cohort_query(args.group_by, filters)
+    except ValueError as e:
+        _logger.error(str(e))
+        sys.exit(1)
+    if args.refresh or args.rebuild:
+        _update_cube(config, args.rebuild, args.no_snapshot)
+
+    conn = create_db_connection(config, snapshot=True)
+    start = time.perf_counter()
+    cohorts, source = query_cohorts(conn, args.group_by, filters, use_cube=not args.base)
+    elapsed = time.perf_counter() - start
+    # Column-wise, so integer columns are not formatted as floats
+    print(tabulate(cohorts.to_dict("list"), headers="keys", tablefmt="fancy_grid", floatfmt=".4f"))
+    _logger.info(f"{len(cohorts)} cohorts from the {source} table in {elapsed * 1e3:.1f} ms")
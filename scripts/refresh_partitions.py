@@ -0,0 +1,82 @@
+"""
+Feature Store Partition Refresh
+
+Rewrites the year/month Parquet partitions of the feature store (see
+`db.partitioned_store`) from `readmission.encounter_fact` in the build database.
+With --start-date/--end-date only the months overlapping that range are rewritten,
+for backfills and incremental refreshes; without them the whole store is rewritten.
+The partition directory is `feature_partition_dir` from the config unless --output
+is given.
+
+Each refresh writes a new version of the store (see `db.partitioned_store`), so
+readers of published snapshots keep reading the version their view was created
+over. If the config sets `snapshot_dir`, a new snapshot is then published so
+readers see the refresh (skip with --no-snapshot). Versions that no remaining
+snapshot reads are deleted.
+
+Usage examples:
+    python scripts/refresh_partitions.py
+    python scripts/refresh_partitions.py --start-date 2017-06-01 --end-date 2017-07-01
+"""
+
+import argparse
+import logging
+import sys
+import yaml
+from db import snapshot
+from db.connection import create_db_connection
+from db.partitioned_store import CONFIG_KEY, materialize_partitions, prune_versions
+
+logging.basicConfig(level=logging.INFO)
+_logger = logging.getLogger(__name__)
+
+
+def _arg_parse():
+    parser = argparse.ArgumentParser(
+        description="Rewrite the year/month partitioned feature store, in full or for a date range."
+    )
+    parser.add_argument(
+        "--config-path",
+        type=str,
+        default="data/duckdb_config.yaml",
+        help="Path to db YAML configuration file.",
+    )
+    parser.add_argument("--output", type=str, default=None, help="Partition directory (overrides the config).")
+    parser.add_argument(
+        "--start-date",
+        type=str,
+        default=None,
+        help="First encounter_start date to rewrite (YYYY-MM-DD); widened to the start of its month.",
+    )
+    parser.add_argument(
+        "--end-date",
+        type=str,
+        default=None,
+        help="Encounter_start date to rewrite up to (exclusive); widened to the end of its month.",
+    )
+    parser.add_argument(
+        "--no-snapshot",
+        action="store_true",
+        help="Do not publish a reader snapshot after the refresh.",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = _arg_parse()
+    with open(args.config_path) as f:
+        config = yaml.safe_load(f)
+    output = args.output or config.get(CONFIG_KEY)
+    if not output:
+        _logger.error(f"No partition directory: set {CONFIG_KEY} in {args.config_path} or pass --output.")
+        sys.exit(1)
+
+    conn = create_db_connection(config)
+    rows = materialize_partitions(conn, output, args.start_date, args.end_date)
+    conn.close()
+    _logger.info(f"✅ Rewrote {rows} encounters into {output}")
+    if config.get("snapshot_dir") and not args.no_snapshot:
+        retain = config.get("snapshot_retain", snapshot.DEFAULT_RETAIN)
+        path = snapshot.publish_snapshot(config["database"], config["snapshot_dir"], retain)
+        _logger.info(f"📸 Readers now use snapshot {path}")
+    prune_versions(output, config.get("snapshot_dir"))
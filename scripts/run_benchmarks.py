@@ -0,0 +1,151 @@
+"""
+Performance Benchmark Runner
+
+Generates synthetic feature stores (see `bench.synthetic`), times the selected
+benchmark suites, and compares the results against a stored JSON baseline.
+Exits with status 1 when any case is slower than the baseline by more than
+the regression threshold. Runs fully offline.
+
+Usage examples:
+    python scripts/run_benchmarks.py
+    python scripts/run_benchmarks.py --sizes 10k 100k 1M 10M --max-train-rows 100000
+    python scripts/run_benchmarks.py --update-baseline
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+from bench import codecs, cohorts, core, drift, fastpath, log, memory, metrics, partitions, profile, registry, serve, shadow, startup, temporal, whatif
+from bench.harness import (
+    DEFAULT_THRESHOLD,
+    compare_to_baseline,
+    load_results,
+    save_results,
+)
+from bench.synthetic import parse_size
+from tabulate import tabulate
+
+# Constants
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(SCRIPT_DIR, "..", "data", "benchmark_baseline.json")
+SUITES = {
+    "codecs": codecs.run,
+    "cohorts": cohorts.run,
+    "core": core.run,
+    "drift": drift.run,
+    "fastpath": fastpath.run,
+    "log": log.run,
+    "memory": memory.run,
+    "metrics": metrics.run,
+    "partitions": partitions.run,
+    "profile": profile.run,
+    "registry": registry.run,
+    "serve": serve.run,
+    "shadow": shadow.run,
+    "startup": startup.run,
+    "temporal": temporal.run,
+    "whatif": whatif.run,
+}
+
+logging.basicConfig(level=logging.INFO)
+_logger = logging.getLogger(__name__)
+
+
+def _arg_parse():
+    parser = argparse.ArgumentParser(
+        description="Run performance benchmarks against synthetic feature stores."
+    )
+    parser.add_argument(
+        "--suites",
+        nargs="+",
+        choices=sorted(SUITES),
+        default=["core"],
+        help="Benchmark suites to run.",
+    )
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        default=["10k", "100k"],
+        help="Synthetic feature store sizes (e.g. 10k 100k 1M 10M).",
+    )
+    parser.add_argument(
+        "--max-train-rows",
+        type=int,
+        default=core.DEFAULT_MAX_TRAIN_ROWS,
+        help="Cap on training rows used by the training benchmarks.",
+    )
+    parser.add_argument(
+        "--workers",
+        nargs="+",
+        type=int,
+        default=list(serve.DEFAULT_WORKER_COUNTS),
+        help="Worker counts measured by the serve suite.",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=str,
+        default=BASELINE_PATH,
+        help="Path to the baseline JSON file.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed slowdown ratio versus baseline before failing.",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        help="Optional path to write this run's results as JSON.",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Merge this run's results into the baseline file instead of comparing.",
+    )
+    return parser.parse_args()
+
+
+def _suite_options(suite, args):
+    """Suite-specific keyword arguments taken from the command line."""
+    if suite == "core":
+        return {"max_train_rows": args.max_train_rows}
+    if suite == "serve":
+        return {"worker_counts": args.workers}
+    return {}
+
+
+if __name__ == "__main__":
+    args = _arg_parse()
+    sizes = [parse_size(s) for s in args.sizes]
+
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        for suite in args.suites:
+            _logger.info(f"Running {suite} benchmarks at sizes {args.sizes}")
+            results.update(SUITES[suite](sizes, work_dir, **_suite_options(suite, args)))
+
+    if args.output:
+        save_results(args.output, results)
+
+    baseline = load_results(args.baseline)
+    rows = [
+        [name, f"{value:.6f}", f"{baseline[name]:.6f}" if name in baseline else "--"]
+        for name, value in sorted(results.items())
+    ]
+    print("\n⏱️ Benchmark Results:")
+    print(tabulate(rows, headers=["Case", "Current", "Baseline"], tablefmt="fancy_grid"))
+
+    if args.update_baseline:
+        save_results(args.baseline, {**baseline, **results})
+        _logger.info(f"Baseline updated at {args.baseline}")
+        sys.exit(0)
+
+    regressions = compare_to_baseline(results, baseline, args.threshold)
+    for r in regressions:
+        _logger.warning(
+            f"❌ {r['name']} regressed: {r['current']:.6f}s vs {r['baseline']:.6f}s ({r['ratio']:.2f}x)"
+        )
+    sys.exit(1 if regressions else 0)
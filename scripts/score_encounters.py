@@ -0,0 +1,176 @@
+"""
+Bulk Encounter Scorer
+
+Streams `readmission.encounter_fact` in Arrow batches ordered by encounter_key, scores
+them with a pool of worker processes that each load the model once, and appends the
+results to `scoring.prediction` (encounter_key, model_version, probability,
+scored_at) with bulk Arrow inserts. The `scoring` schema is created here rather than
+by the schema build, so rebuilding the feature store keeps stored predictions.
+
+- `--start-key` / `--end-key` restrict scoring to an encounter_key range (inclusive).
+- By default only encounters in the range without a prediction from this model
+  version are scored, so an interrupted run resumes where it stopped and keys
+  skipped by earlier runs are filled in; use `--no-resume` to rescore the range.
+- Throughput is logged in rows/second after every batch.
+
+Usage examples:
+    python scripts/score_encounters.py
+    python scripts/score_encounters.py --workers 4 --batch-size 100000
+    python scripts/score_encounters.py --start-key 1 --end-key 500000
+"""
+
+import argparse
+import logging
+import os
+import pyarrow as pa
+import time
+import yaml
+from datetime import datetime
+from db import constant as c
+from db.connection import create_db_connection
+from ml.data import FEATURES, FEATURE_TABLE
+from ml.model import DEFAULT_MODEL_PATH, model_version
+from ml.scoring import KEY_COLUMN, score_batches
+
+# Constants
+PREDICTION_TABLE = f"{c.Schema.SCORING}.prediction"
+PREDICTION_DDL = [
+    f"CREATE SCHEMA IF NOT EXISTS {c.Schema.SCORING}",
+    f"""
+    CREATE TABLE IF NOT EXISTS {PREDICTION_TABLE} (
+        encounter_key INTEGER,
+        model_version TEXT,
+        probability FLOAT,
+        scored_at TIMESTAMP
+    )
+    """,
+]
+INT32_MAX = 2**31 - 1
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+)
+_logger = logging.getLogger(__name__)
+
+
+def _arg_parse():
+    parser = argparse.ArgumentParser(
+        description="Score encounters in bulk and write predictions back to the database."
+    )
+    parser.add_argument(
+        "--config-path",
+        type=str,
+        default="data/duckdb_config.yaml",
+        help="Path to db YAML configuration file.",
+    )
+    parser.add_argument(
+        "--model-path",
+        type=str,
+        default=DEFAULT_MODEL_PATH,
+        help="Path to the model (joblib or compact .npz artifact).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of scoring worker processes.",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=100_000, help="Rows per Arrow batch."
+    )
+    parser.add_argument(
+        "--start-key", type=int, default=0, help="Lowest encounter_key to score (inclusive)."
+    )
+    parser.add_argument(
+        "--end-key",
+        type=int,
+        default=INT32_MAX,
+        help="Highest encounter_key to score (inclusive).",
+    )
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Score the whole range even if some encounters were already scored.",
+    )
+    return parser.parse_args()
+
+
+def _scored_count(conn, version: str, start_key: int, end_key: int) -> int:
+    """Return how many encounters in the range already have a prediction from this model version."""
+    df = conn.execute(
+        f"""
+        SELECT count(DISTINCT {KEY_COLUMN}) AS scored
+        FROM {PREDICTION_TABLE}
+        WHERE model_version = $version AND {KEY_COLUMN} BETWEEN $start AND $end
+        """,
+        {"version": version, "start": start_key, "end": end_key},
+    )
+    return int(df["scored"].iloc[0])
+
+
+def scoring_query(resume: bool) -> str:
+    """Feature query for a key range; with resume, only encounters this version has not scored."""
+    columns = ", ".join(f"f.{name}" for name in [KEY_COLUMN] + FEATURES)
+    unscored = f"""
+          AND NOT EXISTS (
+              SELECT 1 FROM {PREDICTION_TABLE} p
+              WHERE p.{KEY_COLUMN} = f.{KEY_COLUMN} AND p.model_version = $version
+          )"""
+    return f"""
+        SELECT {columns}
+        FROM {FEATURE_TABLE} f
+        WHERE f.{KEY_COLUMN} BETWEEN $start AND $end{unscored if resume else ""}
+        ORDER BY f.{KEY_COLUMN}
+    """
+
+
+def _score(conn, args, version: str, resume: bool) -> int:
+    params = {"start": args.start_key, "end": args.end_key}
+    if resume:
+        params["version"] = version
+    batches = conn.fetch_record_batches(scoring_query(resume), params, batch_size=args.batch_size)
+
+    total, started = 0, time.perf_counter()
+    for keys, probs in score_batches(batches, args.model_path, FEATURES, args.workers):
+        conn.insert_arrow(
+            PREDICTION_TABLE,
+            pa.table(
+                {
+                    KEY_COLUMN: pa.array(keys, type=pa.int32()),
+                    "model_version": pa.array([version] * len(keys), type=pa.string()),
+                    "probability": pa.array(probs, type=pa.float32()),
+                    "scored_at": pa.array([datetime.now()] * len(keys), type=pa.timestamp("us")),
+                }
+            ),
+        )
+        total += len(keys)
+        elapsed = time.perf_counter() - started
+        _logger.info(
+            f"Scored {total} rows up to encounter_key {int(keys[-1])} "
+            f"({total / elapsed:,.0f} rows/s)"
+        )
+    return total
+
+
+if __name__ == "__main__":
+    args = _arg_parse()
+    with open(args.config_path) as f:
+        config = yaml.safe_load(f)
+
+    version = model_version(args.model_path)
+    with create_db_connection(config) as conn:
+        for statement in PREDICTION_DDL:
+            conn.execute(statement, ddl=True)
+        resume = not args.no_resume
+        if resume:
+            scored = _scored_count(conn, version, args.start_key, args.end_key)
+            if scored:
+                _logger.info(f"Skipping {scored} encounters already scored with {version}")
+
+        started = time.perf_counter()
+        total = _score(conn, args, version, resume)
+        elapsed = time.perf_counter() - started
+
+    rate = total / elapsed if elapsed > 0 else 0.0
+    _logger.info(f"✅ Scored {total} encounters with {version} in {elapsed:.1f}s ({rate:,.0f} rows/s)")
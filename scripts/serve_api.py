@@ -0,0 +1,67 @@
+"""
+Pre-fork API Server
+
+Starts the prediction API with N worker processes that share one preloaded copy of
+the model and dimension mappings (see `api.serve`). Settings are read from the
+`serving:` section of the DB config YAML; command-line flags override them.
+
+Usage examples:
+    python scripts/serve_api.py
+    python scripts/serve_api.py --workers 4 --pin-cpus
+"""
+
+import argparse
+import logging
+import sys
+from api.serve import PreforkServer, load_serving_config, preload_app
+
+logging.basicConfig(level=logging.INFO)
+_logger = logging.getLogger(__name__)
+
+
+def _arg_parse():
+    parser = argparse.ArgumentParser(
+        description="Serve the prediction API with pre-forked workers sharing a preloaded model."
+    )
+    parser.add_argument(
+        "--config-path",
+        type=str,
+        default="data/duckdb_config.yaml",
+        help="Path to db YAML configuration file (with an optional serving: section).",
+    )
+    parser.add_argument("--host", type=str, help="Override serving.host.")
+    parser.add_argument("--port", type=int, help="Override serving.port.")
+    parser.add_argument("--workers", type=int, help="Override serving.workers.")
+    parser.add_argument("--model-path", type=str, help="Override serving.model_path.")
+    parser.add_argument(
+        "--bundle-path",
+        type=str,
+        help="Override serving.bundle_path (serve from a bundle without opening DuckDB).",
+    )
+    parser.add_argument(
+        "--pin-cpus",
+        action="store_true",
+        default=None,
+        help="Pin each worker to one CPU core (overrides serving.pin_cpus).",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = _arg_parse()
+    settings = load_serving_config(args.config_path)
+    for key in ("host", "port", "workers", "model_path", "bundle_path", "pin_cpus"):
+        if getattr(args, key) is not None:
+            settings[key] = getattr(args, key)
+
+    app = preload_app(args.config_path, settings["model_path"], settings["bundle_path"])
+    server = PreforkServer(
+        app,
+        host=settings["host"],
+        port=settings["port"],
+        workers=settings["workers"],
+        pin_cpus=settings["pin_cpus"],
+        backlog=settings["backlog"],
+        log_level=settings["log_level"],
+    )
+    sys.exit(server.run())
@@ -2,43 +2,31 @@ import argparse
 import logging
 import os
 import yaml
+from datetime import datetime, timezone
 from db.connection import create_db_connection
+from db.partitioned_store import feature_source
+from ml.data import FEATURES, SPLIT_DATE, load_training_data
+from ml.drift import build_reference, reference_path, save_reference
 from ml.explain import explain_model
-from ml.train import train_logistic_regression, train_xgboost
+from ml.registry import save_metadata
+from ml.train import train_logistic_regression, train_xgboost, train_xgboost_early_stopping
 from ml.util import save_model
 
 # Constants
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 MODEL_DIR = os.path.join(SCRIPT_DIR, "..", "ml_model")
-FEATURES = [
-    "age_at_encounter",
-    "gender_key",
-    "race_key",
-    "ethnicity_key",
-    "has_diabetes",
-    "has_hypertension",
-    "has_copd",
-    "has_asthma",
-    "has_heart_failure",
-    "has_arthritis",
-    "has_depression",
-    "has_kidney_disease",
-    "has_cancer",
-    "has_alzheimers",
-    "chronic_dx_count",
-    "num_meds",
-    "has_anticoagulant",
-    "has_antibiotic",
-    "has_steroid",
-    "num_procedures",
-    "had_surgery",
-    "had_biopsy",
-]
 
 logging.basicConfig(level=logging.INFO)
 _logger = logging.getLogger(__name__)
 
 
+def _fraction(value):
+    fraction = float(value)
+    if not 0 < fraction < 1:
+        raise argparse.ArgumentTypeError(f"{value} is not strictly between 0 and 1")
+    return fraction
+
+
 def _arg_parse():
     parser = argparse.ArgumentParser(
         description="Train and tune logistic regression and xgboost models for readmission prediction."
@@ -49,32 +37,71 @@ def _arg_parse():
         default="data/duckdb_config.yaml",
         help="Path to db YAML configuration file.",
     )
+    parser.add_argument(
+        "--early-stopping",
+        action="store_true",
+        help="Train XGBoost with early stopping on a temporal validation split instead of a fixed grid.",
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        default=None,
+        help="Wall-clock limit in seconds for the early-stopping XGBoost search.",
+    )
+    parser.add_argument(
+        "--validation-fraction",
+        type=_fraction,
+        default=0.2,
+        help="Fraction (between 0 and 1, exclusive) of the latest training rows held out for early stopping.",
+    )
+    parser.add_argument(
+        "--start-date",
+        type=str,
+        default=None,
+        help="First encounter_start date to train on (YYYY-MM-DD); defaults to the whole history.",
+    )
+    parser.add_argument(
+        "--split-date",
+        type=str,
+        default=SPLIT_DATE,
+        help="Encounters starting on or after this date form the test set.",
+    )
+    parser.add_argument(
+        "--end-date",
+        type=str,
+        default=None,
+        help="Encounter_start date the test set ends before (exclusive); defaults to no limit.",
+    )
     return parser.parse_args()
 
 
-# This is pretty specific for the readmission use case
-def _load_data(conn, features):
-    df = conn.execute("SELECT * FROM readmission.encounter_fact")
-    df = df.sort_values("encounter_start")
-    train = df[df["encounter_start"] < "2018-01-01"]
-    test = df[df["encounter_start"] >= "2018-01-01"]
-    X_train = train[features]
-    y_train = train["readmitted"]
-    X_test = test[features]
-    y_test = test["readmitted"]
-    return X_train, y_train, X_test, y_test
+def _load_data(conn, features, table, split_date, start_date=None, end_date=None):
+    # On the partitioned feature store only the months in the date range are scanned
+    return load_training_data(conn, features, split_date, start_date, end_date, table=table)
 
 
 if __name__ == "__main__":
     args = _arg_parse()
     with open(args.config_path) as f:
         config = yaml.safe_load(f)
-    conn = create_db_connection(config)
+    conn = create_db_connection(config, snapshot=True)
 
-    X_train, y_train, X_test, y_test = _load_data(conn, FEATURES)
+    X_train, y_train, X_test, y_test = _load_data(
+        conn, FEATURES, feature_source(config), args.split_date, args.start_date, args.end_date
+    )
 
     best_lr, auc_lr = train_logistic_regression(X_train, y_train, X_test, y_test)
-    best_xgb, auc_xgb = train_xgboost(X_train, y_train, X_test, y_test)
+    if args.early_stopping:
+        best_xgb, auc_xgb = train_xgboost_early_stopping(
+            X_train,
+            y_train,
+            X_test,
+            y_test,
+            validation_fraction=args.validation_fraction,
+            time_budget=args.time_budget,
+        )
+    else:
+        best_xgb, auc_xgb = train_xgboost(X_train, y_train, X_test, y_test)
 
     if auc_xgb > auc_lr:
         best_model = best_xgb
@@ -90,5 +117,18 @@ if __name__ == "__main__":
     save_input = input("Save model? (y/n): ").strip().lower()
     if save_input == "y":
         save_model(best_model, MODEL_DIR, model_name)
+        # Training-set feature distributions, for the API's drift monitor
+        save_reference(build_reference(X_train), reference_path(os.path.join(MODEL_DIR, model_name)))
+        # Reported per model by the API's model registry (GET /models)
+        save_metadata(
+            os.path.join(MODEL_DIR, model_name),
+            {
+                "model_type": "xgboost" if best_model is best_xgb else "logreg",
+                "auc": float(max(auc_xgb, auc_lr)),
+                "features": list(X_train.columns),
+                "split_date": str(args.split_date),
+                "trained_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            },
+        )
     else:
         _logger.info("Model not saved.")
@@ -1,13 +1,25 @@
 """
-Data Validator - outputs report for visual inspection.
+Data Validator - profiles loaded tables for inspection.
 
-This script connects to the database and prints the total number of rows
-and (by default) the first 2 rows of selected tables in a given schema.
+This script profiles selected tables in a given schema (see `db.table_profile`):
+one scan per table, tables in parallel, reporting row count and per-column null
+rate, approximate distinct count and min/max/mean. Tables above --sample-rows are
+profiled on a sample, and the run stops at --time-budget seconds.
+
+The profile is printed as a summary, written to --output as JSON and appended to
+the `staging_profile` table of the schema (skip with --no-table).
+
+Usage examples:
+    python scripts/validate_data.py
+    python scripts/validate_data.py --tables patients,encounters --sample-rows 0 --time-budget 300
 """
 
 import argparse
 import logging
+import os
 import yaml
+from datetime import datetime, timezone
+from db import table_profile
 from db.connection import create_db_connection
 from tabulate import tabulate
 
@@ -19,6 +31,7 @@ DEFAULT_TABLES = [
     "procedures",
     "encounters",
 ]
+PROFILE_DIR = os.path.join("profiles", "table_profile")
 
 _logger = logging.getLogger(__name__)
 logging.basicConfig(
@@ -32,10 +45,10 @@ def _arg_parse():
     Creates and returns an argparse.Namespace with parsed command-line arguments.
 
     Returns:
-        argparse.Namespace: Parsed arguments with 'config_path', 'schema', and 'tables' attributes.
+        argparse.Namespace: Parsed arguments.
     """
     parser = argparse.ArgumentParser(
-        description="Validate data in selected db tables by previewing sample rows."
+        description="Validate data in selected db tables by profiling every column."
     )
     parser.add_argument(
         "--config_path",
@@ -55,110 +68,85 @@ def _arg_parse():
         help="Comma-separated list of table names to check. Defaults to standard clinical tables.",
     )
     parser.add_argument(
-        "--num-rows", type=str, default="2", help="Number of rows to display per table."
+        "--sample-rows",
+        type=int,
+        default=table_profile.DEFAULT_SAMPLE_ROWS,
+        help="Profile tables with more rows than this on a sample (0 profiles every row).",
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        default=table_profile.DEFAULT_TIME_BUDGET,
+        help="Seconds after which unfinished tables are interrupted.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=table_profile.DEFAULT_WORKERS,
+        help="Number of tables profiled in parallel.",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        help="JSON report path. Defaults to a timestamped file in profiles/table_profile/.",
+    )
+    parser.add_argument(
+        "--no-table",
+        action="store_true",
+        help=f"Do not append results to the {table_profile.PROFILE_TABLE} table.",
     )
     return parser.parse_args()
 
 
-def _check_table_exists(conn, schema_name: str, table_name: str) -> bool:
-    """
-    Checks if a table exists in the specified schema.
-
-    params:
-        conn: Database connection object with an `execute` method.
-        schema_name: Name of the schema.
-        table_name: Name of the table to check.
-
-    returns: True if the table exists, False otherwise.
-    """
-    query = f"""
-    SELECT COUNT(*) 
-    FROM duckdb_tables() 
-    WHERE schema_name = '{schema_name}' AND table_name = '{table_name}';
-    """
-
-    try:
-        return conn.execute(query).iloc[0, 0] > 0
-    except Exception as e:
-        _logger.info(f"❌ check_table_exists failed: {e}")
-        return False
-
-
-def _get_table_count(conn, schema_name: str, table_name: str) -> int:
-    """
-    Gets the total row count of a table in the specified schema.
-
-    params:
-        conn: Database connection object with an `execute` method.
-        schema_name: Name of the schema.
-        table_name: Name of the table.
-
-    returns: Number of rows in the table.
-    """
-    query = f"""
-    SELECT COUNT(*) 
-    FROM {schema_name}.{table_name};
-    """
-    result = conn.execute(query).iloc[0, 0]
-    return result
-
-
-def _preview_table(conn, schema_name: str, table_name: str, limit: int):
-    """
-    Prints the first `limit` rows of a specified table.
-
-    params:
-        conn: Database connection object with an `execute` method.
-        schema_name: Name of the schema.
-        table_name: Name of the table.
-        limit: Number of rows to preview.
-
-    returns: None
-    """
-    query = f"SELECT * FROM {schema_name}.{table_name} LIMIT {limit}"
-    _logger.info(f"\n📋 Previewing {schema_name}.{table_name}:")
-    try:
-        df = conn.execute(query)
-        _logger.info(df)
-    except Exception as e:
-        _logger.info(f"❌ Error reading {table_name}: {e}")
+def _summary_rows(report):
+    rows = []
+    for table in report["tables"]:
+        ok = table["status"] == "ok"
+        worst = max(table["columns"], key=lambda c: c["null_rate"], default=None) if ok else None
+        rows.append(
+            {
+                "Table": f"{report['schema']}.{table['table']}",
+                "Status": "✅" if ok else f"❌ {table['status']}",
+                "Row Count": table["row_count"] if ok else "--",
+                "Sampled": (table["sampled_rows"] or "--") if ok else "--",
+                "Columns": len(table["columns"]) if ok else "--",
+                "Max Null Rate": f"{worst['null_rate']:.1%} ({worst['column']})" if worst else "--",
+                "Seconds": f"{table['seconds']:.2f}" if ok else "--",
+            }
+        )
+    return rows
 
 
 if __name__ == "__main__":
     args = _arg_parse()
-    config_path = args.config_path
-    schema_name = args.schema
-    num_rows = args.num_rows
     table_list = (
         [t.strip() for t in args.tables.split(",")] if args.tables else DEFAULT_TABLES
     )
 
-    with open(config_path) as f:
+    with open(args.config_path) as f:
         config = yaml.safe_load(f)
+    # Validation runs right after a load, before any snapshot of it exists
     conn = create_db_connection(config)
 
-    validation_results = []
-
-    for table_name in table_list:
-        qualified_name = f"{schema_name}.{table_name}"
-        exists = _check_table_exists(conn, schema_name, table_name)
-
-        if exists:
-            try:
-                row_count = _get_table_count(conn, schema_name, table_name)
-                _preview_table(conn, schema_name, table_name, limit=num_rows)
-            except Exception as e:
-                row_count = f"❌ Error: {e}"
-        else:
-            row_count = "--"
-
-        validation_results.append(
-            {
-                "Table": qualified_name,
-                "Exists": "✅" if exists else "❌",
-                "Row Count": row_count,
-            }
+    try:
+        report = table_profile.profile_tables(
+            conn.connect(),
+            args.schema,
+            table_list,
+            sample_rows=args.sample_rows or None,
+            time_budget=args.time_budget,
+            workers=args.workers,
         )
-
-    print("\n🧪 Validation Summary:")
-    print(tabulate(validation_results, headers="keys", tablefmt="fancy_grid"))
+        if not args.no_table:
+            written = table_profile.write_profile_table(conn, report)
+            _logger.info(f"Appended {written} column profiles to {args.schema}.{table_profile.PROFILE_TABLE}")
+    finally:
+        conn.close()
+
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    output = args.output or os.path.join(PROFILE_DIR, f"{args.schema}_{stamp}.json")
+    table_profile.save_report(report, output)
+    _logger.info(f"Profile report written to {output}")
+
+    print(f"\n🧪 Validation Summary ({report['seconds']:.2f}s):")
+    print(tabulate(_summary_rows(report), headers="keys", tablefmt="fancy_grid"))
@@ -0,0 +1,78 @@
+"""
+Self-contained serving bundles.
+
+A bundle is a compact model artifact (see `ml.artifact`) whose header also carries
+everything the API otherwise reads from the DuckDB warehouse at startup: the API
+feature order, per-feature defaults and the gender/race/ethnicity label-to-key
+mappings. It is a single versioned, checksummed file, so the API can start from it
+with one read and without DuckDB access.
+"""
+
+import logging
+from datetime import datetime, timezone
+from ml.artifact import export_compact_model
+from ml.model import ReadmissionModel
+from typing import Dict, List, Optional
+
+_logger = logging.getLogger(__name__)
+
+# Constants
+BUNDLE_KEY = "serving_bundle"
+BUNDLE_VERSION = 1
+BUNDLE_MAPPINGS = ("gender_key", "race_key", "ethnicity_key")
+
+
+def export_bundle(
+    model,
+    path: str,
+    features: List[str],
+    defaults: Dict[str, object],
+    mappings: Dict[str, Dict[str, int]],
+    min_gain_fraction: Optional[float] = None,
+    source: Optional[str] = None,
+) -> dict:
+    """
+    Export a trained model plus the API's serving metadata into one bundle file.
+
+    params:
+        model: Trained XGBClassifier or binary LogisticRegression.
+        path: Output file path (.npz).
+        features: API feature order; must match the model's feature order position by position.
+        defaults: Default value per API feature.
+        mappings: Lowercase label -> key mapping for each of BUNDLE_MAPPINGS.
+        min_gain_fraction: Optional tree pruning (see `ml.artifact.export_compact_model`).
+        source: Optional description of where the model came from (e.g. its version).
+
+    Returns: The artifact header (including checksum).
+    """
+    missing = set(BUNDLE_MAPPINGS) - set(mappings)
+    if missing:
+        raise ValueError(f"Missing mappings: {sorted(missing)}")
+    bundle = {
+        "version": BUNDLE_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "source": source,
+        "features": list(features),
+        "defaults": {f: defaults[f] for f in features},
+        "mappings": {name: {str(k): int(v) for k, v in mappings[name].items()} for name in BUNDLE_MAPPINGS},
+    }
+    return export_compact_model(
+        model, path, min_gain_fraction=min_gain_fraction, extras={BUNDLE_KEY: bundle}
+    )
+
+
+def read_bundle(model: ReadmissionModel) -> dict:
+    """
+    Return the serving metadata of a model loaded from a bundle file.
+
+    Raises: ValueError if the model was not loaded from a serving bundle.
+    """
+    header = getattr(model.model, "header", None) or {}
+    bundle = header.get("extras", {}).get(BUNDLE_KEY)
+    if bundle is None:
+        raise ValueError("Model artifact is not a serving bundle")
+    if bundle.get("version") != BUNDLE_VERSION:
+        raise ValueError(f"Unsupported serving bundle version: {bundle.get('version')}")
+    if len(bundle["features"]) != len(header["feature_names"]):
+        raise ValueError("Serving bundle feature order does not match its model")
+    return bundle
@@ -0,0 +1,256 @@
+"""
+Request and response codecs for bulk prediction.
+
+Batches are column-oriented: one array per `PatientFeatures` field, all of the same
+length. They are decoded straight into a float32 feature matrix, without building
+per-row Pydantic objects. Supported request content types:
+    - application/json: {"age": [...], "gender": [...], ...}
+    - application/vnd.apache.arrow.stream: an Arrow IPC stream with those columns
+    - application/msgpack: a MessagePack map of column name to array (needs msgpack)
+
+Responses are encoded with orjson when it is installed, or as Arrow / MessagePack
+when the client asks for them in the Accept header.
+
+Trusted internal callers can instead send dense rows already in model feature order
+(see `decode_dense`): a JSON array (one row) or array of arrays, or packed
+little-endian float32 rows as application/octet-stream.
+"""
+
+import json
+import numpy as np
+import pyarrow as pa
+from .model import PatientFeatures
+from fastapi import Response
+from typing import Dict, List, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional format
+    msgpack = None
+
+# Constants
+JSON = "application/json"
+ARROW = "application/vnd.apache.arrow.stream"
+MSGPACK = "application/msgpack"
+PACKED = "application/octet-stream"
+CONTENT_TYPES = {
+    JSON: JSON,
+    ARROW: ARROW,
+    MSGPACK: MSGPACK,
+    "application/x-msgpack": MSGPACK,
+}
+MAX_BATCH_ROWS = 100_000
+PREDICTION_FIELD = "readmission_probability"
+COLUMNS = list(PatientFeatures.model_fields)
+# Batch columns accept the same values as the PatientFeatures fields /predict validates
+BOOLEAN_COLUMNS = {name for name, field in PatientFeatures.model_fields.items() if field.annotation == Optional[bool]}
+
+
+class BatchDecodeError(ValueError):
+    """Raised when a batch payload cannot be decoded; `status_code` is the HTTP status to return."""
+
+    def __init__(self, message: str, status_code: int = 422):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class FastJSONResponse(Response):
+    """JSON response rendered with orjson (numpy arrays included) when available."""
+
+    media_type = JSON
+
+    def render(self, content) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+        # numpy arrays and scalars both provide tolist()
+        return json.dumps(content, separators=(",", ":"), default=lambda o: o.tolist()).encode()
+
+
+def media_type(header: Optional[str]) -> str:
+    """Canonical supported media type of a Content-Type header, or raise a 415 error."""
+    value = (header or JSON).split(";", 1)[0].strip().lower()
+    canonical = CONTENT_TYPES.get(value)
+    if canonical is None:
+        raise BatchDecodeError(f"Unsupported content type '{value}'", status_code=415)
+    if canonical == MSGPACK and msgpack is None:
+        raise BatchDecodeError("MessagePack support is not installed", status_code=415)
+    return canonical
+
+
+def accepted_type(header: Optional[str]) -> str:
+    """First supported media type listed in an Accept header (JSON by default)."""
+    for part in (header or "").split(","):
+        value = part.split(";", 1)[0].strip().lower()
+        canonical = CONTENT_TYPES.get(value)
+        if canonical and (canonical != MSGPACK or msgpack is not None):
+            return canonical
+    return JSON
+
+
+def decode_batch(
+    body: bytes,
+    content_type: str,
+    features: List[str],
+    categorical_maps: Dict[str, dict],
+    defaults: Dict[str, object],
+) -> np.ndarray:
+    """
+    Decode a column batch into a model-ready feature matrix.
+
+    params:
+        body: Raw request body.
+        content_type: Canonical media type (see `media_type`).
+        features: Model feature order (e.g. "gender_key" is read from column "gender").
+        categorical_maps: Lowercase label -> key mapping per categorical feature.
+        defaults: Value used for missing columns and null entries, per feature.
+
+    Returns: float32 matrix of shape (rows, len(features)).
+    """
+    columns = _read_columns(body, content_type)
+    unknown = set(columns) - set(COLUMNS)
+    if unknown:
+        raise BatchDecodeError(f"Unknown columns: {sorted(unknown)}")
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise BatchDecodeError("All columns must have the same length")
+    num_rows = lengths.pop() if lengths else 0
+    if num_rows > MAX_BATCH_ROWS:
+        raise BatchDecodeError(f"Batch exceeds {MAX_BATCH_ROWS} rows", status_code=413)
+
+    X = np.empty((num_rows, len(features)), dtype=np.float32)
+    for i, feature in enumerate(features):
+        default = float(defaults.get(feature, 0))
+        if feature in categorical_maps:
+            values = columns.get(feature[: -len("_key")])
+            X[:, i] = default if values is None else _map_categorical(values, categorical_maps[feature], default)
+        else:
+            values = columns.get(feature)
+            X[:, i] = default if values is None else _to_numeric(feature, values, default)
+    return X
+
+
+def decode_dense(body: bytes, content_type: Optional[str], num_features: int) -> np.ndarray:
+    """
+    Decode fixed-order numeric rows into a feature matrix with vectorized checks only.
+
+    params:
+        body: Raw request body: JSON row(s) or packed little-endian float32 rows.
+        content_type: Content-Type header (JSON when missing).
+        num_features: Required row length (the model's feature count).
+
+    Returns: float32 matrix of shape (rows, num_features).
+    """
+    value = (content_type or JSON).split(";", 1)[0].strip().lower()
+    if value == PACKED:
+        if not body or len(body) % (4 * num_features):
+            raise BatchDecodeError(f"Packed body must hold whole rows of {num_features} float32 values")
+        X = np.frombuffer(body, dtype="<f4").reshape(-1, num_features)
+    elif value == JSON:
+        try:
+            rows = orjson.loads(body) if orjson is not None else json.loads(body)
+        except ValueError as e:
+            raise BatchDecodeError(f"Malformed {JSON} body: {e}", status_code=400)
+        try:
+            X = np.asarray(rows, dtype=np.float32)
+        except (TypeError, ValueError):
+            raise BatchDecodeError("Rows must contain only numbers")
+        X = X.reshape(1, -1) if X.ndim == 1 else X
+        if X.ndim != 2 or X.shape[1] != num_features:
+            raise BatchDecodeError(f"Rows must have exactly {num_features} values")
+    else:
+        raise BatchDecodeError(f"Unsupported content type '{value}'", status_code=415)
+    if len(X) > MAX_BATCH_ROWS:
+        raise BatchDecodeError(f"Batch exceeds {MAX_BATCH_ROWS} rows", status_code=413)
+    if not np.isfinite(X).all():
+        raise BatchDecodeError("Rows must not contain NaN or infinite values")
+    return X
+
+
+def encode_predictions(probabilities: np.ndarray, accept: str) -> Response:
+    """Build the response for a batch of probabilities in the negotiated media type."""
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    if accept == ARROW:
+        table = pa.table({PREDICTION_FIELD: probabilities})
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return Response(sink.getvalue().to_pybytes(), media_type=ARROW)
+    if accept == MSGPACK:
+        return Response(msgpack.packb({PREDICTION_FIELD: probabilities.tolist()}), media_type=MSGPACK)
+    return FastJSONResponse({PREDICTION_FIELD: probabilities})
+
+
+def _read_columns(body: bytes, content_type: str) -> dict:
+    try:
+        if content_type == ARROW:
+            with pa.ipc.open_stream(body) as reader:
+                table = reader.read_all()
+            return {name: table.column(name) for name in table.column_names}
+        if content_type == MSGPACK:
+            columns = msgpack.unpackb(body)
+        else:
+            columns = orjson.loads(body) if orjson is not None else json.loads(body)
+    except BatchDecodeError:
+        raise
+    except Exception as e:
+        raise BatchDecodeError(f"Malformed {content_type} body: {e}", status_code=400)
+    if not isinstance(columns, dict) or not all(isinstance(v, list) for v in columns.values()):
+        raise BatchDecodeError("Body must map column names to arrays")
+    return columns
+
+
+def _to_numeric(name: str, values, default: float) -> np.ndarray:
+    """
+    Numeric column (Arrow array or list) to float32; nulls become the default.
+
+    Values PatientFeatures would reject are rejected too: non-integral or infinite
+    numbers in integer columns, and anything but 0/1 in boolean columns.
+    """
+    try:
+        if isinstance(values, pa.ChunkedArray):
+            if pa.types.is_boolean(values.type) or pa.types.is_integer(values.type):
+                values = values.cast(pa.float64())
+            array = values.to_numpy(zero_copy_only=False).astype(np.float64)
+        else:
+            array = np.array(values, dtype=np.float64)
+    except (TypeError, ValueError, pa.ArrowInvalid) as e:
+        raise BatchDecodeError(f"Column '{name}' must be numeric or boolean: {e}")
+    if array.ndim != 1:
+        raise BatchDecodeError(f"Column '{name}' must be a flat array")
+    nulls = np.isnan(array)
+    present = array[~nulls]
+    if name in BOOLEAN_COLUMNS:
+        if not np.isin(present, (0.0, 1.0)).all():
+            raise BatchDecodeError(f"Column '{name}' must contain only booleans (or 0/1) and nulls")
+    elif not (np.isfinite(present) & (present == np.trunc(present))).all():
+        raise BatchDecodeError(f"Column '{name}' must contain only integers and nulls")
+    return np.where(nulls, default, array)
+
+
+def _map_categorical(values, mapping: dict, default: float) -> np.ndarray:
+    """Map string labels to dimension keys (case-insensitive); unknown labels and nulls get the default."""
+    if isinstance(values, pa.ChunkedArray):
+        encoded = values.combine_chunks().dictionary_encode()
+        labels = encoded.dictionary.to_pylist()
+        keys = np.array([_lookup(label, mapping, default) for label in labels] + [default], dtype=np.float32)
+        indices = encoded.indices.fill_null(len(labels)).to_numpy(zero_copy_only=False)
+        return keys[indices]
+    try:
+        keys = {label: _lookup(label, mapping, default) for label in set(values)}
+    except TypeError:
+        raise BatchDecodeError("Categorical columns must contain strings or nulls")
+    return np.fromiter((keys[label] for label in values), dtype=np.float32, count=len(values))
+
+
+def _lookup(label, mapping: dict, default: float) -> float:
+    # /predict declares these fields as strings, so other values are rejected rather than defaulted
+    if label is None:
+        return default
+    if not isinstance(label, str):
+        raise BatchDecodeError("Categorical columns must contain strings or nulls")
+    return mapping.get(label.lower(), default)
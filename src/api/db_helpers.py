@@ -1,8 +1,10 @@
 """
 Database helper functions for loading dimension mappings.
 """
+import asyncio
 import db.constant as c
-from typing import Dict
+from typing import Dict, Tuple
+from db.async_connection import AsyncDBConnection
 from db.connection import DBConnection
 
 
@@ -24,6 +26,49 @@ def load_dimension_mapping(
 
     Returns: Mapping from label (lowercase) to key.
     """
-    query = f"SELECT {label_col}, {key_col} FROM {schema_name}.{table_name}"
-    df = conn.execute(query)
-    return {row[label_col].lower(): row[key_col] for idx, row in df.iterrows()}
+    df = conn.execute(_mapping_query(table_name, key_col, label_col, schema_name))
+    return _mapping(df[label_col], df[key_col].tolist())
+
+
+async def load_dimension_mapping_async(
+    conn: AsyncDBConnection,
+    table_name: str,
+    key_col: str,
+    label_col: str = c.Column.DESCRIPTION,
+    schema_name: str = c.Schema.CLINICAL,
+) -> Dict[str, int]:
+    """
+    Load a dimension mapping table without blocking the event loop.
+
+    params: As `load_dimension_mapping`, with an async connection (see `db.async_connection`).
+
+    Returns: Mapping from label (lowercase) to key.
+    """
+    columns = await conn.fetch_columns(_mapping_query(table_name, key_col, label_col, schema_name))
+    return _mapping(columns[label_col], columns[key_col].tolist())
+
+
+async def load_dimension_mappings(
+    conn: AsyncDBConnection, dimensions: Dict[str, Tuple[str, str]]
+) -> Dict[str, Dict[str, int]]:
+    """
+    Load several dimension mappings concurrently.
+
+    params:
+        conn: Async database connection.
+        dimensions: Mapping of name to (table_name, key_col).
+
+    Returns: Mapping of name to its label -> key mapping.
+    """
+    mappings = await asyncio.gather(
+        *(load_dimension_mapping_async(conn, table, key) for table, key in dimensions.values())
+    )
+    return dict(zip(dimensions, mappings))
+
+
+def _mapping_query(table_name: str, key_col: str, label_col: str, schema_name: str) -> str:
+    return f"SELECT {label_col}, {key_col} FROM {schema_name}.{table_name}"
+
+
+def _mapping(labels, keys) -> Dict[str, int]:
+    return {label.lower(): key for label, key in zip(labels, keys)}
@@ -3,14 +3,47 @@ API route definitions for health check and prediction.
 """
 
 
+import asyncio
+import hmac
+import numpy as np
+import os
+import time
 import yaml
-from .db_helpers import load_dimension_mapping
-from .model import PatientFeatures
+from .bundle import read_bundle
+from .codecs import (
+    PREDICTION_FIELD,
+    BatchDecodeError,
+    FastJSONResponse,
+    accepted_type,
+    decode_batch,
+    decode_dense,
+    encode_predictions,
+    media_type,
+)
+from .log import dropped_records
+from .metrics import (
+    CONTENT_TYPE,
+    DRIFT_PSI,
+    LOG_DROPPED,
+    MODEL_INFO,
+    MODELS_RESIDENT_BYTES,
+    REGISTRY,
+    InstrumentedRoute,
+    record_model_event,
+    stage,
+)
+from .model import PatientFeatures, WhatIfRequest
+from .profiling import MAX_PROCESS_SECONDS, PROFILE_HEADER, PROFILER
+from .whatif import SweepError, build_grid, curves, prepare_sweeps
 from db import constant as c
-from db.connection import create_db_connection
-from fastapi import APIRouter
-from ml.model import ReadmissionModel
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response
+from ml.drift import DriftMonitor, load_reference
+from ml.model import DEFAULT_MODEL_PATH, ReadmissionModel
+from ml.registry import DEFAULT_MAX_BYTES, ModelRegistry
+from ml.shadow import ShadowScorer
 from pathlib import Path
+from starlette.concurrency import run_in_threadpool
+from typing import List, Optional
 
 # --- Constants ---
 FEATURES = [
@@ -25,29 +58,173 @@ FEATURES = [
 DEFAULTS = {feat: 0 if "num_" in feat or "count" in feat or feat.endswith("_key") or feat == "age" else False for feat in FEATURES}
 
 # --- Global mappings ---
+MAPPING_DIMENSIONS = {
+    "gender_key": (c.Table.GENDER_DIM, c.Column.GENDER_KEY),
+    "race_key": (c.Table.RACE_DIM, c.Column.RACE_KEY),
+    "ethnicity_key": (c.Table.ETHINICITY_DIM, c.Column.ETHNICITY_KEY),
+}
 GENDER_MAP: dict = {}
 RACE_MAP: dict = {}
 ETHNICITY_MAP: dict = {}
 
 # --- Config ---
 CONFIG_PATH = Path(__file__).resolve().parents[2] / "data" / "duckdb_config.yaml"
+SHADOW_MODEL_ENV = "SHADOW_MODEL_PATH"
+DRIFT_REFERENCE_ENV = "DRIFT_REFERENCE_PATH"
+MODEL_REGISTRY_ENV = "MODEL_REGISTRY_DIR"
+MODEL_REGISTRY_MAX_MB_ENV = "MODEL_REGISTRY_MAX_MB"
+MODEL_HEADER = "X-Model"
+BUNDLE_ENV = "SERVING_BUNDLE_PATH"
+INTERNAL_TOKEN_ENV = "INTERNAL_API_TOKEN"
+INTERNAL_HEADER = "X-Internal-Token"
+INTERNAL_TOKEN: Optional[str] = os.getenv(INTERNAL_TOKEN_ENV) or None
+FAST_INLINE_MAX_ROWS = 256  # larger /predict/fast batches are scored off the event loop
 
 # --- Router and Model ---
-router = APIRouter()
-model = ReadmissionModel()
+router = APIRouter(route_class=InstrumentedRoute)
+model: Optional[ReadmissionModel] = None  # loaded at startup by load_serving_state
+shadow: Optional[ShadowScorer] = None
+drift: Optional[DriftMonitor] = None
+models: Optional[ModelRegistry] = None  # further model versions, routed to with the X-Model header
+db_conn = None  # AsyncDBConnection shared by request-time queries, opened by open_database
 
 
-def load_all_mappings():
-    """Load dimension mappings from the database."""
-    with CONFIG_PATH.open() as f:
+async def load_all_mappings_async(config_path: Path = CONFIG_PATH):
+    """Load dimension mappings from the database without blocking the event loop."""
+    # Imported here so that serving from a bundle never loads the database drivers
+    from .db_helpers import load_dimension_mappings
+    from db.async_connection import create_async_db_connection
+
+    with Path(config_path).open() as f:
         config = yaml.safe_load(f)
 
-    conn = create_db_connection(config)
+    async with create_async_db_connection(config, snapshot=True) as conn:
+        mappings = await load_dimension_mappings(conn, MAPPING_DIMENSIONS)
     global GENDER_MAP, RACE_MAP, ETHNICITY_MAP
 
-    GENDER_MAP = load_dimension_mapping(conn, c.Table.GENDER_DIM, c.Column.GENDER_KEY)
-    RACE_MAP = load_dimension_mapping(conn, c.Table.RACE_DIM, c.Column.RACE_KEY)
-    ETHNICITY_MAP = load_dimension_mapping(conn, c.Table.ETHINICITY_DIM, c.Column.ETHNICITY_KEY)
+    GENDER_MAP, RACE_MAP, ETHNICITY_MAP = (mappings[name] for name in MAPPING_DIMENSIONS)
+
+
+def load_all_mappings(config_path: Path = CONFIG_PATH):
+    """Load dimension mappings from the database (blocking; for callers outside an event loop)."""
+    asyncio.run(load_all_mappings_async(config_path))
+
+
+def load_serving_state(
+    config_path: Path = CONFIG_PATH,
+    model_path: Optional[str] = None,
+    bundle_path: Optional[str] = None,
+):
+    """
+    Load the served model and dimension mappings.
+
+    params:
+        config_path: DB config YAML used to read mappings when no bundle is given.
+        model_path: Model file to serve (defaults to DEFAULT_MODEL_PATH).
+        bundle_path: Serving bundle (see `api.bundle`). When given, the model, defaults
+            and mappings all come from this one file and the database is not opened.
+    """
+    global model, DEFAULTS, GENDER_MAP, RACE_MAP, ETHNICITY_MAP
+    if not bundle_path:
+        model = ReadmissionModel(model_path or DEFAULT_MODEL_PATH)
+        load_all_mappings(config_path)
+        return
+
+    bundled_model = ReadmissionModel(bundle_path)
+    bundle = read_bundle(bundled_model)
+    if bundle["features"] != FEATURES:
+        raise ValueError(f"Serving bundle {bundle_path} was built for a different feature order")
+    model = bundled_model
+    DEFAULTS = bundle["defaults"]
+    mappings = bundle["mappings"]
+    GENDER_MAP, RACE_MAP, ETHNICITY_MAP = mappings["gender_key"], mappings["race_key"], mappings["ethnicity_key"]
+
+
+async def load_serving_state_async(
+    config_path: Path = CONFIG_PATH,
+    model_path: Optional[str] = None,
+    bundle_path: Optional[str] = None,
+):
+    """
+    `load_serving_state` for lifespan hooks: nothing blocks the event loop, and the
+    model is read while the mapping queries run.
+    """
+    global model
+    if bundle_path:
+        await asyncio.to_thread(load_serving_state, config_path, model_path, bundle_path)
+        return
+    model, _ = await asyncio.gather(
+        asyncio.to_thread(ReadmissionModel, model_path or DEFAULT_MODEL_PATH),
+        load_all_mappings_async(config_path),
+    )
+
+
+def open_database(config_path: Path = CONFIG_PATH):
+    """
+    Open the app-level async connection that request-time queries (/cohorts) share,
+    on the reader snapshot current at startup. Its bounded pool caps concurrent queries.
+    """
+    # Imported here so that serving from a bundle never loads the database drivers
+    from db.async_connection import create_async_db_connection
+
+    global db_conn
+    with Path(config_path).open() as f:
+        config = yaml.safe_load(f)
+    db_conn = create_async_db_connection(config, snapshot=True).open()
+    return db_conn
+
+
+async def close_database():
+    """Close the app-level connection after its running queries stop, if open."""
+    global db_conn
+    if db_conn is not None:
+        conn, db_conn = db_conn, None
+        await conn.close()
+
+
+def enable_shadow(model_path: str, **kwargs) -> ShadowScorer:
+    """Start shadow scoring of live /predict traffic with the candidate model at model_path."""
+    global shadow
+    disable_shadow()
+    shadow = ShadowScorer(ReadmissionModel(model_path), **kwargs).start()
+    return shadow
+
+
+def disable_shadow():
+    """Stop shadow scoring, if enabled."""
+    global shadow
+    if shadow is not None:
+        shadow.stop()
+        shadow = None
+
+
+def enable_drift(reference_path: str, **kwargs) -> DriftMonitor:
+    """Start drift monitoring of scored traffic against the reference at reference_path."""
+    global drift
+    disable_drift()
+    drift = DriftMonitor(load_reference(reference_path), FEATURES, **kwargs).start()
+    return drift
+
+
+def disable_drift():
+    """Stop drift monitoring, if enabled."""
+    global drift
+    if drift is not None:
+        drift.stop()
+        drift = None
+
+
+def enable_registry(model_dir: str, max_bytes: int = DEFAULT_MAX_BYTES) -> ModelRegistry:
+    """Serve the models in model_dir to requests naming one in the X-Model header."""
+    global models
+    models = ModelRegistry(model_dir, max_bytes, listener=record_model_event, loader=_load_routed_model)
+    return models
+
+
+def disable_registry():
+    """Stop routing requests to registry models (the default model stays)."""
+    global models
+    models = None
 
 
 @router.get("/healthz")
@@ -63,17 +240,241 @@ def get_metadata():
         "genders": list(GENDER_MAP.keys()),
         "races": list(RACE_MAP.keys()),
         "ethnicities": list(ETHNICITY_MAP.keys()),
+        "features": FEATURES,
     }
 
 
-@router.post("/predict")
-def predict(features: PatientFeatures):
+@router.post("/predict", response_class=FastJSONResponse)
+def predict(features: PatientFeatures, model_name: Optional[str] = Header(None, alias=MODEL_HEADER)):
     """Generate readmission prediction based on patient features."""
-    input_vector = _build_feature_vector(features)
-    prediction = model.predict(input_vector)
+    selected = _select_model(model_name)
+    with stage("build_features"):
+        input_vector = _build_feature_vector(features)
+    with stage("model_predict"):
+        prediction = selected.predict(input_vector)
+    # Shadow scoring compares the candidate with the default model only
+    if shadow is not None and selected is model:
+        shadow.submit(input_vector, prediction)
+    if drift is not None:
+        drift.submit(input_vector)
     return {"readmission_probability": prediction}
 
 
+@router.post("/predict/batch")
+async def predict_batch(request: Request):
+    """
+    Score a column batch sent as JSON, Arrow IPC or MessagePack (see `api.codecs`).
+
+    The response format follows the Accept header (JSON by default).
+    """
+    try:
+        content_type = media_type(request.headers.get("content-type"))
+    except BatchDecodeError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    selected = await _select_model_async(request.headers.get(MODEL_HEADER))
+    body = await request.body()
+    accept = accepted_type(request.headers.get("accept"))
+    return await run_in_threadpool(_score_batch, selected, body, content_type, accept)
+
+
+@router.post("/predict/fast", response_class=FastJSONResponse)
+async def predict_fast(request: Request):
+    """
+    Score rows already in model feature order (see /metadata "features") for trusted
+    internal callers. Requires the INTERNAL_API_TOKEN in the X-Internal-Token header.
+
+    Skips per-field validation: rows are only checked for length and finiteness.
+    Batches of up to FAST_INLINE_MAX_ROWS rows are scored inline on the event loop,
+    larger ones in the thread pool. Returns a probability for a single row, else a list.
+    """
+    token = request.headers.get(INTERNAL_HEADER)
+    # Compared as bytes: compare_digest rejects non-ASCII str
+    if not (INTERNAL_TOKEN and token and hmac.compare_digest(token.encode(), INTERNAL_TOKEN.encode())):
+        raise HTTPException(status_code=403, detail="Internal route not authorized")
+    selected = await _select_model_async(request.headers.get(MODEL_HEADER))
+    body = await request.body()
+    with stage("decode"):
+        try:
+            X = decode_dense(body, request.headers.get("content-type"), len(FEATURES))
+        except BatchDecodeError as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+    with stage("model_predict"):
+        if len(X) <= FAST_INLINE_MAX_ROWS:
+            probabilities = selected.predict_batch(X)
+        else:
+            probabilities = await run_in_threadpool(selected.predict_batch, X)
+    if drift is not None:
+        drift.submit(X)
+    # Returning the response directly skips FastAPI's jsonable_encoder pass
+    return FastJSONResponse({PREDICTION_FIELD: float(probabilities[0]) if len(X) == 1 else probabilities})
+
+
+@router.post("/predict/whatif", response_class=FastJSONResponse)
+def predict_whatif(request: WhatIfRequest, model_name: Optional[str] = Header(None, alias=MODEL_HEADER)):
+    """
+    Score one patient across feature sweeps (see `api.whatif`) in a single model call.
+
+    Returns the base probability, a response curve per sweep (or the crossed grid),
+    the number of rows scored and the time spent building and scoring the grid.
+    """
+    selected = _select_model(model_name)
+    started = time.perf_counter()
+    with stage("build_features"):
+        base = np.asarray(_build_feature_vector(request.patient), dtype=np.float32)
+        categorical_maps = {"gender_key": GENDER_MAP, "race_key": RACE_MAP, "ethnicity_key": ETHNICITY_MAP}
+        try:
+            columns, requested, encoded = prepare_sweeps(request.sweeps, request.cross, FEATURES, categorical_maps)
+        except SweepError as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+        X = build_grid(base, columns, encoded, request.cross)
+    built = time.perf_counter()
+    with stage("model_predict"):
+        probabilities = selected.predict_batch(X)
+    scored = time.perf_counter()
+
+    body = curves(request.sweeps, requested, probabilities, request.cross)
+    body["rows"] = len(X)
+    body["latency_ms"] = {
+        "build": (built - started) * 1e3,
+        "predict": (scored - built) * 1e3,
+        "total": (time.perf_counter() - started) * 1e3,
+    }
+    return FastJSONResponse(body)
+
+
+@router.get("/metrics")
+def metrics():
+    """Expose service metrics in Prometheus text format."""
+    MODEL_INFO.replace({(str(getattr(model, "version", "unknown")),): 1})
+    LOG_DROPPED.set(dropped_records())
+    if models is not None:
+        MODELS_RESIDENT_BYTES.set(models.stats()["resident_bytes"])
+    if drift is not None:
+        report = drift.report()["features"]
+        DRIFT_PSI.replace({(name,): f["psi"] for name, f in report.items() if f["psi"] is not None})
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
+@router.post("/admin/profile")
+def profile_process(
+    seconds: float = Query(10.0, gt=0, le=MAX_PROCESS_SECONDS),
+    token: Optional[str] = Header(None, alias=PROFILE_HEADER),
+):
+    """Capture a sampled stack profile of the whole process for `seconds` (token required)."""
+    if not PROFILER.authorized(token):
+        raise HTTPException(status_code=403, detail="Profiling not authorized")
+    return {"seconds": seconds, "path": PROFILER.profile_process(seconds)}
+
+
+@router.get("/shadow")
+def shadow_stats():
+    """Return shadow model comparison statistics."""
+    if shadow is None:
+        return {"enabled": False}
+    return {"enabled": True, **shadow.stats()}
+
+
+@router.get("/models")
+def list_models():
+    """Return the registry's models (resident or not) and its load/eviction counters."""
+    if models is None:
+        return {"enabled": False}
+    return {"enabled": True, "models": models.models(), **models.stats()}
+
+
+@router.get("/drift")
+def drift_stats():
+    """Return PSI/KS drift of scored traffic against the training reference, per feature."""
+    if drift is None:
+        return {"enabled": False}
+    return {"enabled": True, **drift.report()}
+
+
+@router.get("/cohorts", response_class=FastJSONResponse)
+async def cohorts(
+    group_by: List[str] = Query(default=[]),
+    where: List[str] = Query(default=[]),
+    base: bool = False,
+):
+    """
+    Encounter counts and readmission rates per cohort (see `db.cohort_cube`), e.g.
+    `/cohorts?group_by=gender_key&group_by=age_band&where=has_diabetes=true`.
+
+    Answered from the cohort cube when it covers every dimension used (unless `base`
+    is set), else from the feature table; `source` tells which.
+    """
+    # Imported here so that serving from a bundle never loads the database drivers
+    from db.cohort_cube import parse_filters, query_cohorts_async
+
+    if db_conn is None:
+        raise HTTPException(status_code=503, detail="No database connection (serving from a bundle?)")
+    started = time.perf_counter()
+    try:
+        filters = parse_filters(where)
+        columns, source = await query_cohorts_async(db_conn, group_by, filters, use_cube=not base)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    rows = [dict(zip(columns, values)) for values in zip(*(v.tolist() for v in columns.values()))]
+    return FastJSONResponse({
+        "source": source,
+        "group_by": group_by,
+        "filters": filters,
+        "cohorts": rows,
+        "latency_ms": (time.perf_counter() - started) * 1e3,
+    })
+
+
+def _select_model(name: Optional[str]):
+    """The default model, or the registry model a request names (loaded on first use)."""
+    if not name:
+        return model
+    if models is None:
+        raise HTTPException(status_code=404, detail="Model routing is not enabled")
+    try:
+        return models.get(name)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+    except Exception:
+        # The registry logs the failure
+        raise HTTPException(status_code=503, detail=f"Model '{name}' could not be loaded")
+
+
+async def _select_model_async(name: Optional[str]):
+    """`_select_model` for async routes: a model that is not resident loads off the event loop."""
+    if name and models is not None:
+        resident = models.resident(name)
+        if resident is not None:
+            return resident
+        return await run_in_threadpool(_select_model, name)
+    return _select_model(name)
+
+
+def _load_routed_model(path: str) -> ReadmissionModel:
+    """Load a registry model, refusing one trained on a different number of features."""
+    loaded = ReadmissionModel(path)
+    names = getattr(loaded.model, "feature_names", None)
+    expected = len(names) if names is not None else getattr(loaded.model, "n_features_in_", len(FEATURES))
+    if expected != len(FEATURES):
+        raise ValueError(f"Model {path} expects {expected} features, the API builds {len(FEATURES)}")
+    return loaded
+
+
+def _score_batch(selected, body: bytes, content_type: str, accept: str) -> Response:
+    """Decode, score and encode a batch (runs in the threadpool)."""
+    with stage("decode"):
+        categorical_maps = {"gender_key": GENDER_MAP, "race_key": RACE_MAP, "ethnicity_key": ETHNICITY_MAP}
+        try:
+            X = decode_batch(body, content_type, FEATURES, categorical_maps, DEFAULTS)
+        except BatchDecodeError as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+    with stage("model_predict"):
+        probabilities = selected.predict_batch(X) if len(X) else np.empty(0)
+    if drift is not None and len(X):
+        drift.submit(X)
+    with stage("encode"):
+        return encode_predictions(probabilities, accept)
+
+
 def _build_feature_vector(data: PatientFeatures) -> list:
     """Convert PatientFeatures into a model-ready feature vector."""
     feature_vector = []
@@ -0,0 +1,197 @@
+"""
+Structured, non-blocking logging for the prediction service.
+
+- `JsonFormatter` renders records as one JSON object per line, including any
+  fields passed with `extra={"fields": {...}}`.
+- `DeferredQueueHandler` hands records to a bounded queue without formatting them;
+  a `QueueListener` thread formats and writes them, so logging I/O never runs on
+  inference threads. When the queue is full, records are dropped and counted.
+- `log_request` emits one structured record per request, sampled per route
+  (errors are always kept), so hot routes can log a fraction of their traffic.
+
+Configured from the environment by `configure_logging()`:
+    LOG_LEVEL: Root log level (default INFO).
+    LOG_FORMAT: "json" (default) or "text".
+    LOG_SAMPLE_RATES: Per-route request log rates, e.g. "/predict=0.01,/healthz=0,*=1".
+"""
+
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+_logger = logging.getLogger(__name__)
+
+# Constants
+LOG_LEVEL_ENV = "LOG_LEVEL"
+LOG_FORMAT_ENV = "LOG_FORMAT"
+LOG_SAMPLE_RATES_ENV = "LOG_SAMPLE_RATES"
+DEFAULT_ROUTE_KEY = "*"
+MAX_QUEUE_SIZE = 10_000
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+REQUEST_LOGGER = "api.requests"
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves message formatting to the listener thread.
+
+    Unlike the standard QueueHandler, records are enqueued with their original
+    msg/args, so `%`-style arguments are only rendered if the record is written.
+    Arguments must therefore not be mutated after logging. Enqueueing never blocks:
+    when the queue is full the record is dropped and counted in `dropped`.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            # Tracebacks reference live frames; render them now
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _QueueListener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # Block (rather than raise Full) so stop() always reaches the sentinel
+        self.queue.put(self._sentinel)
+
+
+class RouteSampler:
+    """Per-route sampling rates for request logs (0.0 drops all, 1.0 keeps all)."""
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None, default_rate: float = 1.0):
+        rates = dict(rates or {})
+        self.default_rate = rates.pop(DEFAULT_ROUTE_KEY, default_rate)
+        self.rates = rates
+
+    @classmethod
+    def from_string(cls, spec: str) -> "RouteSampler":
+        """Parse "route=rate,route=rate" (use * for the default rate)."""
+        rates = {}
+        for item in filter(None, (part.strip() for part in spec.split(","))):
+            route, _, rate = item.rpartition("=")
+            if not route:
+                raise ValueError(f"Invalid sample rate '{item}', expected route=rate")
+            rates[route.strip()] = float(rate)
+        return cls(rates)
+
+    def keep(self, route: str) -> bool:
+        rate = self.rates.get(route, self.default_rate)
+        return rate >= 1.0 or (rate > 0.0 and random.random() < rate)
+
+
+_request_logger = logging.getLogger(REQUEST_LOGGER)
+_sampler = RouteSampler()
+_listener: Optional[_QueueListener] = None
+_handler: Optional[DeferredQueueHandler] = None
+_lock = threading.Lock()
+
+
+def log_request(route: str, status: int, seconds: float, **fields) -> None:
+    """
+    Emit a structured record for a finished request, subject to per-route sampling.
+
+    Server errors (status >= 500) are always logged. Costs one level check when
+    request logging is disabled and one random draw when the request is sampled out.
+    """
+    if not _request_logger.isEnabledFor(logging.INFO):
+        return
+    if status < 500 and not _sampler.keep(route):
+        return
+    fields.update({"route": route, "status": status, "duration_ms": round(seconds * 1000, 3)})
+    _request_logger.info("request", extra={"fields": fields})
+
+
+def configure_logging(
+    level: Optional[str] = None,
+    log_format: Optional[str] = None,
+    sample_rates: Optional[str] = None,
+    stream=None,
+    max_queue_size: int = MAX_QUEUE_SIZE,
+) -> logging.handlers.QueueListener:
+    """
+    Route all service logging through a background queue listener.
+
+    Arguments default to the LOG_LEVEL, LOG_FORMAT and LOG_SAMPLE_RATES env vars.
+    Replaces any handler installed by a previous call. Loggers that do not
+    propagate to the root (e.g. uvicorn's own) are left untouched.
+
+    Returns: The started QueueListener (stopped by `shutdown_logging`).
+    """
+    global _listener, _handler, _sampler
+    level = (level or os.getenv(LOG_LEVEL_ENV, "INFO")).upper()
+    log_format = (log_format or os.getenv(LOG_FORMAT_ENV, "json")).lower()
+    sample_rates = sample_rates if sample_rates is not None else os.getenv(LOG_SAMPLE_RATES_ENV, "")
+
+    with _lock:
+        _shutdown_locked()
+        output = logging.StreamHandler(stream or sys.stderr)
+        output.setFormatter(JsonFormatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT))
+        _handler = DeferredQueueHandler(queue.Queue(max_queue_size))
+        _listener = _QueueListener(_handler.queue, output, respect_handler_level=True)
+        _sampler = RouteSampler.from_string(sample_rates)
+
+        root = logging.getLogger()
+        root.addHandler(_handler)
+        root.setLevel(level)
+        _listener.start()
+    return _listener
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and remove the queue handler installed by `configure_logging`."""
+    with _lock:
+        _shutdown_locked()
+
+
+def dropped_records() -> int:
+    """Number of records dropped because the log queue was full."""
+    return _handler.dropped if _handler is not None else 0
+
+
+def _shutdown_locked() -> None:
+    global _listener, _handler
+    if _handler is not None:
+        logging.getLogger().removeHandler(_handler)
+        _handler = None
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
@@ -2,7 +2,26 @@
 Main API entry point for the Readmission Predictor service.
 """
 
-from api.endpoint import router, load_all_mappings
+import os
+from api.endpoint import (
+    BUNDLE_ENV,
+    CONFIG_PATH,
+    DRIFT_REFERENCE_ENV,
+    MODEL_REGISTRY_ENV,
+    MODEL_REGISTRY_MAX_MB_ENV,
+    SHADOW_MODEL_ENV,
+    close_database,
+    disable_drift,
+    disable_registry,
+    disable_shadow,
+    enable_drift,
+    enable_registry,
+    enable_shadow,
+    load_serving_state_async,
+    open_database,
+    router,
+)
+from api.log import configure_logging, shutdown_logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
@@ -10,9 +29,30 @@ from fastapi import FastAPI
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup code
-    load_all_mappings()
+    configure_logging()
+    # Pre-fork serving (api.serve) loads the model and mappings once in the parent process
+    if not getattr(app.state, "preloaded", False):
+        await load_serving_state_async(bundle_path=os.getenv(BUNDLE_ENV))
+    # A bundle replaces the database, so there is nothing to connect to
+    if not (getattr(app.state, "bundle_path", None) or os.getenv(BUNDLE_ENV)):
+        open_database(getattr(app.state, "config_path", CONFIG_PATH))
+    shadow_model_path = os.getenv(SHADOW_MODEL_ENV)
+    if shadow_model_path:
+        enable_shadow(shadow_model_path)
+    registry_dir = os.getenv(MODEL_REGISTRY_ENV)
+    if registry_dir:
+        max_mb = os.getenv(MODEL_REGISTRY_MAX_MB_ENV)
+        enable_registry(registry_dir, **({"max_bytes": int(float(max_mb) * 2**20)} if max_mb else {}))
+    drift_reference_path = os.getenv(DRIFT_REFERENCE_ENV)
+    if drift_reference_path:
+        enable_drift(drift_reference_path)
     yield
-    # Shutdown code (if needed) can go here
+    # Shutdown code
+    disable_drift()
+    disable_shadow()
+    disable_registry()
+    await close_database()
+    shutdown_logging()
 
 
 app = FastAPI(
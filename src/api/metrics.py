@@ -0,0 +1,308 @@
+"""
+Lightweight Prometheus metrics for the prediction service.
+
+Provides thread-safe counters, gauges and histograms rendered in the Prometheus text
+exposition format, plus an `InstrumentedRoute` that records per-route request counts,
+errors, in-flight requests, total latency, and per-stage latency:
+    - validate: request body parsing and Pydantic validation (before the endpoint runs)
+    - any stage marked in an endpoint with `with stage("name"):`
+    - serialize: response serialization (after the endpoint returns)
+"""
+
+import bisect
+import contextvars
+import os
+import resource
+import threading
+import time
+from .log import log_request
+from .profiling import PROFILE_HEADER, PROFILER, current_session, track_endpoint_thread
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from fastapi import Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Constants
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+)
+LOAD_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, label_names: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    @abstractmethod
+    def _samples(self) -> List[str]:
+        pass
+
+    def _labels(self, values: Tuple, extra: str = "") -> str:
+        pairs = [f'{k}="{_escape(v)}"' for k, v in zip(self.label_names, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, documentation, label_names=()):
+        super().__init__(name, documentation, label_names)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, labels: Tuple = (), amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, labels: Tuple = ()) -> float:
+        return self._values.get(labels, 0.0)
+
+    def _samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{self._labels(k)} {v}" for k, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, labels: Tuple = ()) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def dec(self, labels: Tuple = (), amount: float = 1.0) -> None:
+        self.inc(labels, -amount)
+
+    def replace(self, values: Dict[Tuple, float]) -> None:
+        """Replace all label sets at once (e.g. an info metric whose labels change)."""
+        with self._lock:
+            self._values = dict(values)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, label_names=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple, list] = {}
+
+    def observe(self, value: float, labels: Tuple = ()) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            state[index] += 1
+            state[-1] += value
+
+    def count(self, labels: Tuple = ()) -> int:
+        state = self._values.get(labels)
+        return sum(state[:-1]) if state else 0
+
+    def _samples(self):
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._values.items()]
+        lines = []
+        for labels, state in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), state[:-1]):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                bucket_labels = self._labels(labels, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{self._labels(labels)} {state[-1]}")
+            lines.append(f"{self.name}_count{self._labels(labels)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Render all metrics plus process RSS/CPU in Prometheus text format."""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        lines.extend(_process_metrics())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+REQUESTS = REGISTRY.register(
+    Counter("readmission_http_requests_total", "HTTP requests by route and status.", ["route", "status"])
+)
+ERRORS = REGISTRY.register(
+    Counter("readmission_http_errors_total", "HTTP requests that failed (status >= 400).", ["route"])
+)
+IN_FLIGHT = REGISTRY.register(
+    Gauge("readmission_http_requests_in_flight", "HTTP requests currently being served.", ["route"])
+)
+REQUEST_LATENCY = REGISTRY.register(
+    Histogram("readmission_http_request_duration_seconds", "End-to-end route latency.", ["route"])
+)
+STAGE_LATENCY = REGISTRY.register(
+    Histogram("readmission_stage_duration_seconds", "Latency of request stages.", ["route", "stage"])
+)
+MODEL_INFO = REGISTRY.register(
+    Gauge("readmission_model_info", "Currently loaded model version.", ["version"])
+)
+LOG_DROPPED = REGISTRY.register(
+    Gauge("readmission_log_records_dropped", "Log records dropped because the log queue was full.")
+)
+DRIFT_PSI = REGISTRY.register(
+    Gauge("readmission_feature_drift_psi", "PSI of scored traffic against the training reference.", ["feature"])
+)
+MODEL_LOADS = REGISTRY.register(
+    Counter("readmission_model_loads_total", "Models loaded on demand by the model registry.", ["model"])
+)
+MODEL_LOAD_ERRORS = REGISTRY.register(
+    Counter("readmission_model_load_errors_total", "Failed on-demand model loads.", ["model"])
+)
+MODEL_EVICTIONS = REGISTRY.register(
+    Counter("readmission_model_evictions_total", "Models evicted from the model registry.", ["model"])
+)
+MODEL_LOAD_LATENCY = REGISTRY.register(
+    Histogram("readmission_model_load_duration_seconds", "On-demand model load time.", ["model"], LOAD_BUCKETS)
+)
+MODELS_RESIDENT_BYTES = REGISTRY.register(
+    Gauge("readmission_models_resident_bytes", "Estimated memory of the models resident in the registry.")
+)
+
+
+def record_model_event(event: str, name: str, value: float) -> None:
+    """`ml.registry.ModelRegistry` listener recording load and eviction metrics."""
+    if event == "load":
+        MODEL_LOADS.inc((name,))
+        MODEL_LOAD_LATENCY.observe(value, (name,))
+    elif event == "load_error":
+        MODEL_LOAD_ERRORS.inc((name,))
+    elif event == "evict":
+        MODEL_EVICTIONS.inc((name,))
+
+
+class _RequestTimings:
+    __slots__ = ("route", "first_start", "last_end")
+
+    def __init__(self, route: str):
+        self.route = route
+        self.first_start: Optional[float] = None
+        self.last_end: Optional[float] = None
+
+
+_current: contextvars.ContextVar = contextvars.ContextVar("readmission_request_timings", default=None)
+
+
+@contextmanager
+def stage(name: str):
+    """Time a named stage of the current request (no-op outside an InstrumentedRoute)."""
+    timings = _current.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        if timings is not None:
+            if timings.first_start is None:
+                timings.first_start = start
+            timings.last_end = end
+            STAGE_LATENCY.observe(end - start, (timings.route, name))
+
+
+class InstrumentedRoute(APIRoute):
+    """
+    APIRoute that records request, error, in-flight and stage latency metrics,
+    emits a sampled structured request log (`api.log`), and starts an opt-in
+    profile session for requests selected by `api.profiling`.
+    """
+
+    def __init__(self, path, endpoint, **kwargs):
+        super().__init__(path, track_endpoint_thread(endpoint), **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        route = self.path
+
+        async def instrumented_handler(request: Request):
+            timings = _RequestTimings(route)
+            token = _current.set(timings)
+            labels = (route,)
+            IN_FLIGHT.inc(labels)
+            session = None
+            if PROFILER.enabled:
+                session = PROFILER.start_request(request.headers.get(PROFILE_HEADER), route)
+                current_session.set(session)
+            start = time.perf_counter()
+            status = 500
+            try:
+                response = await handler(request)
+                status = response.status_code
+                return response
+            except RequestValidationError:
+                status = 422
+                raise
+            except Exception as e:
+                status = getattr(e, "status_code", 500)
+                raise
+            finally:
+                end = time.perf_counter()
+                IN_FLIGHT.dec(labels)
+                _current.reset(token)
+                if session is not None:
+                    PROFILER.finish(session)
+                REQUESTS.inc((route, str(status)))
+                if status >= 400:
+                    ERRORS.inc(labels)
+                REQUEST_LATENCY.observe(end - start, labels)
+                log_request(route, status, end - start)
+                if timings.first_start is not None:
+                    STAGE_LATENCY.observe(timings.first_start - start, (route, "validate"))
+                    STAGE_LATENCY.observe(end - timings.last_end, (route, "serialize"))
+
+        return instrumented_handler
+
+
+def _process_metrics() -> List[str]:
+    rss = _resident_memory_bytes()
+    return [
+        "# HELP process_resident_memory_bytes Resident memory size in bytes.",
+        "# TYPE process_resident_memory_bytes gauge",
+        f"process_resident_memory_bytes {rss}",
+        "# HELP process_cpu_seconds_total Total user and system CPU time in seconds.",
+        "# TYPE process_cpu_seconds_total counter",
+        f"process_cpu_seconds_total {time.process_time()}",
+    ]
+
+
+def _resident_memory_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except OSError:
+        # Peak RSS (KiB on Linux) where /proc is unavailable
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
@@ -3,7 +3,7 @@ Pydantic schema for API request model.
 """
 
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional, Union
 
 
 class PatientFeatures(BaseModel):
@@ -42,3 +42,31 @@ class PatientFeatures(BaseModel):
     num_procedures: Optional[int] = None
     had_surgery: Optional[bool] = None
     had_biopsy: Optional[bool] = None
+
+
+class FeatureSweep(BaseModel):
+    """
+    Values to try for one `PatientFeatures` field in a what-if request.
+
+    Give either `values` (e.g. [true, false] or ["f", "m"]) or an inclusive integer
+    range `start`..`stop` in steps of `step`.
+    """
+
+    feature: str
+    values: Optional[List[Union[bool, int, str]]] = None
+    start: Optional[int] = None
+    stop: Optional[int] = None
+    step: int = 1
+
+
+class WhatIfRequest(BaseModel):
+    """
+    One patient and the feature sweeps to score around it.
+
+    With `cross` false each sweep varies one feature at a time (one response curve
+    per sweep); with `cross` true every combination of the swept values is scored.
+    """
+
+    patient: PatientFeatures = PatientFeatures()
+    sweeps: List[FeatureSweep]
+    cross: bool = False
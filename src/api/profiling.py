@@ -0,0 +1,217 @@
+"""
+Opt-in sampling profiler for the prediction service.
+
+A background thread periodically samples Python stacks with `sys._current_frames()`
+and aggregates them into collapsed-stack files (one "frame;frame;frame count" line
+per unique stack, readable by flamegraph.pl and speedscope). Profiling can target:
+    - a single request: send the `X-Profile-Token` header matching PROFILE_TOKEN,
+      or set PROFILE_SAMPLE_RATE (0.0-1.0) to profile a random share of requests.
+    - the whole process for N seconds: POST /admin/profile?seconds=N with the header.
+
+Only the threads serving a profiled request are sampled: the worker thread running a
+sync endpoint (never shared with concurrent requests) and the event loop thread
+(where validation and serialization run; its samples may include other requests'
+async work). When no token or sample rate is configured, the profiler is disabled
+and costs a single attribute check per request.
+"""
+
+import asyncio
+import contextvars
+import functools
+import hmac
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Optional
+
+_logger = logging.getLogger(__name__)
+
+# Constants
+PROFILE_TOKEN_ENV = "PROFILE_TOKEN"
+PROFILE_SAMPLE_RATE_ENV = "PROFILE_SAMPLE_RATE"
+PROFILE_DIR_ENV = "PROFILE_DIR"
+PROFILE_HEADER = "X-Profile-Token"
+DEFAULT_PROFILE_DIR = "profiles"
+DEFAULT_INTERVAL = 0.005
+MAX_PROCESS_SECONDS = 300
+
+
+class ProfileSession:
+    """Collected stack samples for one request or one process-wide capture."""
+
+    def __init__(self, name: str, all_threads: bool = False):
+        self.name = name
+        self.all_threads = all_threads
+        self.thread_ids = set()
+        self._lock = threading.Lock()
+        self.stacks = Counter()
+        self.samples = 0
+        self.started_at = time.time()
+        self.id = uuid.uuid4().hex[:8]
+
+    def add_thread(self, thread_id: int) -> None:
+        with self._lock:
+            self.thread_ids.add(thread_id)
+
+    def sample(self, frames: dict, sampler_id: int) -> None:
+        with self._lock:
+            thread_ids = tuple(frames if self.all_threads else self.thread_ids)
+        for thread_id in thread_ids:
+            frame = frames.get(thread_id)
+            if frame is None or thread_id == sampler_id:
+                continue
+            self.stacks[_collapse(frame)] += 1
+        self.samples += 1
+
+    def path(self, output_dir: str) -> str:
+        """File path this session is written to under output_dir."""
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.localtime(self.started_at))
+        safe_name = self.name.strip("/").replace("/", "_") or "root"
+        return os.path.join(output_dir, f"{stamp}_{safe_name}_{self.id}.folded")
+
+    def write(self, output_dir: str) -> str:
+        """Write collapsed stacks to output_dir and return the file path."""
+        os.makedirs(output_dir, exist_ok=True)
+        path = self.path(output_dir)
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        return path
+
+
+class _Sampler:
+    """Single background thread that samples all active sessions, then exits when idle."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._sessions = set()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def add(self, session: ProfileSession) -> None:
+        with self._lock:
+            self._sessions.add(session)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+                self._thread.start()
+
+    def remove(self, session: ProfileSession) -> None:
+        with self._lock:
+            self._sessions.discard(session)
+
+    def _run(self) -> None:
+        sampler_id = threading.get_ident()
+        while True:
+            with self._lock:
+                sessions = list(self._sessions)
+                if not sessions:
+                    self._thread = None
+                    return
+            frames = sys._current_frames()
+            for session in sessions:
+                session.sample(frames, sampler_id)
+            del frames
+            time.sleep(self.interval)
+
+
+class Profiler:
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        sample_rate: float = 0.0,
+        output_dir: str = DEFAULT_PROFILE_DIR,
+        interval: float = DEFAULT_INTERVAL,
+    ):
+        """
+        params:
+            token: Secret that must be sent in the X-Profile-Token header (None disables).
+            sample_rate: Fraction of requests profiled without a header (0 disables).
+            output_dir: Directory where collapsed-stack files are written.
+            interval: Seconds between stack samples.
+        """
+        self.token = token
+        self.sample_rate = sample_rate
+        self.output_dir = output_dir
+        self.enabled = bool(token) or sample_rate > 0
+        self._sampler = _Sampler(interval)
+
+    @classmethod
+    def from_env(cls) -> "Profiler":
+        return cls(
+            token=os.getenv(PROFILE_TOKEN_ENV) or None,
+            sample_rate=float(os.getenv(PROFILE_SAMPLE_RATE_ENV, "0") or 0),
+            output_dir=os.getenv(PROFILE_DIR_ENV, DEFAULT_PROFILE_DIR),
+        )
+
+    def authorized(self, header_value: Optional[str]) -> bool:
+        """True if the header value matches the configured token."""
+        # Compared as bytes: compare_digest rejects non-ASCII str
+        return bool(self.token and header_value) and hmac.compare_digest(header_value.encode(), self.token.encode())
+
+    def start_request(self, header_value: Optional[str], route: str) -> Optional[ProfileSession]:
+        """Start profiling the current request if it was selected by header or sampling."""
+        if not (self.authorized(header_value) or (self.sample_rate and random.random() < self.sample_rate)):
+            return None
+        session = ProfileSession(route)
+        session.add_thread(threading.get_ident())
+        self._sampler.add(session)
+        return session
+
+    def finish(self, session: ProfileSession) -> str:
+        """Stop sampling a session and write its output."""
+        self._sampler.remove(session)
+        path = session.write(self.output_dir)
+        _logger.info(f"Profile of {session.name} ({session.samples} samples) written to {path}")
+        return path
+
+    def profile_process(self, seconds: float) -> str:
+        """
+        Sample every thread for `seconds` in the background.
+
+        Returns: Path the collapsed stacks will be written to when the capture ends.
+        """
+        seconds = min(float(seconds), MAX_PROCESS_SECONDS)
+        session = ProfileSession("process", all_threads=True)
+        self._sampler.add(session)
+        timer = threading.Timer(seconds, self.finish, args=(session,))
+        timer.daemon = True
+        timer.start()
+        return session.path(self.output_dir)
+
+
+PROFILER = Profiler.from_env()
+
+current_session: contextvars.ContextVar = contextvars.ContextVar("readmission_profile_session", default=None)
+
+
+def track_endpoint_thread(endpoint):
+    """
+    Wrap a sync endpoint so the threadpool thread running it joins the request's session.
+
+    Async endpoints run on the event loop thread, which is already tracked.
+    """
+    if asyncio.iscoroutinefunction(endpoint):
+        return endpoint
+
+    @functools.wraps(endpoint)
+    def wrapper(*args, **kwargs):
+        session = current_session.get()
+        if session is not None:
+            session.add_thread(threading.get_ident())
+        return endpoint(*args, **kwargs)
+
+    return wrapper
+
+
+def _collapse(frame) -> str:
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        parts.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(parts))
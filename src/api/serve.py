@@ -0,0 +1,184 @@
+"""
+Pre-fork multi-worker serving for the prediction API.
+
+The parent process loads the model and dimension mappings once, freezes the GC so
+that collections in workers do not touch (and copy) inherited objects, binds the
+listening socket, and forks uvicorn workers that share the socket and inherit the
+preloaded state copy-on-write. Workers can optionally be pinned to CPU cores.
+Crashed workers are restarted; a worker that dies right after starting stops the
+server, since restarting it would fail the same way.
+
+Settings come from the `serving:` section of the DB config YAML (see `DEFAULT_SERVING`).
+"""
+
+import gc
+import logging
+import os
+import signal
+import socket
+import time
+import uvicorn
+import yaml
+from pathlib import Path
+from typing import Dict, List, Optional
+
+_logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_SERVING = {
+    "host": "0.0.0.0",
+    "port": 8000,
+    "workers": 1,
+    "pin_cpus": False,
+    "backlog": 2048,
+    "model_path": None,
+    "bundle_path": None,
+    "log_level": "info",
+}
+STARTUP_GRACE_SECONDS = 5.0
+RESPAWN_BACKOFF_SECONDS = 1.0
+
+
+def load_serving_config(config_path: str) -> dict:
+    """Read the `serving:` section of the config YAML, filled in with defaults."""
+    with open(config_path) as f:
+        config = yaml.safe_load(f) or {}
+    unknown = set(config.get("serving") or {}) - set(DEFAULT_SERVING)
+    if unknown:
+        raise ValueError(f"Unknown serving settings: {sorted(unknown)}")
+    return {**DEFAULT_SERVING, **(config.get("serving") or {})}
+
+
+def preload_app(config_path: str, model_path: Optional[str] = None, bundle_path: Optional[str] = None):
+    """
+    Load the model and dimension mappings in the current (parent) process.
+
+    params:
+        config_path: DB config YAML used to load the dimension mappings.
+        model_path: Optional model to serve instead of the default one.
+        bundle_path: Optional serving bundle; replaces both the model and the database.
+
+    Returns: The FastAPI app, marked so its lifespan skips reloading them.
+    """
+    from api import endpoint
+    from api.main import app
+
+    endpoint.load_serving_state(Path(config_path), model_path, bundle_path)
+    app.state.preloaded = True
+    # Each worker's lifespan opens its own database connection from these
+    app.state.config_path = Path(config_path)
+    app.state.bundle_path = bundle_path
+    return app
+
+
+class PreforkServer:
+    def __init__(
+        self,
+        app,
+        host: str = DEFAULT_SERVING["host"],
+        port: int = DEFAULT_SERVING["port"],
+        workers: int = DEFAULT_SERVING["workers"],
+        pin_cpus: bool = DEFAULT_SERVING["pin_cpus"],
+        backlog: int = DEFAULT_SERVING["backlog"],
+        log_level: str = DEFAULT_SERVING["log_level"],
+    ):
+        """
+        params:
+            app: Preloaded ASGI app (see `preload_app`).
+            host, port: Address to listen on.
+            workers: Number of forked worker processes.
+            pin_cpus: Pin worker i to the i-th CPU available to this process (round robin).
+            backlog: Listen backlog of the shared socket.
+            log_level: uvicorn log level for the workers.
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.cpus: Optional[List[int]] = sorted(os.sched_getaffinity(0)) if pin_cpus else None
+        self.backlog = backlog
+        self.log_level = log_level
+        self.children: Dict[int, int] = {}  # pid -> worker slot
+        self._started_at: Dict[int, float] = {}
+        self._stopping = False
+        self._socket: Optional[socket.socket] = None
+
+    def run(self) -> int:
+        """Fork the workers and supervise them until stopped. Returns the exit status."""
+        self._socket = self._bind()
+        # Move everything loaded so far out of the collector's reach, so workers'
+        # collections do not write to (and un-share) the inherited pages
+        gc.collect()
+        gc.freeze()
+
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        for slot in range(self.workers):
+            self._spawn(slot)
+        _logger.info(f"Serving on {self.host}:{self.port} with {self.workers} worker(s)")
+
+        status = 0
+        while self.children:
+            try:
+                pid, wait_status = os.wait()
+            except ChildProcessError:
+                break
+            slot = self.children.pop(pid, None)
+            started_at = self._started_at.pop(pid, 0.0)
+            if slot is None or self._stopping:
+                continue
+            code = os.waitstatus_to_exitcode(wait_status)
+            if time.monotonic() - started_at < STARTUP_GRACE_SECONDS:
+                _logger.error(f"Worker {pid} exited with {code} during startup; stopping")
+                status = 1
+                self._handle_stop(signal.SIGTERM, None)
+                continue
+            _logger.warning(f"Worker {pid} exited with {code}; restarting")
+            time.sleep(RESPAWN_BACKOFF_SECONDS)
+            self._spawn(slot)
+        self._socket.close()
+        return status
+
+    def _bind(self) -> socket.socket:
+        family = socket.AF_INET6 if ":" in self.host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(self.backlog)
+        sock.set_inheritable(True)
+        return sock
+
+    def _spawn(self, slot: int) -> None:
+        pid = os.fork()
+        if pid:
+            self.children[pid] = slot
+            self._started_at[pid] = time.monotonic()
+            return
+
+        # Worker process: never returns into the supervisor loop
+        code = 1
+        try:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            # The app's lifespan installs the worker's own (queued) log handler
+            for handler in logging.root.handlers[:]:
+                logging.root.removeHandler(handler)
+            if self.cpus:
+                os.sched_setaffinity(0, {self.cpus[slot % len(self.cpus)]})
+            config = uvicorn.Config(self.app, log_level=self.log_level, lifespan="on")
+            uvicorn.Server(config).run(sockets=[self._socket])
+            code = 0
+        except BaseException:
+            _logger.exception(f"Worker {os.getpid()} failed")
+        finally:
+            os._exit(code)
+
+    def _handle_stop(self, signum, frame) -> None:
+        self._stopping = True
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
@@ -0,0 +1,141 @@
+"""
+What-if (sensitivity) analysis around a single patient.
+
+A what-if request perturbs one patient's feature vector along a set of feature
+sweeps. The whole perturbation grid, with the unperturbed patient as its first row,
+is built as one float32 matrix by broadcasting the base vector, and scored with a
+single model call. Sweeps are either scored one feature at a time (a response curve
+per sweep) or crossed (every combination of the swept values).
+"""
+
+import math
+import numpy as np
+from .codecs import BatchDecodeError
+from .model import FeatureSweep, PatientFeatures
+from typing import Dict, List, Tuple
+
+# Constants
+MAX_GRID_ROWS = 10_000
+SWEEPABLE = list(PatientFeatures.model_fields)
+CATEGORICAL = {"gender", "race", "ethnicity"}
+
+
+class SweepError(BatchDecodeError):
+    """Raised for an invalid or oversized sweep; `status_code` is the HTTP status to return."""
+
+
+def sweep_values(sweep: FeatureSweep) -> list:
+    """The request values a sweep asks for, as given (before encoding)."""
+    if sweep.feature not in SWEEPABLE:
+        raise SweepError(f"Unknown feature '{sweep.feature}'")
+    has_range = sweep.start is not None or sweep.stop is not None
+    if (sweep.values is not None) == has_range:
+        raise SweepError(f"Sweep of '{sweep.feature}' needs either values or start/stop")
+    if sweep.values is not None:
+        if not sweep.values:
+            raise SweepError(f"Sweep of '{sweep.feature}' has no values")
+        return list(sweep.values)
+    if sweep.start is None or sweep.stop is None or sweep.step <= 0 or sweep.stop < sweep.start:
+        raise SweepError(f"Sweep of '{sweep.feature}' needs start <= stop and a positive step")
+    # Checked before the range is materialized, so a huge range costs nothing
+    if (sweep.stop - sweep.start) // sweep.step + 1 > MAX_GRID_ROWS:
+        raise SweepError(f"Sweep of '{sweep.feature}' exceeds {MAX_GRID_ROWS} values", status_code=413)
+    return list(range(sweep.start, sweep.stop + 1, sweep.step))
+
+
+def encode_values(feature: str, values: list, categorical_maps: Dict[str, dict]) -> np.ndarray:
+    """Encode swept request values the way `/predict` encodes the field."""
+    if feature in CATEGORICAL:
+        lookup = categorical_maps[f"{feature}_key"]
+        unknown = [v for v in values if not isinstance(v, str) or v.lower() not in lookup]
+        if unknown:
+            raise SweepError(f"Unknown {feature} values: {unknown}")
+        return np.array([lookup[v.lower()] for v in values], dtype=np.float32)
+    if any(isinstance(v, str) for v in values):
+        raise SweepError(f"Sweep of '{feature}' takes numbers or booleans")
+    return np.array([int(v) for v in values], dtype=np.float32)
+
+
+def prepare_sweeps(
+    sweeps: List[FeatureSweep], cross: bool, features: List[str], categorical_maps: Dict[str, dict]
+) -> Tuple[List[int], List[list], List[np.ndarray]]:
+    """
+    Validate sweeps against the grid cap and encode their values.
+
+    params:
+        sweeps: Requested sweeps.
+        cross: Whether the sweeps are crossed.
+        features: Model feature order.
+        categorical_maps: Label -> key mappings of the categorical model columns.
+
+    Returns: Tuple of (model column per sweep, requested values, encoded values).
+    """
+    if not sweeps:
+        raise SweepError("At least one sweep is required")
+    names = [s.feature for s in sweeps]
+    if len(set(names)) != len(names):
+        raise SweepError(f"Each feature can be swept once: {names}")
+    requested = [sweep_values(s) for s in sweeps]
+    rows = grid_rows([len(v) for v in requested], cross)
+    if rows > MAX_GRID_ROWS:
+        raise SweepError(f"What-if grid of {rows} rows exceeds the limit of {MAX_GRID_ROWS}", status_code=413)
+    columns = [features.index(f"{name}_key" if name in CATEGORICAL else name) for name in names]
+    encoded = [encode_values(name, v, categorical_maps) for name, v in zip(names, requested)]
+    return columns, requested, encoded
+
+
+def grid_rows(sizes: List[int], cross: bool) -> int:
+    """Rows of the perturbation grid, including the base row."""
+    # math.prod: exact for any size, where an int64 product could wrap under the cap
+    return 1 + (math.prod(sizes) if cross else sum(sizes))
+
+
+def build_grid(base: np.ndarray, columns: List[int], values: List[np.ndarray], cross: bool) -> np.ndarray:
+    """
+    Perturbation matrix: the base vector, then one row per perturbed point.
+
+    params:
+        base: Base feature vector (model feature order).
+        columns: Model column index of each sweep.
+        values: Encoded values of each sweep.
+        cross: Score every combination (rows in C order over the sweeps) instead of
+            varying one sweep at a time (rows grouped per sweep).
+
+    Returns: (rows x features) float32 matrix.
+    """
+    sizes = [len(v) for v in values]
+    X = np.empty((grid_rows(sizes, cross), len(base)), dtype=np.float32)
+    X[:] = base
+    if cross:
+        grid = np.meshgrid(*values, indexing="ij")
+        for column, axis in zip(columns, grid):
+            X[1:, column] = axis.ravel()
+        return X
+    start = 1
+    for column, column_values in zip(columns, values):
+        X[start:start + len(column_values), column] = column_values
+        start += len(column_values)
+    return X
+
+
+def curves(sweeps: List[FeatureSweep], values: List[list], probabilities: np.ndarray, cross: bool) -> dict:
+    """Response body: the base probability and the response curves (or the crossed grid)."""
+    body = {"baseline": float(probabilities[0])}
+    if cross:
+        shape = [len(v) for v in values]
+        body["grid"] = {
+            "features": [s.feature for s in sweeps],
+            "values": values,
+            "readmission_probability": probabilities[1:].reshape(shape).tolist(),
+        }
+        return body
+    body["curves"], start = [], 1
+    for sweep, requested in zip(sweeps, values):
+        stop = start + len(requested)
+        body["curves"].append({
+            "feature": sweep.feature,
+            "values": requested,
+            "readmission_probability": probabilities[start:stop].tolist(),
+        })
+        start = stop
+    return body
@@ -0,0 +1,93 @@
+"""
+Batch payload decode benchmarks: cost per row of turning a request body into the
+model's feature matrix, for per-row Pydantic JSON versus column batches in JSON,
+MessagePack and Arrow IPC (see `api.codecs`).
+"""
+
+import json
+import logging
+import numpy as np
+import pyarrow as pa
+from api import codecs
+from api.model import PatientFeatures
+from bench.harness import measure
+from bench.load import GENDERS, synthetic_payloads
+from bench.synthetic import format_size
+from ml.data import FEATURES
+from pydantic import TypeAdapter
+from typing import Dict, List
+
+_logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_BATCH_ROWS = 1000
+REPEATS = 20
+# The API names the age feature "age" (see api.endpoint.FEATURES)
+API_FEATURES = ["age" if f == "age_at_encounter" else f for f in FEATURES]
+CATEGORICAL_MAPS = {
+    "gender_key": {g: i + 1 for i, g in enumerate(GENDERS)},
+    "race_key": {},
+    "ethnicity_key": {},
+}
+DEFAULTS = {f: 0 for f in API_FEATURES}
+
+
+def run(sizes: List[int], work_dir: str, batch_rows: int = DEFAULT_BATCH_ROWS) -> Dict[str, float]:
+    """
+    Measure decode cost per row of a `batch_rows` batch in each format (sizes are not used).
+
+    Returns: Mapping of case name to seconds per row.
+    """
+    label = format_size(batch_rows)
+    payloads = synthetic_payloads(batch_rows)
+    columns = {name: [p.get(name) for p in payloads] for name in codecs.COLUMNS}
+    adapter = TypeAdapter(List[PatientFeatures])
+
+    def decode_pydantic(body):
+        rows = adapter.validate_json(body)
+        return np.array([_row_vector(row) for row in rows], dtype=np.float32)
+
+    cases = {
+        "pydantic_json": (json.dumps(payloads).encode(), decode_pydantic),
+        "json_columns": (json.dumps(columns).encode(), _column_decoder(codecs.JSON)),
+        "arrow_columns": (_arrow_body(columns), _column_decoder(codecs.ARROW)),
+    }
+    if codecs.msgpack is not None:
+        cases["msgpack_columns"] = (codecs.msgpack.packb(columns), _column_decoder(codecs.MSGPACK))
+
+    results = {}
+    reference = None
+    for name, (body, decode) in cases.items():
+        seconds, X = measure(lambda: decode(body), repeats=REPEATS)
+        if reference is None:
+            reference = X
+        elif not np.array_equal(X, reference):
+            raise AssertionError(f"{name} decoded a different feature matrix")
+        results[f"decode_{name}_per_row@{label}"] = seconds / batch_rows
+        _logger.info(f"{name}: {len(body)} bytes, {seconds * 1000:.2f} ms per {batch_rows} rows")
+    return results
+
+
+def _column_decoder(content_type: str):
+    return lambda body: codecs.decode_batch(body, content_type, API_FEATURES, CATEGORICAL_MAPS, DEFAULTS)
+
+
+def _row_vector(row: PatientFeatures) -> list:
+    """Per-row feature vector, as the single-row /predict path builds it."""
+    vector = []
+    for feature in API_FEATURES:
+        if feature in CATEGORICAL_MAPS:
+            value = getattr(row, feature[: -len("_key")])
+            vector.append(CATEGORICAL_MAPS[feature].get(value.lower(), 0) if value is not None else 0)
+        else:
+            value = getattr(row, feature)
+            vector.append(int(value) if value is not None else 0)
+    return vector
+
+
+def _arrow_body(columns: dict) -> bytes:
+    table = pa.table(columns)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
@@ -0,0 +1,52 @@
+"""
+Cohort analytics benchmarks: latency of typical dashboard queries answered from the
+cohort cube versus the base feature table, and the cost of building the cube in
+full versus refreshing it for 1% new encounters.
+"""
+
+import logging
+from bench.harness import measure
+from bench.synthetic import format_size, generate_encounter_fact
+from db.cohort_cube import FEATURE_TABLE, build_cohort_cube, query_cohorts, refresh_cohort_cube
+from db.connection import DuckDBConnection
+from typing import Dict, List
+
+_logger = logging.getLogger(__name__)
+
+# Constants
+REPEATS = 5
+NEW_FRACTION = 0.01
+QUERIES = {
+    "demographics": (["gender_key", "race_key", "ethnicity_key"], {}),
+    "age_band_diabetes": (["age_band"], {"has_diabetes": True}),
+    "condition_pair": (["has_heart_failure", "has_kidney_disease"], {}),
+}
+
+
+def run(sizes: List[int], work_dir: str, repeats: int = REPEATS) -> Dict[str, float]:
+    """
+    Time cohort queries on both paths and cube maintenance at each size.
+
+    Returns: Mapping of case name to best seconds.
+    """
+    results = {}
+    for num_rows in sizes:
+        label = format_size(num_rows)
+        with DuckDBConnection() as conn:
+            generate_encounter_fact(conn, num_rows)
+            results[f"cohort_cube_build@{label}"], cells = measure(lambda: build_cohort_cube(conn), repeats)
+            for name, (group_by, filters) in QUERIES.items():
+                for path, use_cube in (("cube", True), ("base", False)):
+                    seconds, (_, source) = measure(lambda: query_cohorts(conn, group_by, filters, use_cube), repeats)
+                    assert source == path
+                    results[f"cohort_query_{name}_{path}@{label}"] = seconds
+
+            new_rows = max(1, int(num_rows * NEW_FRACTION))
+            conn.execute(
+                f"INSERT INTO {FEATURE_TABLE} SELECT * REPLACE (encounter_key + {num_rows} AS encounter_key) "
+                f"FROM {FEATURE_TABLE} WHERE encounter_key <= {new_rows}",
+                ddl=True,
+            )
+            results[f"cohort_cube_refresh_1pct@{label}"], refresh = measure(lambda: refresh_cohort_cube(conn))
+            _logger.info(f"{label}: {cells} cube cells; refresh added {refresh['new']} encounters")
+    return results
@@ -0,0 +1,69 @@
+"""
+Core end-to-end benchmarks: feature store load, training, and scoring.
+"""
+
+import logging
+import os
+from bench.harness import measure, measure_per_call
+from bench.synthetic import format_size, generate_encounter_fact
+from db.connection import DuckDBConnection
+from joblib import dump
+from ml.data import FEATURES, load_training_data
+from ml.model import ReadmissionModel
+from ml.train import train_logistic_regression, train_xgboost, train_xgboost_early_stopping
+from typing import Dict, List
+
+_logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_MAX_TRAIN_ROWS = 50_000
+SINGLE_PREDICT_CALLS = 200
+
+
+def run(sizes: List[int], work_dir: str, max_train_rows: int = DEFAULT_MAX_TRAIN_ROWS) -> Dict[str, float]:
+    """
+    Run the core benchmarks at each feature store size.
+
+    params:
+        sizes: Row counts of the synthetic feature store.
+        work_dir: Directory for temporary DuckDB files and models.
+        max_train_rows: Training rows are capped at this count (most recent rows kept)
+            so grid search stays tractable on large stores. Load and batch scoring
+            always use the full store.
+
+    Returns: Mapping of case name to seconds.
+    """
+    results = {}
+    for num_rows in sizes:
+        label = format_size(num_rows)
+        database = os.path.join(work_dir, f"core_{label}.duckdb")
+        with DuckDBConnection(database) as conn:
+            generate_encounter_fact(conn, num_rows)
+            load_s, data = measure(lambda: load_training_data(conn, FEATURES))
+        os.remove(database)
+        X_train, y_train, X_test, y_test = data
+        X_fit, y_fit = X_train.tail(max_train_rows), y_train.tail(max_train_rows)
+
+        results[f"load_data@{label}"] = load_s
+        results[f"train_logistic_regression@{label}"], _ = measure(
+            lambda: train_logistic_regression(X_fit, y_fit, X_test, y_test)
+        )
+        xgb_s, (xgb_model, _) = measure(lambda: train_xgboost(X_fit, y_fit, X_test, y_test))
+        results[f"train_xgboost@{label}"] = xgb_s
+        results[f"train_xgboost_early_stopping@{label}"], _ = measure(
+            lambda: train_xgboost_early_stopping(X_fit, y_fit, X_test, y_test)
+        )
+
+        model_path = os.path.join(work_dir, f"core_{label}.joblib")
+        dump(xgb_model, model_path)
+        model = ReadmissionModel(model_path)
+        row = X_test.iloc[0].astype(float).tolist()
+        results[f"predict_single@{label}"] = measure_per_call(
+            lambda: model.predict(row), SINGLE_PREDICT_CALLS
+        )
+        results[f"predict_batch@{label}"], _ = measure(
+            lambda: model.model.predict_proba(X_test), repeats=3
+        )
+        os.remove(model_path)
+        _logger.info(f"Finished core benchmarks at {label} rows")
+    return results
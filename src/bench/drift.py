@@ -0,0 +1,98 @@
+"""
+Drift monitoring benchmarks: primary-path prediction latency with drift monitoring
+off and on, binning throughput of the background worker, and the memory the monitor
+holds after streaming each requested number of rows (which should not grow).
+"""
+
+import itertools
+import logging
+import numpy as np
+import os
+import time
+import tracemalloc
+from bench.harness import latency_percentiles, measure
+from bench.synthetic import format_size, generate_encounter_fact, make_reference_model
+from db.connection import DuckDBConnection
+from joblib import dump
+from ml.data import FEATURES, load_training_data
+from ml.drift import DriftMonitor, build_reference
+from ml.model import ReadmissionModel
+from typing import Dict, List
+
+_logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_CALLS = 5000
+STREAM_CHUNK_ROWS = 1000
+
+
+def run(sizes: List[int], work_dir: str, calls: int = DEFAULT_CALLS) -> Dict[str, float]:
+    """
+    Time the predict path with and without drift monitoring, and measure monitor memory.
+
+    The model and the reference are built from a feature store of the smallest size.
+
+    Returns: Mapping of case name to seconds (p50 and p99 per call, binning per row)
+        or bytes (monitor memory after streaming each size).
+    """
+    num_rows = min(sizes)
+    label = format_size(num_rows)
+    with DuckDBConnection() as conn:
+        generate_encounter_fact(conn, num_rows)
+        X_train, _, X_test, _ = load_training_data(conn, FEATURES)
+    reference = build_reference(X_train)
+    model, _ = make_reference_model(num_rows)
+    model_path = os.path.join(work_dir, "drift_model.joblib")
+    dump(model, model_path)
+    primary = ReadmissionModel(model_path)
+    X = X_test.to_numpy(dtype=np.float64)
+    rows = itertools.cycle(X.tolist())
+
+    results = {}
+    for name, value in latency_percentiles(lambda: primary.predict(next(rows)), calls).items():
+        results[f"predict_drift_off_{name}@{label}"] = value
+
+    # Sketches are keyed by API feature names, in training column order
+    features = list(reference["features"])
+    monitor = DriftMonitor(reference, features).start()
+
+    def predict_with_drift():
+        row = next(rows)
+        primary.predict(row)
+        monitor.submit(row)
+
+    for name, value in latency_percentiles(predict_with_drift, calls).items():
+        results[f"predict_drift_on_{name}@{label}"] = value
+    monitor.stop()
+    report = monitor.report()
+    _logger.info(f"Drift monitor: {report['rows']} rows binned, {report['dropped']} submissions dropped")
+
+    # Binning cost per row, without the queue
+    batch = [X[i:i + STREAM_CHUNK_ROWS] for i in range(0, len(X), STREAM_CHUNK_ROWS)]
+    seconds, _ = measure(lambda: DriftMonitor(reference, features)._update(batch), repeats=5)
+    results[f"drift_bin_per_row@{label}"] = seconds / len(X)
+
+    for size in sizes:
+        results[f"drift_memory_bytes@{format_size(size)}"] = _streamed_memory(reference, X, size)
+    os.remove(model_path)
+    return results
+
+
+def _streamed_memory(reference: dict, X: np.ndarray, num_rows: int) -> float:
+    """Bytes still allocated by a monitor after it has binned num_rows rows."""
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    monitor = DriftMonitor(reference, list(reference["features"]), flush_interval=0.01).start()
+    chunks = itertools.cycle(range(0, len(X), STREAM_CHUNK_ROWS))
+    streamed = 0
+    while streamed < num_rows:
+        chunk = X[next(chunks):][:min(STREAM_CHUNK_ROWS, num_rows - streamed)]
+        # Retry drops: every row must be binned for the measurement to mean anything
+        while not monitor.submit(chunk):
+            time.sleep(0.001)
+        streamed += len(chunk)
+    monitor.stop()
+    held = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    _logger.info(f"Drift monitor holds {held} bytes after {monitor.report()['rows']} rows")
+    return float(held)
@@ -0,0 +1,97 @@
+"""
+Internal fast-path benchmarks: per-request latency and CPU time of `/predict`
+(Pydantic validation + per-field coercion) versus `/predict/fast` with a JSON row
+and with a packed float32 row. Requests go through the ASGI app in-process, so the
+numbers exclude network and HTTP server overhead.
+"""
+
+import asyncio
+import httpx
+import logging
+import numpy as np
+import os
+import statistics
+import time
+from api import endpoint
+from api.codecs import PACKED
+from bench.load import synthetic_payloads
+from bench.synthetic import format_size, make_reference_model
+from fastapi import FastAPI
+from joblib import dump
+from ml.model import ReadmissionModel
+from typing import Dict, List
+
+_logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_CALLS = 2000
+WARMUP_CALLS = 100
+TOKEN = "bench-token"
+
+
+def run(sizes: List[int], work_dir: str, calls: int = DEFAULT_CALLS) -> Dict[str, float]:
+    """
+    Time sequential requests to each route with a model trained on the smallest size.
+
+    Returns: Mapping of case name to median seconds per request and CPU seconds per request.
+    """
+    label = format_size(min(sizes))
+    model, _ = make_reference_model(min(sizes))
+    model_path = os.path.join(work_dir, "fastpath_model.joblib")
+    dump(model, model_path)
+
+    payloads = synthetic_payloads(calls)
+    rows = np.array([_dense_row(p) for p in payloads], dtype=np.float32)
+    headers = {endpoint.INTERNAL_HEADER: TOKEN}
+    cases = {
+        "predict": [dict(json=p) for p in payloads],
+        "predict_fast_json": [dict(json=r.tolist(), headers=headers) for r in rows],
+        "predict_fast_packed": [
+            dict(content=r.astype("<f4").tobytes(), headers={**headers, "Content-Type": PACKED}) for r in rows
+        ],
+    }
+
+    app = FastAPI()
+    app.include_router(endpoint.router)
+    saved = endpoint.model, endpoint.INTERNAL_TOKEN
+    endpoint.model, endpoint.INTERNAL_TOKEN = ReadmissionModel(model_path), TOKEN
+    try:
+        results = {}
+        for case, requests in cases.items():
+            route = "/predict" if case == "predict" else "/predict/fast"
+            latency, cpu = asyncio.run(_time_requests(app, route, requests))
+            results[f"{case}_p50@{label}"] = latency
+            results[f"{case}_cpu_per_request@{label}"] = cpu
+            _logger.info(f"{case}: p50 {latency * 1e6:.0f} µs, CPU {cpu * 1e6:.0f} µs per request")
+    finally:
+        endpoint.model, endpoint.INTERNAL_TOKEN = saved
+    return results
+
+
+async def _time_requests(app, route: str, requests: List[dict]):
+    """Median wall time and mean process CPU time per request."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for kwargs in requests[:WARMUP_CALLS]:
+            (await client.post(route, **kwargs)).raise_for_status()
+        samples = []
+        cpu_start = time.process_time()
+        for kwargs in requests:
+            start = time.perf_counter()
+            response = await client.post(route, **kwargs)
+            samples.append(time.perf_counter() - start)
+            response.raise_for_status()
+        cpu = (time.process_time() - cpu_start) / len(requests)
+    return statistics.median(samples), cpu
+
+
+def _dense_row(payload: dict) -> list:
+    """Row in model feature order, as an internal caller that owns the encoding would send it."""
+    row = []
+    for feature in endpoint.FEATURES:
+        if feature.endswith("_key"):
+            row.append(0)
+        else:
+            value = payload.get(feature)
+            row.append(0 if value is None else int(value))
+    return row
@@ -0,0 +1,120 @@
+"""
+Timing and baseline-comparison helpers for the benchmark suite.
+
+Results are flat dictionaries mapping a case name (e.g. "train_xgboost@10k") to a
+measured value where lower is better (seconds unless the name says otherwise).
+"""
+
+import json
+import os
+import platform
+import statistics
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Constants
+DEFAULT_THRESHOLD = 1.25
+
+
+def measure(fn: Callable, repeats: int = 1) -> Tuple[float, object]:
+    """
+    Time a callable.
+
+    params:
+        fn: Zero-argument callable to time.
+        repeats: Number of runs; the fastest is reported to reduce noise.
+
+    Returns: Tuple of (best wall time in seconds, result of the last call).
+    """
+    best, result = float("inf"), None
+    for _ in range(max(1, repeats)):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def measure_per_call(fn: Callable, calls: int) -> float:
+    """Return the median wall time in seconds of `calls` invocations of `fn`."""
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def latency_percentiles(fn: Callable, calls: int, percentiles=(50, 99)) -> Dict[str, float]:
+    """
+    Time `calls` invocations of `fn` and summarize the per-call latency distribution.
+
+    Returns: Mapping such as {"p50": seconds, "p99": seconds}.
+    """
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {f"p{p}": percentile(samples, p) for p in percentiles}
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples (0.0 if empty)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, int(round(pct / 100 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def compare_to_baseline(
+    results: Dict[str, float],
+    baseline: Dict[str, float],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[dict]:
+    """
+    Find cases that got slower than the baseline by more than `threshold`.
+
+    params:
+        results: Current results.
+        baseline: Baseline results. Cases missing from either side are skipped.
+        threshold: Allowed ratio of current / baseline (1.25 = 25% slower).
+
+    Returns: List of regressions with name, baseline, current and ratio.
+    """
+    regressions = []
+    for name, current in sorted(results.items()):
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        ratio = current / reference
+        if ratio > threshold:
+            regressions.append(
+                {"name": name, "baseline": reference, "current": current, "ratio": ratio}
+            )
+    return regressions
+
+
+def load_results(path: str) -> Dict[str, float]:
+    """Load the `results` section of a benchmark JSON file (empty if missing)."""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f).get("results", {})
+
+
+def save_results(path: str, results: Dict[str, float], extra_meta: Optional[dict] = None) -> None:
+    """Write results with machine metadata (plus any extra_meta) to a benchmark JSON file."""
+    payload = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            **(extra_meta or {}),
+        },
+        "results": dict(sorted(results.items())),
+    }
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2)
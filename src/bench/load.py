@@ -0,0 +1,245 @@
+"""
+Load generator for the prediction API.
+
+Replays recorded or synthetic `PatientFeatures` payloads against a running service
+with an asyncio HTTP client, either open-loop (requests start at a fixed arrival
+rate regardless of how fast the server answers) or closed-loop (a fixed number of
+concurrent clients each send their next request as soon as the previous returns).
+
+Open-loop latency is measured from each request's scheduled start, so a server that
+falls behind shows up as queueing delay instead of silently lowering the offered load.
+"""
+
+import asyncio
+import httpx
+import json
+import logging
+import random
+import statistics
+import subprocess
+import time
+from bench.harness import percentile
+from bench.synthetic import CHRONIC_FLAGS, FLAG_RATES
+from collections import Counter
+from typing import Dict, List, Optional
+
+_logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_ROUTE = "/predict"
+DEFAULT_TIMEOUT = 10.0
+HEALTH_ROUTE = "/healthz"
+SERVER_START_TIMEOUT = 60
+MAX_CONNECTIONS = 1000
+GENDERS = ["m", "f", "unknown"]
+RACES = ["white", "black", "asian", "native", "hawaiian", "other"]
+ETHNICITIES = ["nonhispanic", "hispanic"]
+
+
+def synthetic_payloads(num_payloads: int, seed: int = 42) -> List[dict]:
+    """
+    Generate realistic `PatientFeatures` request bodies.
+
+    Boolean prevalences follow the synthetic feature store (`bench.synthetic`).
+    """
+    rng = random.Random(seed)
+    payloads = []
+    for _ in range(num_payloads):
+        payload = {
+            "age": int(rng.random() * 95),
+            "gender": rng.choice(GENDERS),
+            "race": rng.choice(RACES),
+            "ethnicity": rng.choice(ETHNICITIES),
+            "num_meds": int(rng.random() ** 2 * 30),
+            "num_procedures": int(rng.random() ** 3 * 20),
+        }
+        payload.update({name: rng.random() < rate for name, rate in FLAG_RATES.items()})
+        payload["chronic_dx_count"] = sum(payload[name] for name in CHRONIC_FLAGS)
+        payloads.append(payload)
+    return payloads
+
+
+def load_payloads(path: str) -> List[dict]:
+    """Read one JSON request body per line from a JSONL file (blank lines are skipped)."""
+    with open(path) as f:
+        payloads = [json.loads(line) for line in f if line.strip()]
+    if not payloads:
+        raise ValueError(f"No payloads found in {path}")
+    return payloads
+
+
+async def run_load(
+    base_url: str,
+    payloads: List[dict],
+    duration: float,
+    rate: Optional[float] = None,
+    concurrency: Optional[int] = None,
+    route: str = DEFAULT_ROUTE,
+    warmup: float = 0.0,
+    timeout: float = DEFAULT_TIMEOUT,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> dict:
+    """
+    Drive the service for `duration` seconds and summarize the responses.
+
+    params:
+        base_url: Service root, e.g. "http://localhost:8000".
+        payloads: Request bodies, sent round-robin.
+        duration: Seconds of measured load (after warm-up).
+        rate: Open-loop arrival rate in requests/second.
+        concurrency: Closed-loop number of concurrent clients (used when rate is None).
+        route: Path that payloads are POSTed to.
+        warmup: Seconds of load sent before measuring starts (not recorded).
+        timeout: Per-request timeout in seconds; timeouts count as errors.
+        transport: Optional httpx transport (e.g. ASGITransport for in-process apps).
+
+    Returns: Summary dict with throughput, latency percentiles and error counts.
+    """
+    if (rate is None) == (concurrency is None):
+        raise ValueError("Specify exactly one of rate or concurrency")
+    if not payloads:
+        raise ValueError("No payloads to send")
+
+    limits = httpx.Limits(max_connections=concurrency or MAX_CONNECTIONS, max_keepalive_connections=None)
+    async with httpx.AsyncClient(
+        base_url=base_url, timeout=timeout, limits=limits, transport=transport
+    ) as client:
+        recorder = _Recorder(client, route, payloads)
+        if rate is not None:
+            elapsed = await _open_loop(recorder, rate, warmup, duration)
+        else:
+            elapsed = await _closed_loop(recorder, concurrency, warmup, duration)
+
+    summary = summarize(recorder.latencies, recorder.outcomes, elapsed)
+    summary.update({
+        "mode": "open" if rate is not None else "closed",
+        "route": route,
+        "target_rate": rate,
+        "concurrency": concurrency,
+        "duration": duration,
+    })
+    return summary
+
+
+def summarize(latencies: List[float], outcomes: Counter, elapsed: float) -> dict:
+    """
+    Summarize recorded requests.
+
+    params:
+        latencies: Seconds per successful request.
+        outcomes: Count per status code or error name ("200", "503", "ReadTimeout", ...).
+        elapsed: Wall time of the measured window in seconds.
+
+    Returns: Summary dict (latencies in seconds).
+    """
+    total = sum(outcomes.values())
+    errors = total - len(latencies)
+    return {
+        "requests": total,
+        "errors": errors,
+        "error_rate": errors / total if total else 0.0,
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "outcomes": dict(sorted(outcomes.items())),
+        "latency": {
+            "mean": statistics.fmean(latencies) if latencies else 0.0,
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": max(latencies, default=0.0),
+        },
+    }
+
+
+def wait_until_healthy(base_url: str, server: subprocess.Popen, timeout: float = SERVER_START_TIMEOUT) -> None:
+    """Poll the service health route until it answers 200; stop the server and raise on failure."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with status {server.returncode}")
+        try:
+            if httpx.get(f"{base_url}{HEALTH_ROUTE}", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    server.terminate()
+    raise RuntimeError(f"Server did not become healthy within {timeout}s")
+
+
+def flatten(summary: dict) -> Dict[str, float]:
+    """Flatten a summary into benchmark-style results (see `bench.harness.save_results`)."""
+    results = {f"latency_{k}": v for k, v in summary["latency"].items()}
+    results.update({
+        "throughput": summary["throughput"],
+        "error_rate": summary["error_rate"],
+        "requests": summary["requests"],
+    })
+    return results
+
+
+class _Recorder:
+    """Sends requests round-robin over the payloads and records their outcome."""
+
+    def __init__(self, client: httpx.AsyncClient, route: str, payloads: List[dict]):
+        self.client = client
+        self.route = route
+        self.payloads = payloads
+        self.next_index = 0
+        self.latencies: List[float] = []
+        self.outcomes = Counter()
+
+    async def send(self, started: float, record: bool) -> None:
+        """Send the next payload; latency is measured from `started` (perf_counter)."""
+        payload = self.payloads[self.next_index % len(self.payloads)]
+        self.next_index += 1
+        try:
+            response = await self.client.post(self.route, json=payload)
+            outcome = str(response.status_code)
+            ok = response.status_code < 400
+        except httpx.HTTPError as e:
+            outcome, ok = type(e).__name__, False
+        latency = time.perf_counter() - started
+        if record:
+            self.outcomes[outcome] += 1
+            if ok:
+                self.latencies.append(latency)
+
+
+async def _open_loop(recorder: _Recorder, rate: float, warmup: float, duration: float) -> float:
+    interval = 1.0 / rate
+    start = time.perf_counter()
+    measure_start = start + warmup
+    end = measure_start + duration
+    tasks = set()
+    sent = 0
+    while True:
+        scheduled = start + sent * interval
+        if scheduled >= end:
+            break
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        task = asyncio.create_task(recorder.send(scheduled, scheduled >= measure_start))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        sent += 1
+    if tasks:
+        await asyncio.gather(*tasks)
+    # Throughput over the measured window, including the tail of in-flight requests
+    return max(time.perf_counter(), end) - measure_start
+
+
+async def _closed_loop(recorder: _Recorder, concurrency: int, warmup: float, duration: float) -> float:
+    start = time.perf_counter()
+    measure_start = start + warmup
+    end = measure_start + duration
+
+    async def client_loop():
+        while True:
+            now = time.perf_counter()
+            if now >= end:
+                return
+            await recorder.send(now, now >= measure_start)
+
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    return time.perf_counter() - measure_start
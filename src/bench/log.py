@@ -0,0 +1,73 @@
+"""
+Logging overhead benchmarks: cost per call of the predict debug log and of the
+per-request structured log, disabled, sampled, queued and written synchronously.
+"""
+
+import logging
+import os
+from api import log
+from bench.harness import measure
+from typing import Dict, List
+
+_logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_CALLS = 50_000
+FEATURE_VECTOR = [65, 1, 2, 1] + [0] * 10 + [3, 12, 0, 1, 0, 2, 0, 0]
+
+
+def run(sizes: List[int], work_dir: str, calls: int = DEFAULT_CALLS) -> Dict[str, float]:
+    """
+    Measure logging overhead on the request path (sizes are not used).
+
+    Returns: Mapping of case name to seconds per call.
+    """
+    root = logging.getLogger()
+    level, handlers = root.level, root.handlers[:]
+    # Measure only the handlers under test (not e.g. the runner's console handler)
+    for handler in handlers:
+        root.removeHandler(handler)
+    bench_logger = logging.getLogger("bench.log.predict")
+    results = {}
+
+    # Debug log in ReadmissionModel.predict with DEBUG disabled
+    root.setLevel(logging.INFO)
+    prob = 0.1234
+    seconds, _ = measure(lambda: [
+        bench_logger.debug(f"Input features: {FEATURE_VECTOR}, Predicted probability: {prob:.4f}")
+        for _ in range(calls)
+    ])
+    results["log_debug_fstring"] = seconds / calls
+    seconds, _ = measure(lambda: [
+        bench_logger.debug("Input features: %s, Predicted probability: %.4f", FEATURE_VECTOR, prob)
+        for _ in range(calls)
+    ])
+    results["log_debug_lazy"] = seconds / calls
+
+    def per_request():
+        seconds, _ = measure(lambda: [log.log_request("/predict", 200, 0.001) for _ in range(calls)])
+        return seconds / calls
+
+    path = os.path.join(work_dir, "bench_log.jsonl")
+    with open(path, "w") as stream:
+        log.configure_logging(level="WARNING", stream=stream)
+        results["log_request_disabled"] = per_request()
+        for name, rates in [("sampled_1pct", "/predict=0.01"), ("queued_all", "")]:
+            log.configure_logging(level="INFO", sample_rates=rates, stream=stream)
+            results[f"log_request_{name}"] = per_request()
+        log.shutdown_logging()
+
+        # Blocking baseline: format and write on the calling thread
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(log.JsonFormatter())
+        root.addHandler(handler)
+        root.setLevel(logging.INFO)
+        results["log_request_sync_all"] = per_request()
+        root.removeHandler(handler)
+
+    root.setLevel(level)
+    for handler in handlers:
+        root.addHandler(handler)
+    os.remove(path)
+    _logger.info(f"Finished logging benchmarks ({calls} calls per case)")
+    return results
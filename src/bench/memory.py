@@ -0,0 +1,123 @@
+"""
+Memory benchmarks: peak resident memory of loading the feature store, training
+and batch scoring, with compact feature dtypes (see `ml.dtypes`) versus the
+previous full-width path (`SELECT *` into pandas, sorted in pandas; one float32
+copy of the whole matrix at predict time).
+
+Each case runs in a fresh interpreter and reports its peak RSS above the resident
+size after imports. The kernel's high-water mark is reset before the case starts
+(Linux), so import-time spikes do not hide the case's own peak.
+"""
+
+import json
+import logging
+import os
+import subprocess
+import sys
+from bench.synthetic import format_size, generate_encounter_fact, make_reference_model
+from db.connection import DuckDBConnection
+from joblib import dump
+from typing import Dict, List
+
+_logger = logging.getLogger(__name__)
+
+# Constants
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(MODULE_DIR, "..")
+MIB = 1024 * 1024
+TRAIN_ROUNDS = 50
+ALL_ROWS_SPLIT = "9999-01-01"
+PROC_STATUS = "/proc/self/status"
+CLEAR_REFS = "/proc/self/clear_refs"
+RESET_PEAK = "5"  # resets VmHWM to the current RSS
+CASES = (
+    "load_legacy",
+    "load_compact",
+    "train_xgboost_legacy",
+    "train_xgboost_compact",
+    "score_batch_full_cast",
+    "score_batch_chunked",
+)
+CASE_SCRIPT = "from bench.memory import _run_case; _run_case({case!r}, {database!r}, {model!r})"
+
+
+def run(sizes: List[int], work_dir: str) -> Dict[str, float]:
+    """
+    Measure peak memory of each case on synthetic feature stores of each size.
+
+    Returns: Mapping of case name to peak MiB above the interpreter baseline, and
+        the in-memory size in MiB of the training matrix per loader.
+    """
+    model, _ = make_reference_model(min(sizes))
+    model_path = os.path.join(work_dir, "memory_model.joblib")
+    dump(model, model_path)
+
+    results = {}
+    for num_rows in sizes:
+        label = format_size(num_rows)
+        database = os.path.join(work_dir, f"memory_{label}.duckdb")
+        with DuckDBConnection(database) as conn:
+            generate_encounter_fact(conn, num_rows)
+        for case in CASES:
+            measured = _measure_case(case, database, model_path)
+            results[f"{case}_peak_mib@{label}"] = measured["peak_mib"]
+            if "matrix_mib" in measured:
+                results[f"{case}_matrix_mib@{label}"] = measured["matrix_mib"]
+            _logger.info(f"{label} {case}: peak {measured['peak_mib']:.1f} MiB")
+        os.remove(database)
+    return results
+
+
+def _measure_case(case: str, database: str, model_path: str) -> dict:
+    code = CASE_SCRIPT.format(case=case, database=database, model=model_path)
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [SRC_DIR, os.getenv("PYTHONPATH")]))}
+    output = subprocess.run([sys.executable, "-c", code], env=env, check=True, capture_output=True, text=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def _run_case(case: str, database: str, model_path: str) -> None:
+    """Run one case in this (fresh) process and print its measurements as JSON."""
+    import numpy as np
+    import xgboost as xgb
+    from ml.data import FEATURES, LABEL, load_training_data
+    from ml.model import ReadmissionModel
+
+    model = ReadmissionModel(model_path) if case.startswith("score") else None
+    with open(CLEAR_REFS, "w") as f:
+        f.write(RESET_PEAK)
+    baseline = _status_bytes("VmRSS")
+    measured = {}
+    with DuckDBConnection(database, read_only=True) as conn:
+        if case.endswith("legacy"):
+            X, y = _load_legacy(conn, FEATURES, LABEL)
+        else:
+            # Everything lands in the training split, so cases see the same rows
+            X, y, _, _ = load_training_data(conn, FEATURES, split_date=ALL_ROWS_SPLIT)
+    measured["matrix_mib"] = X.memory_usage(index=False, deep=True).sum() / MIB
+
+    if case.startswith("train"):
+        xgb.XGBClassifier(n_estimators=TRAIN_ROUNDS, max_depth=4, tree_method="hist").fit(X, y)
+    elif case == "score_batch_full_cast":
+        model.model.predict_proba(np.asarray(X, dtype=np.float32))
+    elif case == "score_batch_chunked":
+        model.predict_batch(X)
+
+    measured["peak_mib"] = (_status_bytes("VmHWM") - baseline) / MIB
+    print(json.dumps(measured))
+
+
+def _status_bytes(field: str) -> int:
+    """A memory field of /proc/self/status (reported in kB) in bytes."""
+    with open(PROC_STATUS) as f:
+        for line in f:
+            if line.startswith(f"{field}:"):
+                return int(line.split()[1]) * 1024
+    raise RuntimeError(f"{field} not found in {PROC_STATUS}")
+
+
+def _load_legacy(conn, features: List[str], label: str):
+    """The previous loader: every column into pandas, sorted and split in pandas."""
+    df = conn.execute("SELECT * FROM readmission.encounter_fact")
+    df = df.sort_values("encounter_start")
+    train = df[df["encounter_start"] < ALL_ROWS_SPLIT]
+    return train[features], train[label]
@@ -0,0 +1,66 @@
+"""
+Metrics overhead benchmarks: raw recording cost and /predict latency with and
+without `InstrumentedRoute`.
+"""
+
+import itertools
+import logging
+import os
+from api.metrics import Histogram, InstrumentedRoute, stage
+from bench.harness import latency_percentiles, measure
+from bench.synthetic import format_size, make_reference_model
+from fastapi import APIRouter, FastAPI
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from joblib import dump
+from ml.model import ReadmissionModel
+from typing import Dict, List
+
+_logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_CALLS = 2000
+OBSERVE_CALLS = 100_000
+
+
+def run(sizes: List[int], work_dir: str, calls: int = DEFAULT_CALLS) -> Dict[str, float]:
+    """
+    Measure metrics recording overhead.
+
+    Returns: Mapping of case name to seconds (per observe call, and p50/p99 per request).
+    """
+    label = format_size(min(sizes))
+    model, X_test = make_reference_model(min(sizes))
+    model_path = os.path.join(work_dir, "metrics_model.joblib")
+    dump(model, model_path)
+    readmission_model = ReadmissionModel(model_path)
+    rows = itertools.cycle(X_test.astype(float).values.tolist())
+
+    histogram = Histogram("bench_seconds", "Benchmark histogram.", ["route"])
+    seconds, _ = measure(
+        lambda: [histogram.observe(0.001, ("/predict",)) for _ in range(OBSERVE_CALLS)]
+    )
+    results = {"metrics_observe": seconds / OBSERVE_CALLS}
+
+    for name, route_class in [("plain", APIRoute), ("instrumented", InstrumentedRoute)]:
+        client = TestClient(_app(route_class, readmission_model, rows))
+        for pct, value in latency_percentiles(lambda: client.get("/predict"), calls).items():
+            results[f"predict_{name}_{pct}@{label}"] = value
+    os.remove(model_path)
+    return results
+
+
+def _app(route_class, model, rows) -> FastAPI:
+    router = APIRouter(route_class=route_class)
+
+    @router.get("/predict")
+    def predict():
+        with stage("build_features"):
+            vector = next(rows)
+        with stage("model_predict"):
+            prob = model.predict(vector)
+        return {"readmission_probability": prob}
+
+    app = FastAPI()
+    app.include_router(router)
+    return app
@@ -0,0 +1,96 @@
+"""
+Partitioned feature store benchmarks: loading a one-year training window from the
+monolithic `readmission.encounter_fact` table versus the year/month partitioned
+Parquet layout (see `db.partitioned_store`), whose loaders prune months outside
+the window. Reports load time and the bytes the scan read (DuckDB's profiler
+`total_bytes_read`).
+"""
+
+import duckdb
+import json
+import logging
+import os
+import shutil
+from bench.harness import measure
+from bench.synthetic import format_size, generate_encounter_fact
+from db.connection import DuckDBConnection
+from db.partitioned_store import (
+    FEATURE_TABLE,
+    PARTITIONED_VIEW,
+    current_version,
+    materialize_partitions,
+    partition_predicate,
+    range_filter,
+)
+from ml.data import FEATURES, LABEL, load_training_data
+from typing import Dict, List
+
+_logger = logging.getLogger(__name__)
+
+# Constants
+REPEATS = 3
+MIB = 1024 * 1024
+WINDOW = {"start_date": "2016-01-01", "split_date": "2016-10-01", "end_date": "2017-01-01"}
+PROFILING_METRICS = {"TOTAL_BYTES_READ": "true"}
+
+
+def run(sizes: List[int], work_dir: str) -> Dict[str, float]:
+    """
+    Time the one-year window load from both layouts at each feature store size.
+
+    Returns: Mapping of case name to seconds, and to MiB read by the window scan.
+    """
+    results = {}
+    for num_rows in sizes:
+        label = format_size(num_rows)
+        database = os.path.join(work_dir, f"partitions_{label}.duckdb")
+        partition_dir = os.path.join(work_dir, f"partitions_{label}")
+        with DuckDBConnection(database) as conn:
+            generate_encounter_fact(conn, num_rows)
+            materialize_partitions(conn, partition_dir)
+
+        for layout, table in (("table", FEATURE_TABLE), ("partitioned", PARTITIONED_VIEW)):
+            # A fresh connection per layout, and the scan measured before anything is cached
+            with DuckDBConnection(database, read_only=True) as conn:
+                if layout == "table":
+                    scanned = _bytes_read(conn.connect(), table)
+                else:
+                    scanned = _partition_bytes(conn.connect(), partition_dir)
+                seconds, _ = measure(
+                    lambda: load_training_data(
+                        conn, FEATURES, WINDOW["split_date"], WINDOW["start_date"], WINDOW["end_date"], table=table
+                    ),
+                    repeats=REPEATS,
+                )
+            results[f"load_year_window_{layout}@{label}"] = seconds
+            results[f"scan_mib_year_window_{layout}@{label}"] = scanned / MIB
+            _logger.info(f"{label} {layout}: {seconds:.3f}s, {scanned / MIB:.1f} MiB read")
+        os.remove(database)
+        shutil.rmtree(partition_dir)
+    return results
+
+
+def _bytes_read(conn: duckdb.DuckDBPyConnection, table: str) -> int:
+    """Bytes read by a scan of the window's feature and label columns, per the profiler."""
+    where, params = range_filter(WINDOW["start_date"], WINDOW["end_date"], partitioned=False)
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SET enable_profiling = 'no_output'")
+        cursor.execute(f"SET custom_profiling_settings = '{json.dumps(PROFILING_METRICS)}'")
+        result = cursor.execute(f"SELECT {', '.join(FEATURES + [LABEL])} FROM {table} WHERE {where}", params)
+        # to_arrow_reader replaces fetch_record_batch in newer DuckDB releases
+        for _ in (getattr(result, "to_arrow_reader", None) or result.fetch_record_batch)():
+            pass
+        return json.loads(cursor.get_profiling_information(format="json"))["total_bytes_read"]
+    finally:
+        cursor.close()
+
+
+def _partition_bytes(conn: duckdb.DuckDBPyConnection, partition_dir: str) -> int:
+    """Total size of the Parquet files whose partitions survive the window's pruning filter."""
+    files = conn.execute(
+        f"SELECT DISTINCT filename FROM read_parquet(?, hive_partitioning = true, filename = true) "
+        f"WHERE {partition_predicate(WINDOW['start_date'], WINDOW['end_date'])}",
+        [os.path.join(current_version(partition_dir), "*", "*", "*.parquet")],
+    ).fetchall()
+    return sum(os.path.getsize(name) for (name,) in files)
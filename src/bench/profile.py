@@ -0,0 +1,43 @@
+"""
+Table profiling benchmarks: wall time of a full single-pass profile of the feature
+store (see `db.table_profile`) versus a sampled one, per table size.
+"""
+
+import logging
+from bench.harness import measure
+from bench.synthetic import format_size, generate_encounter_fact
+from db import table_profile
+from db.connection import DuckDBConnection
+from typing import Dict, List
+
+_logger = logging.getLogger(__name__)
+
+# Constants
+SCHEMA = "readmission"
+TABLE = "encounter_fact"
+REPEATS = 3
+SAMPLE_ROWS = 100_000
+
+
+def run(sizes: List[int], work_dir: str, sample_rows: int = SAMPLE_ROWS) -> Dict[str, float]:
+    """
+    Profile `readmission.encounter_fact` at each size, on every row and on a sample.
+
+    Returns: Mapping of case name to seconds per profile.
+    """
+    results = {}
+    for num_rows in sizes:
+        label = format_size(num_rows)
+        with DuckDBConnection() as conn:
+            generate_encounter_fact(conn, num_rows)
+            raw = conn.connect()
+            for case, rows in (("full", None), ("sampled", sample_rows)):
+                seconds, report = measure(
+                    lambda: table_profile.profile_tables(raw, SCHEMA, [TABLE], sample_rows=rows),
+                    repeats=REPEATS,
+                )
+                if report["tables"][0]["status"] != "ok":
+                    raise AssertionError(f"Profiling {TABLE} at {label} did not finish: {report['tables'][0]}")
+                results[f"profile_{case}@{label}"] = seconds
+                _logger.info(f"{case} profile of {label} rows: {seconds:.3f}s")
+    return results
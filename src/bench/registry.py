@@ -0,0 +1,71 @@
+"""
+Model registry benchmarks: time to get a model that must be loaded versus one that is
+already resident, and time for concurrent first requests for a model, which share a
+single load, versus loading the model once per request.
+"""
+
+import logging
+import os
+import statistics
+import time
+from bench.synthetic import format_size, make_reference_model
+from concurrent.futures import ThreadPoolExecutor
+from joblib import dump
+from ml.model import ReadmissionModel
+from ml.registry import ModelRegistry
+from typing import Dict, List
+
+_logger = logging.getLogger(__name__)
+
+# Constants
+REPEATS = 10
+CONCURRENT_REQUESTS = 8
+
+
+def run(sizes: List[int], work_dir: str, repeats: int = REPEATS) -> Dict[str, float]:
+    """
+    Time registry gets with a model trained on the smallest size.
+
+    Returns: Mapping of case name to median seconds.
+    """
+    label = format_size(min(sizes))
+    model_dir = os.path.join(work_dir, "registry")
+    os.makedirs(model_dir, exist_ok=True)
+    model, _ = make_reference_model(min(sizes))
+    dump(model, os.path.join(model_dir, "v1.joblib"))
+    path = os.path.join(model_dir, "v1.joblib")
+
+    cold, warm, shared, per_request = [], [], [], []
+    for _ in range(repeats):
+        registry = ModelRegistry(model_dir)
+        cold.append(_seconds(registry.get, "v1"))
+        warm.append(_seconds(registry.get, "v1"))
+        registry = ModelRegistry(model_dir)
+        shared.append(_seconds(_concurrent, registry.get, "v1"))
+        per_request.append(_seconds(_concurrent, ReadmissionModel, path))
+
+    results = {
+        f"registry_cold_get@{label}": statistics.median(cold),
+        f"registry_warm_get@{label}": statistics.median(warm),
+        f"registry_concurrent_shared_load@{label}": statistics.median(shared),
+        f"registry_concurrent_load_per_request@{label}": statistics.median(per_request),
+    }
+    _logger.info(
+        f"cold get {results[f'registry_cold_get@{label}'] * 1e3:.1f} ms, "
+        f"warm get {results[f'registry_warm_get@{label}'] * 1e6:.1f} us; "
+        f"{CONCURRENT_REQUESTS} concurrent first requests "
+        f"{results[f'registry_concurrent_shared_load@{label}'] * 1e3:.1f} ms shared vs "
+        f"{results[f'registry_concurrent_load_per_request@{label}'] * 1e3:.1f} ms loading per request"
+    )
+    return results
+
+
+def _concurrent(fn, arg) -> None:
+    with ThreadPoolExecutor(CONCURRENT_REQUESTS) as pool:
+        list(pool.map(fn, [arg] * CONCURRENT_REQUESTS))
+
+
+def _seconds(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
@@ -0,0 +1,138 @@
+"""
+Pre-fork serving benchmarks: aggregate throughput, tail latency and per-worker
+memory of `scripts/serve_api.py` as the number of workers grows.
+
+Per-worker memory is reported as PSS (shared pages split between the processes
+mapping them) and private memory (pages only that worker touches), so the
+copy-on-write sharing of the preloaded model shows up as PSS falling with more workers.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import subprocess
+import sys
+import yaml
+from bench.load import run_load, synthetic_payloads, wait_until_healthy
+from bench.synthetic import format_size, make_reference_model
+from db.connection import DuckDBConnection
+from joblib import dump
+from typing import Dict, List, Sequence
+
+_logger = logging.getLogger(__name__)
+
+# Constants
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+SERVE_SCRIPT = os.path.join(MODULE_DIR, "..", "..", "scripts", "serve_api.py")
+DIMENSION_DDL = os.path.join(MODULE_DIR, "..", "..", "data_model", "sql", "model", "clinical.sql")
+DEFAULT_WORKER_COUNTS = (1, 2, 4)
+DEFAULT_DURATION = 5.0
+CLIENTS_PER_WORKER = 4
+WARMUP_SECONDS = 1.0
+
+
+def run(
+    sizes: List[int],
+    work_dir: str,
+    worker_counts: Sequence[int] = DEFAULT_WORKER_COUNTS,
+    duration: float = DEFAULT_DURATION,
+) -> Dict[str, float]:
+    """
+    Serve a reference model with increasing worker counts under closed-loop load.
+
+    Returns: Mapping of case name to seconds per request (inverse aggregate
+    throughput), p99 seconds, and per-worker PSS / private memory in MiB.
+    """
+    label = format_size(min(sizes))
+    config_path = _prepare(work_dir, min(sizes))
+    payloads = synthetic_payloads(1000)
+
+    results = {}
+    for workers in worker_counts:
+        port = _free_port()
+        url = f"http://127.0.0.1:{port}"
+        cmd = [
+            sys.executable, SERVE_SCRIPT, "--config-path", config_path,
+            "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers),
+        ]
+        server = subprocess.Popen(cmd, env={**os.environ, "LOG_LEVEL": "WARNING"})
+        try:
+            wait_until_healthy(url, server)
+            summary = asyncio.run(run_load(
+                url, payloads, duration=duration, warmup=WARMUP_SECONDS,
+                concurrency=CLIENTS_PER_WORKER * workers,
+            ))
+            memory = [_memory_mib(pid) for pid in _child_pids(server.pid)]
+        finally:
+            server.terminate()
+            server.wait()
+
+        results[f"serve_seconds_per_request_w{workers}@{label}"] = 1.0 / max(summary["throughput"], 1e-9)
+        results[f"serve_p99_w{workers}@{label}"] = summary["latency"]["p99"]
+        if memory:
+            results[f"serve_worker_pss_mib_w{workers}"] = sum(m["Pss"] for m in memory) / len(memory)
+            results[f"serve_worker_private_mib_w{workers}"] = sum(m["Private"] for m in memory) / len(memory)
+        _logger.info(
+            f"{workers} worker(s): {summary['throughput']:.0f} req/s, "
+            f"p99 {summary['latency']['p99'] * 1000:.1f} ms, {summary['errors']} errors"
+        )
+    return results
+
+
+def _prepare(work_dir: str, num_rows: int) -> str:
+    """Write a reference model, an empty dimension DB and a serving config to work_dir."""
+    model, _ = make_reference_model(num_rows)
+    model_path = os.path.join(work_dir, "serve_model.joblib")
+    dump(model, model_path)
+
+    database = os.path.join(work_dir, "serve_dims.duckdb")
+    with DuckDBConnection(database) as conn:
+        conn.execute_file(DIMENSION_DDL, ddl=True)
+
+    config_path = os.path.join(work_dir, "serve_config.yaml")
+    config = {
+        "db_type": "duckdb",
+        "database": database,
+        "read_only": True,
+        "serving": {"model_path": model_path, "log_level": "warning"},
+    }
+    with open(config_path, "w") as f:
+        yaml.safe_dump(config, f)
+    return config_path
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _child_pids(parent_pid: int) -> List[int]:
+    pids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # Field 4 is the parent pid; the command name (field 2) may contain spaces
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == parent_pid:
+            pids.append(int(entry))
+    return pids
+
+
+def _memory_mib(pid: int) -> Dict[str, float]:
+    """PSS and private (clean + dirty) memory of a process in MiB."""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                values[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    return {
+        "Pss": values.get("Pss", 0.0),
+        "Private": values.get("Private_Clean", 0.0) + values.get("Private_Dirty", 0.0),
+    }
@@ -0,0 +1,57 @@
+"""
+Shadow scoring benchmarks: primary-path prediction latency with shadow mode off and on.
+"""
+
+import itertools
+import logging
+import os
+from bench.harness import latency_percentiles
+from bench.synthetic import format_size, make_reference_model
+from joblib import dump
+from ml.model import ReadmissionModel
+from ml.shadow import ShadowScorer
+from typing import Dict, List
+
+_logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_CALLS = 5000
+
+
+def run(sizes: List[int], work_dir: str, calls: int = DEFAULT_CALLS) -> Dict[str, float]:
+    """
+    Time the primary predict path with and without a shadow scorer attached.
+
+    The model is trained on the smallest requested size; the same artifact is used as
+    primary and candidate so the background worker does comparable work.
+
+    Returns: Mapping of case name to seconds (p50 and p99 per call).
+    """
+    num_rows = min(sizes)
+    label = format_size(num_rows)
+    model, X_test = make_reference_model(num_rows)
+    model_path = os.path.join(work_dir, "shadow_model.joblib")
+    dump(model, model_path)
+    primary = ReadmissionModel(model_path)
+    rows = itertools.cycle(X_test.astype(float).values.tolist())
+
+    results = {}
+    for name, value in latency_percentiles(lambda: primary.predict(next(rows)), calls).items():
+        results[f"predict_shadow_off_{name}@{label}"] = value
+
+    scorer = ShadowScorer(ReadmissionModel(model_path)).start()
+
+    def predict_with_shadow():
+        row = next(rows)
+        scorer.submit(row, primary.predict(row))
+
+    for name, value in latency_percentiles(predict_with_shadow, calls).items():
+        results[f"predict_shadow_on_{name}@{label}"] = value
+    scorer.stop()
+    stats = scorer.stats()
+    _logger.info(
+        f"Shadow scorer: {stats['scored']} scored, {stats['dropped']} dropped, "
+        f"max |delta| {stats['max_abs_delta']:.2e}"
+    )
+    os.remove(model_path)
+    return results
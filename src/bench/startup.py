@@ -0,0 +1,123 @@
+"""
+API startup benchmarks: cold-start time and on-disk footprint of serving from the
+DuckDB warehouse (joblib model + dimension tables) versus a self-contained serving
+bundle (see `api.bundle`).
+
+Each start runs in a fresh interpreter, so import costs (DuckDB, pandas) are included.
+The footprint cases report the serving files plus the installed packages each
+approach needs at runtime; a bundle-only image can leave out the database drivers.
+"""
+
+import importlib.util
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import time
+import yaml
+from api.bundle import export_bundle
+from api.endpoint import DEFAULTS, FEATURES
+from bench.load import ETHNICITIES, GENDERS, RACES
+from bench.synthetic import format_size, generate_encounter_fact, make_reference_model
+from db.connection import DuckDBConnection
+from joblib import dump
+from typing import Dict, List
+
+_logger = logging.getLogger(__name__)
+
+# Constants
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(MODULE_DIR, "..")
+DIMENSION_DDL = os.path.join(MODULE_DIR, "..", "..", "data_model", "sql", "model", "clinical.sql")
+DATABASE_PACKAGES = ("duckdb", "pandas")
+STARTS = 5
+MIB = 1024 * 1024
+START_SCRIPT = (
+    "from api import endpoint; from pathlib import Path; "
+    "endpoint.load_serving_state(Path({config!r}), {model!r}, {bundle!r})"
+)
+
+
+def run(sizes: List[int], work_dir: str, starts: int = STARTS) -> Dict[str, float]:
+    """
+    Time cold starts from the warehouse and from a bundle, per warehouse size.
+
+    Returns: Mapping of case name to median seconds per start, and footprints in MiB.
+    """
+    model, _ = make_reference_model(min(sizes))
+    model_path = os.path.join(work_dir, "startup_model.joblib")
+    dump(model, model_path)
+
+    results = {}
+    for num_rows in sizes:
+        label = format_size(num_rows)
+        config_path, database = _prepare_warehouse(work_dir, num_rows)
+        bundle_path = os.path.join(work_dir, f"startup_bundle_{label}.npz")
+        with DuckDBConnection(database, read_only=True) as conn:
+            mappings = {
+                "gender_key": _mapping(conn, "gender_dim", "gender_key"),
+                "race_key": _mapping(conn, "race_dim", "race_key"),
+                "ethnicity_key": _mapping(conn, "ethnicity_dim", "ethnicity_key"),
+            }
+        export_bundle(model, bundle_path, FEATURES, DEFAULTS, mappings)
+
+        warehouse = _median_start(config_path, model_path, None, starts)
+        bundle = _median_start(config_path, None, bundle_path, starts)
+        results[f"startup_warehouse@{label}"] = warehouse
+        results[f"startup_bundle@{label}"] = bundle
+        results[f"serving_files_mib_warehouse@{label}"] = (
+            os.path.getsize(model_path) + os.path.getsize(database)
+        ) / MIB
+        results[f"serving_files_mib_bundle@{label}"] = os.path.getsize(bundle_path) / MIB
+        _logger.info(f"{label}: warehouse start {warehouse:.3f}s, bundle start {bundle:.3f}s")
+
+    results["database_packages_mib"] = sum(_package_size(name) for name in DATABASE_PACKAGES) / MIB
+    return results
+
+
+def _prepare_warehouse(work_dir: str, num_rows: int):
+    """Write a warehouse with populated dimensions and a feature store of num_rows rows."""
+    database = os.path.join(work_dir, f"startup_{format_size(num_rows)}.duckdb")
+    if os.path.exists(database):
+        os.remove(database)
+    with DuckDBConnection(database) as conn:
+        conn.execute_file(DIMENSION_DDL, ddl=True)
+        for table, labels in (("gender_dim", GENDERS), ("race_dim", RACES), ("ethnicity_dim", ETHNICITIES)):
+            values = ", ".join(f"('{label}')" for label in labels)
+            conn.execute(f"INSERT INTO clinical.{table} (description) VALUES {values}", ddl=True)
+        generate_encounter_fact(conn, num_rows)
+
+    config_path = os.path.join(work_dir, f"startup_{format_size(num_rows)}.yaml")
+    with open(config_path, "w") as f:
+        yaml.safe_dump({"db_type": "duckdb", "database": database, "read_only": True}, f)
+    return config_path, database
+
+
+def _mapping(conn, table: str, key: str) -> Dict[str, int]:
+    rows = conn.execute(f"SELECT description, {key} FROM clinical.{table}")
+    return {label.lower(): int(value) for label, value in zip(rows["description"], rows[key])}
+
+
+def _median_start(config_path: str, model_path, bundle_path, starts: int) -> float:
+    """Median wall time of loading the serving state in a fresh interpreter."""
+    code = START_SCRIPT.format(config=config_path, model=model_path, bundle=bundle_path)
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [SRC_DIR, os.getenv("PYTHONPATH")]))}
+    samples = []
+    for _ in range(starts):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], env=env, check=True)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def _package_size(name: str) -> int:
+    """Installed size in bytes of a top-level package (0 if not installed)."""
+    spec = importlib.util.find_spec(name)
+    if spec is None or not spec.submodule_search_locations:
+        return 0
+    total = 0
+    for location in spec.submodule_search_locations:
+        for root, _, files in os.walk(location):
+            total += sum(os.path.getsize(os.path.join(root, f)) for f in files)
+    return total
@@ -0,0 +1,152 @@
+"""
+Synthetic feature store generator for benchmarks.
+
+Builds `readmission.encounter_fact` with the production DDL and fills it with
+deterministic pseudo-random rows (realistic dtypes, prevalence and ~12% readmission
+rate) entirely inside DuckDB, so millions of rows generate in seconds and offline.
+"""
+
+import logging
+import os
+import xgboost as xgb
+from db.connection import DBConnection, DuckDBConnection
+from db.temporal_features import apply_temporal_features
+from ml.data import FEATURES, load_training_data
+
+_logger = logging.getLogger(__name__)
+
+# Constants
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+FEATURE_DDL = os.path.join(MODULE_DIR, "..", "..", "data_model", "sql", "model", "readmission.sql")
+SIZE_SUFFIXES = {"k": 1_000, "m": 1_000_000}
+
+# Prevalence of boolean features
+FLAG_RATES = {
+    "has_diabetes": 0.10,
+    "has_hypertension": 0.25,
+    "has_copd": 0.06,
+    "has_asthma": 0.08,
+    "has_heart_failure": 0.04,
+    "has_arthritis": 0.10,
+    "has_depression": 0.10,
+    "has_kidney_disease": 0.05,
+    "has_cancer": 0.04,
+    "has_alzheimers": 0.02,
+    "has_anticoagulant": 0.05,
+    "has_antibiotic": 0.15,
+    "has_steroid": 0.08,
+    "had_surgery": 0.05,
+    "had_biopsy": 0.03,
+}
+CHRONIC_FLAGS = [f for f in FLAG_RATES if f.startswith("has_") and f not in
+                 {"has_anticoagulant", "has_antibiotic", "has_steroid"}]
+
+
+def parse_size(size: str) -> int:
+    """Parse a row count such as '10k' or '1M' into an integer."""
+    size = str(size).strip().lower()
+    if size and size[-1] in SIZE_SUFFIXES:
+        return int(float(size[:-1]) * SIZE_SUFFIXES[size[-1]])
+    return int(size)
+
+
+def format_size(num_rows: int) -> str:
+    """Format a row count as a short label such as '10k' or '1M'."""
+    for suffix, scale in sorted(SIZE_SUFFIXES.items(), key=lambda kv: -kv[1]):
+        if num_rows >= scale and num_rows % scale == 0:
+            return f"{num_rows // scale}{suffix.upper() if suffix == 'm' else suffix}"
+    return str(num_rows)
+
+
+def generate_encounter_fact(conn: DBConnection, num_rows: int, seed: int = 42) -> None:
+    """
+    Create and populate a synthetic `readmission.encounter_fact` table.
+
+    params:
+        conn: Database connection object (the table is dropped and recreated).
+        num_rows: Number of encounters to generate.
+        seed: Seed mixed into every hash so runs are reproducible.
+
+    Returns: None
+    """
+    conn.execute_file(FEATURE_DDL, ddl=True)
+    conn.execute(_insert_sql(num_rows, seed), ddl=True)
+    apply_temporal_features(conn)
+    _logger.info(f"Generated {num_rows} synthetic encounters")
+
+
+def make_reference_model(num_rows: int = 10_000, seed: int = 42):
+    """
+    Fit a small XGBoost model on an in-memory synthetic feature store.
+
+    Used by serving benchmarks that need a realistic model without a full grid search.
+
+    Returns: Tuple of (fitted XGBClassifier, X_test DataFrame).
+    """
+    with DuckDBConnection() as conn:
+        generate_encounter_fact(conn, num_rows, seed=seed)
+        X_train, y_train, X_test, _ = load_training_data(conn, FEATURES)
+    model = xgb.XGBClassifier(n_estimators=100, max_depth=4, learning_rate=0.1)
+    model.fit(X_train, y_train)
+    return model, X_test
+
+
+def _uniform(tag: str, seed: int) -> str:
+    """SQL expression for a deterministic uniform [0, 1) value per row."""
+    return f"((hash(i, '{tag}', {seed}) % 1000003) / 1000003.0)"
+
+
+def _insert_sql(num_rows: int, seed: int) -> str:
+    flags = ",\n        ".join(
+        f"{_uniform(name, seed)} < {rate} AS {name}" for name, rate in FLAG_RATES.items()
+    )
+    chronic_count = " + ".join(f"{name}::INT" for name in CHRONIC_FLAGS)
+    num_patients = max(1, num_rows // 5)
+    return f"""
+    INSERT INTO readmission.encounter_fact BY NAME
+    WITH base AS (
+        SELECT
+            i,
+            (i + 1)::INTEGER AS encounter_key,
+            (hash(i, 'patient', {seed}) % {num_patients} + 1)::INTEGER AS patient_key,
+            DATE '2010-01-01' + (({_uniform('start', seed)}) * 4748)::INTEGER AS encounter_start,
+            (({_uniform('stay', seed)}) ^ 3 * 10)::INTEGER AS stay_days,
+            (({_uniform('age', seed)}) * 95)::INTEGER AS age_at_encounter,
+            (1 + {_uniform('gender', seed)} * 2)::UTINYINT AS gender_key,
+            (1 + {_uniform('race', seed)} * 6)::UTINYINT AS race_key,
+            (1 + {_uniform('ethnicity', seed)} * 2)::UTINYINT AS ethnicity_key,
+            (({_uniform('meds', seed)}) ^ 2 * 30)::USMALLINT AS num_meds,
+            (({_uniform('procs', seed)}) ^ 3 * 20)::USMALLINT AS num_procedures,
+            {_uniform('label', seed)} AS label_draw,
+            {flags}
+        FROM range({int(num_rows)}) t(i)
+    ), scored AS (
+        SELECT
+            *,
+            ({chronic_count})::USMALLINT AS chronic_dx_count
+        FROM base
+    )
+    SELECT
+        encounter_key,
+        patient_key,
+        encounter_start,
+        encounter_start + stay_days AS encounter_end,
+        age_at_encounter,
+        gender_key,
+        race_key,
+        ethnicity_key,
+        {", ".join(CHRONIC_FLAGS)},
+        chronic_dx_count,
+        num_meds,
+        has_anticoagulant,
+        has_antibiotic,
+        has_steroid,
+        num_procedures,
+        had_surgery,
+        had_biopsy,
+        label_draw < 1 / (1 + exp(-(
+            -2.6 + 0.012 * age_at_encounter + 0.35 * chronic_dx_count
+            + 0.04 * num_meds + 0.5 * had_surgery::INT - 0.6
+        ))) AS readmitted
+    FROM scored
+    """
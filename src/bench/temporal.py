@@ -0,0 +1,51 @@
+"""
+Temporal feature benchmarks: cost per encounter of computing the patient history
+features (see `db.temporal_features`) as the feature store grows. Linear scaling
+shows up as a flat seconds-per-encounter across sizes.
+
+A self-join computing only `prior_encounters_365d` (the way `readmitted_flag` is
+written in the load SQL) is timed alongside for reference.
+"""
+
+import logging
+from bench.harness import measure
+from bench.synthetic import format_size, generate_encounter_fact
+from db.connection import DuckDBConnection
+from db.temporal_features import FEATURE_TABLE, apply_temporal_features
+from typing import Dict, List
+
+_logger = logging.getLogger(__name__)
+
+# Constants
+REPEATS = 3
+SELF_JOIN_SQL = f"""
+SELECT e1.encounter_key, COUNT(e2.encounter_key) AS prior_encounters_365d
+FROM {FEATURE_TABLE} e1
+LEFT JOIN {FEATURE_TABLE} e2
+  ON e1.patient_key = e2.patient_key
+ AND e2.encounter_start < e1.encounter_start
+ AND e2.encounter_start >= e1.encounter_start - INTERVAL 365 DAYS
+GROUP BY e1.encounter_key
+"""
+
+
+def run(sizes: List[int], work_dir: str) -> Dict[str, float]:
+    """
+    Time the temporal feature stage on synthetic feature stores of each size.
+
+    Returns: Mapping of case name to seconds per encounter.
+    """
+    results = {}
+    for num_rows in sizes:
+        label = format_size(num_rows)
+        with DuckDBConnection() as conn:
+            generate_encounter_fact(conn, num_rows)
+            seconds, _ = measure(lambda: apply_temporal_features(conn), repeats=REPEATS)
+            join_seconds, _ = measure(
+                lambda: conn.execute(f"CREATE OR REPLACE TEMP TABLE _prior AS {SELF_JOIN_SQL}", ddl=True),
+                repeats=REPEATS,
+            )
+        results[f"temporal_features_per_row@{label}"] = seconds / num_rows
+        results[f"self_join_365d_per_row@{label}"] = join_seconds / num_rows
+        _logger.info(f"{label}: window stage {seconds:.3f}s, one self-join feature {join_seconds:.3f}s")
+    return results
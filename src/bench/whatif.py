@@ -0,0 +1,94 @@
+"""
+What-if benchmarks: time to score one patient's sensitivity curves with a single
+`/predict/whatif` request versus one `/predict` request per perturbed point, for
+one-at-a-time sweeps and for a crossed grid. Requests go through the ASGI app
+in-process, so the numbers exclude network overhead (which would only widen the gap
+for the per-point path).
+"""
+
+import asyncio
+import httpx
+import itertools
+import logging
+import os
+import statistics
+import time
+from api import endpoint
+from bench.synthetic import format_size, make_reference_model
+from fastapi import FastAPI
+from joblib import dump
+from ml.model import ReadmissionModel
+from typing import Dict, List
+
+_logger = logging.getLogger(__name__)
+
+# Constants
+REPEATS = 20
+PATIENT = {"age": 70, "gender": "f", "num_meds": 5, "num_procedures": 1, "has_diabetes": True}
+SWEEPS = [
+    {"feature": "num_meds", "start": 0, "stop": 30},
+    {"feature": "has_heart_failure", "values": [False, True]},
+    {"feature": "has_kidney_disease", "values": [False, True]},
+]
+MAPPINGS = {"gender_key": {"f": 1, "m": 2}, "race_key": {}, "ethnicity_key": {}}
+
+
+def run(sizes: List[int], work_dir: str, repeats: int = REPEATS) -> Dict[str, float]:
+    """
+    Time each way of scoring the sweeps with a model trained on the smallest size.
+
+    Returns: Mapping of case name to median seconds per complete analysis.
+    """
+    label = format_size(min(sizes))
+    model, _ = make_reference_model(min(sizes))
+    model_path = os.path.join(work_dir, "whatif_model.joblib")
+    dump(model, model_path)
+
+    app = FastAPI()
+    app.include_router(endpoint.router)
+    saved = endpoint.model, endpoint.GENDER_MAP
+    endpoint.model, endpoint.GENDER_MAP = ReadmissionModel(model_path), MAPPINGS["gender_key"]
+    try:
+        results = {}
+        for cross in (False, True):
+            mode = "crossed" if cross else "curves"
+            whatif = [("/predict/whatif", {"patient": PATIENT, "sweeps": SWEEPS, "cross": cross})]
+            points = [("/predict", payload) for payload in _point_payloads(cross)]
+            results[f"whatif_{mode}@{label}"] = asyncio.run(_median_seconds(app, whatif, repeats))
+            results[f"predict_per_point_{mode}@{label}"] = asyncio.run(_median_seconds(app, points, repeats))
+            _logger.info(
+                f"{mode}: {len(points)} points, whatif {results[f'whatif_{mode}@{label}'] * 1e3:.1f} ms, "
+                f"per-point /predict {results[f'predict_per_point_{mode}@{label}'] * 1e3:.1f} ms"
+            )
+    finally:
+        endpoint.model, endpoint.GENDER_MAP = saved
+    return results
+
+
+def _point_payloads(cross: bool) -> List[dict]:
+    """One /predict payload per grid point (the base patient first, as the what-if grid does)."""
+    values = [
+        list(range(s["start"], s["stop"] + 1)) if "values" not in s else s["values"] for s in SWEEPS
+    ]
+    payloads = [dict(PATIENT)]
+    if cross:
+        for combination in itertools.product(*values):
+            payloads.append({**PATIENT, **{s["feature"]: v for s, v in zip(SWEEPS, combination)}})
+        return payloads
+    for sweep, sweep_values in zip(SWEEPS, values):
+        payloads.extend({**PATIENT, sweep["feature"]: v} for v in sweep_values)
+    return payloads
+
+
+async def _median_seconds(app, requests: List[tuple], repeats: int) -> float:
+    """Median wall time of sending every request in sequence."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        samples = []
+        for _ in range(repeats + 1):
+            start = time.perf_counter()
+            for route, payload in requests:
+                (await client.post(route, json=payload)).raise_for_status()
+            samples.append(time.perf_counter() - start)
+    # The first pass warms up the route
+    return statistics.median(samples[1:])
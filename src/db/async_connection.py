@@ -0,0 +1,154 @@
+"""
+Asyncio facade over a DuckDB database for the API.
+
+DuckDB calls block the calling thread, so awaiting code (FastAPI lifespan hooks and
+async routes) must not run them on the event loop. `AsyncDBConnection` runs every
+query on its own cursor in a dedicated, bounded thread pool, so the number of
+concurrent queries is capped independently of the server's default thread pool.
+Each query has a timeout; on timeout or cancellation of the awaiting task the query
+is interrupted in DuckDB, so an abandoned query does not keep its worker busy.
+
+Results are returned as column arrays ({column: numpy array}), never as rows.
+"""
+
+import asyncio
+import duckdb
+import logging
+import numpy as np
+from .snapshot import resolve_reader_database
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional
+
+_logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_QUERY_TIMEOUT = 10.0  # seconds
+INTERRUPT_INTERVAL = 0.01  # seconds between interrupts until a cancelled query stops
+
+
+class AsyncDBConnection:
+    def __init__(
+        self,
+        database: str = ":memory:",
+        read_only: bool = False,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        timeout: Optional[float] = DEFAULT_QUERY_TIMEOUT,
+    ):
+        """
+        params:
+            database: Path to the DuckDB file or ':memory:'.
+            read_only: Open DB in read-only mode if True.
+            max_workers: Queries that may run at once; further queries wait for a worker.
+            timeout: Default per-query timeout in seconds (None waits indefinitely).
+                Time spent waiting for a worker counts towards it.
+        """
+        self.database = database
+        self.timeout = timeout
+        self._read_only = read_only
+        self._max_workers = max_workers
+        self._conn = None
+        self._pool = None
+        self._interrupters = set()
+
+    async def __aenter__(self):
+        self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def open(self) -> "AsyncDBConnection":
+        """Connect and start the worker pool (idempotent)."""
+        if not self._conn:
+            self._conn = duckdb.connect(database=self.database, read_only=self._read_only)
+            self._pool = ThreadPoolExecutor(self._max_workers, thread_name_prefix="db-query")
+        return self
+
+    async def close(self) -> None:
+        """Wait for running queries to stop, then close the pool and the connection."""
+        if not self._conn:
+            return
+        pool, conn = self._pool, self._conn
+        self._pool = self._conn = None
+        await asyncio.get_running_loop().run_in_executor(None, pool.shutdown)
+        conn.close()
+
+    async def fetch_columns(
+        self, query: str, params: dict | None = None, timeout: Optional[float] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Run a query and return its result as column arrays.
+
+        params:
+            query: SQL query.
+            params: Query parameters.
+            timeout: Seconds before the query is interrupted and TimeoutError raised
+                (defaults to the connection's timeout).
+
+        Returns: Mapping of column name to a numpy array of its values.
+        """
+        return await self._run(lambda cursor: cursor.execute(query, params or {}).fetchnumpy(), timeout)
+
+    async def execute(self, query: str, params: dict | None = None, timeout: Optional[float] = None) -> None:
+        """Run a statement without fetching a result (e.g. DDL or inserts)."""
+
+        def run(cursor):
+            cursor.execute(query, params or {})
+
+        await self._run(run, timeout)
+
+    async def _run(self, fn, timeout: Optional[float]):
+        if not self._conn:
+            raise RuntimeError("AsyncDBConnection is not open")
+        timeout = self.timeout if timeout is None else timeout
+        cursor = self._conn.cursor()
+        future = self._pool.submit(fn, cursor)
+        future.add_done_callback(lambda _: cursor.close())
+        waiter = asyncio.wrap_future(future)
+        try:
+            # shield: a timeout or cancellation must not cancel the waiter itself,
+            # which would report the query as done while it still runs
+            return await asyncio.wait_for(asyncio.shield(waiter), timeout)
+        except asyncio.TimeoutError:
+            _logger.warning(f"Interrupting query after {timeout}s timeout")
+            self._interrupt(cursor, future, waiter)
+            raise TimeoutError(f"Query exceeded its {timeout}s timeout")
+        except asyncio.CancelledError:
+            self._interrupt(cursor, future, waiter)
+            raise
+
+    def _interrupt(self, cursor, future: Future, waiter: asyncio.Future) -> None:
+        """Interrupt an abandoned query until its worker returns, without blocking the caller."""
+        # Nobody awaits the result any more; retrieve it so asyncio does not log it
+        waiter.add_done_callback(lambda f: f.cancelled() or f.exception())
+        task = asyncio.get_running_loop().create_task(_interrupt_until_done(cursor, future))
+        self._interrupters.add(task)
+        task.add_done_callback(self._interrupters.discard)
+
+
+async def _interrupt_until_done(cursor, future: Future) -> None:
+    # Repeated, since an interrupt sent before the query has started is a no-op
+    while not future.done():
+        if future.cancel():
+            return  # still queued for a worker: it never runs
+        try:
+            cursor.interrupt()
+        except duckdb.Error:
+            pass  # cursor already closed: the query has finished
+        await asyncio.sleep(INTERRUPT_INTERVAL)
+
+
+def create_async_db_connection(config: dict, snapshot: bool = False, **kwargs) -> AsyncDBConnection:
+    """
+    params:
+        config: DB config (db_type, database, read_only, optional snapshot_dir).
+        snapshot: Open the current published snapshot read-only (see `db.snapshot`).
+        kwargs: Passed to AsyncDBConnection (max_workers, timeout).
+    """
+    db_type = config.get("db_type", "").lower()
+    if db_type != "duckdb":
+        raise ValueError(f"Unsupported database type: {db_type}")
+    if snapshot:
+        return AsyncDBConnection(resolve_reader_database(config), read_only=True, **kwargs)
+    return AsyncDBConnection(config.get("database", ":memory:"), config.get("read_only", False), **kwargs)
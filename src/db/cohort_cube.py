@@ -0,0 +1,288 @@
+"""
+Materialized cohort aggregates of the feature store.
+
+`readmission.cohort_cube` holds encounter and readmission counts for every cell of
+the demographic and chronic condition dimensions in `CUBE_DIMENSIONS`, i.e. the
+finest GROUP BY over those columns. Any cohort query grouping and filtering on
+cube dimensions only is answered by re-aggregating the (much smaller) cube; a query
+touching any other dimension in `BASE_DIMENSIONS` is answered from the base table.
+
+Incremental refresh: `readmission.cohort_cube_state` records the highest
+encounter_key counted (the watermark), and the count and a fingerprint (XOR of
+per-row hashes of encounter_key, readmitted and every cube dimension) of the counted
+encounters. A refresh aggregates only the encounters above the watermark and merges
+them into the cube. If the counted encounters no longer match the fingerprint (an
+encounter was relabeled, moved to another cube cell, e.g. by an upsert rewriting a
+chronic flag or its age, or was deleted or inserted below the watermark), the old
+contribution cannot be subtracted, so the cube is rebuilt in full; that check reads
+only the key, label and cube dimension columns.
+
+Measures of every cell and query result:
+    encounters: Number of encounters.
+    labeled: Encounters with a known readmitted label.
+    readmissions: Encounters with readmitted = true.
+    readmission_rate: readmissions / labeled (queries only).
+"""
+
+import logging
+import numpy as np
+from db import constant as c
+from db.async_connection import AsyncDBConnection
+from db.connection import DBConnection
+from typing import Dict, List, Optional, Tuple
+
+_logger = logging.getLogger(__name__)
+
+# Constants
+FEATURE_TABLE = f"{c.Schema.READMISSION}.{c.Table.ENCOUNTER_FACT}"
+CUBE_TABLE = f"{c.Schema.READMISSION}.{c.Table.COHORT_CUBE}"
+STATE_TABLE = f"{c.Schema.READMISSION}.{c.Table.COHORT_CUBE_STATE}"
+AGE_BAND_WIDTH = 10
+MAX_AGE_BAND = 90  # the last band holds every age from 90 up
+CHRONIC_CONDITIONS = [
+    "has_diabetes", "has_hypertension", "has_copd", "has_asthma", "has_heart_failure",
+    "has_arthritis", "has_depression", "has_kidney_disease", "has_cancer", "has_alzheimers",
+]
+# Dimension name -> SQL expression over the base table
+CUBE_DIMENSIONS: Dict[str, str] = {
+    "gender_key": "gender_key",
+    "race_key": "race_key",
+    "ethnicity_key": "ethnicity_key",
+    "age_band": f"least(age_at_encounter // {AGE_BAND_WIDTH} * {AGE_BAND_WIDTH}, {MAX_AGE_BAND})::UTINYINT",
+    **{name: name for name in CHRONIC_CONDITIONS},
+}
+BASE_DIMENSIONS: Dict[str, str] = {
+    "start_year": "year(encounter_start)::SMALLINT",
+    "age_at_encounter": "age_at_encounter",
+    "chronic_dx_count": "chronic_dx_count",
+    "num_meds": "num_meds",
+    "has_anticoagulant": "has_anticoagulant",
+    "has_antibiotic": "has_antibiotic",
+    "has_steroid": "has_steroid",
+    "num_procedures": "num_procedures",
+    "had_surgery": "had_surgery",
+    "had_biopsy": "had_biopsy",
+    "prior_encounters_30d": "prior_encounters_30d",
+    "prior_encounters_90d": "prior_encounters_90d",
+    "prior_encounters_365d": "prior_encounters_365d",
+}
+MEASURES = ["encounters", "labeled", "readmissions"]
+# Any change to a counted encounter's cube cell or label changes its hash
+FINGERPRINT_SQL = (
+    f"count(*) AS encounters, coalesce(bit_xor(hash(encounter_key, readmitted, "
+    f"{', '.join(CUBE_DIMENSIONS.values())})), 0)::UBIGINT AS fingerprint"
+)
+TABLE_EXISTS_SQL = (
+    "SELECT count(*) AS n FROM duckdb_tables() WHERE schema_name = $schema AND table_name = $name"
+)
+CUBE_EXISTS_PARAMS = {"schema": c.Schema.READMISSION, "name": c.Table.COHORT_CUBE}
+
+
+def build_cohort_cube(conn: DBConnection, source: str = FEATURE_TABLE) -> int:
+    """
+    Build the cohort cube and its refresh state from scratch.
+
+    params:
+        conn: Database connection object.
+        source: Feature table to aggregate.
+
+    Returns: Number of cube cells.
+    """
+    # One session: the transaction spans several statements
+    conn.connect()
+    conn.execute("BEGIN TRANSACTION", ddl=True)
+    try:
+        conn.execute(f"CREATE OR REPLACE TABLE {CUBE_TABLE} AS\n{_cells_sql(source)}", ddl=True)
+        conn.execute(
+            f"CREATE OR REPLACE TABLE {STATE_TABLE} AS\n"
+            f"SELECT coalesce(max(encounter_key), 0) AS watermark, {FINGERPRINT_SQL} FROM {source}",
+            ddl=True,
+        )
+        conn.execute("COMMIT", ddl=True)
+    except Exception:
+        conn.execute("ROLLBACK", ddl=True)
+        raise
+    cells = _count(conn, CUBE_TABLE)
+    _logger.info(f"Built {CUBE_TABLE} with {cells} cells from {source}")
+    return cells
+
+
+def refresh_cohort_cube(conn: DBConnection, source: str = FEATURE_TABLE) -> dict:
+    """
+    Bring the cohort cube up to date with the base table.
+
+    Adds encounters appended since the last build or refresh. Builds the cube in full
+    instead if it does not exist or already counted encounters changed.
+
+    params:
+        conn: Database connection object.
+        source: Feature table the cube was built from.
+
+    Returns: Dictionary with the refresh mode ("full" or "incremental"), the number
+        of encounters added (None for a full build) and the number of cube cells.
+    """
+    # One session: the transaction spans several statements
+    conn.connect()
+    if not (_table_exists(conn, c.Table.COHORT_CUBE) and _table_exists(conn, c.Table.COHORT_CUBE_STATE)):
+        return {"mode": "full", "new": None, "cells": build_cohort_cube(conn, source)}
+    state = conn.execute(f"SELECT * FROM {STATE_TABLE}").iloc[0]
+    counted = {"watermark": int(state["watermark"])}
+    current = conn.execute(
+        f"SELECT {FINGERPRINT_SQL} FROM {source} WHERE encounter_key <= $watermark", counted
+    ).iloc[0]
+    if int(current["encounters"]) != int(state["encounters"]) or int(current["fingerprint"]) != int(state["fingerprint"]):
+        _logger.info(f"Counted encounters changed since the last refresh; rebuilding {CUBE_TABLE}")
+        return {"mode": "full", "new": None, "cells": build_cohort_cube(conn, source)}
+
+    new = int(conn.execute(f"SELECT count(*) AS n FROM {source} WHERE encounter_key > $watermark", counted)["n"][0])
+    if new:
+        names = ", ".join(CUBE_DIMENSIONS)
+        measures = ", ".join(f"sum({m})::BIGINT AS {m}" for m in MEASURES)
+        conn.execute("BEGIN TRANSACTION", ddl=True)
+        try:
+            conn.execute(
+                f"CREATE OR REPLACE TABLE {CUBE_TABLE} AS\n"
+                f"SELECT {names}, {measures}\n"
+                f"FROM (\n"
+                f"    SELECT * FROM {CUBE_TABLE}\n"
+                f"    UNION ALL BY NAME\n"
+                f"    {_cells_sql(source, 'encounter_key > $watermark')}\n"
+                f") GROUP BY ALL",
+                counted,
+                ddl=True,
+            )
+            conn.execute(
+                f"UPDATE {STATE_TABLE} AS s SET watermark = d.watermark, encounters = s.encounters + d.encounters, "
+                f"fingerprint = xor(s.fingerprint, d.fingerprint)\n"
+                f"FROM (SELECT max(encounter_key) AS watermark, {FINGERPRINT_SQL} "
+                f"FROM {source} WHERE encounter_key > $watermark) AS d",
+                counted,
+                ddl=True,
+            )
+            conn.execute("COMMIT", ddl=True)
+        except Exception:
+            conn.execute("ROLLBACK", ddl=True)
+            raise
+    cells = _count(conn, CUBE_TABLE)
+    _logger.info(f"Refreshed {CUBE_TABLE}: {new} new encounters, {cells} cells")
+    return {"mode": "incremental", "new": new, "cells": cells}
+
+
+def cube_exists(conn: DBConnection) -> bool:
+    """Whether the cohort cube has been built in this database."""
+    return _table_exists(conn, c.Table.COHORT_CUBE)
+
+
+def cohort_query(
+    group_by: List[str],
+    filters: Optional[dict] = None,
+    use_cube: bool = True,
+    source: str = FEATURE_TABLE,
+) -> Tuple[str, dict, str]:
+    """
+    SQL answering a cohort query from the cube when it covers every dimension used.
+
+    params:
+        group_by: Dimensions to group by (cube or base dimensions).
+        filters: Dimension -> value equality filters.
+        use_cube: Whether the cube may be used (False when it has not been built).
+        source: Base feature table used when the cube cannot answer.
+
+    Returns: Tuple of (query, query parameters, "cube" or "base").
+    """
+    filters = filters or {}
+    used = list(group_by) + list(filters)
+    unknown = [name for name in used if name not in CUBE_DIMENSIONS and name not in BASE_DIMENSIONS]
+    if unknown:
+        raise ValueError(f"Unknown cohort dimensions {unknown}; choose from {dimension_names()}")
+    if len(set(group_by)) != len(group_by):
+        raise ValueError(f"Each dimension can be grouped by once: {group_by}")
+
+    from_cube = use_cube and all(name in CUBE_DIMENSIONS for name in used)
+    if from_cube:
+        expressions, table = {name: name for name in used}, CUBE_TABLE
+        measures = ", ".join(f"sum({m})::BIGINT AS {m}" for m in MEASURES)
+    else:
+        expressions, table = {**CUBE_DIMENSIONS, **BASE_DIMENSIONS}, source
+        measures = "count(*) AS encounters, count(readmitted) AS labeled, count(*) FILTER (readmitted) AS readmissions"
+
+    params = {f"f{i}": value for i, value in enumerate(filters.values())}
+    where = " AND ".join(f"{expressions[name]} = $f{i}" for i, name in enumerate(filters)) or "TRUE"
+    columns = [f"{expressions[name]} AS {name}" for name in group_by]
+    query = f"SELECT {', '.join(columns + [measures])} FROM {table} WHERE {where}" + (" GROUP BY ALL" if group_by else "")
+    query = (
+        f"SELECT *, (readmissions / nullif(labeled, 0))::DOUBLE AS readmission_rate FROM ({query})"
+        + (f" ORDER BY {', '.join(group_by)}" if group_by else "")
+    )
+    return query, params, "cube" if from_cube else "base"
+
+
+def query_cohorts(conn: DBConnection, group_by: List[str], filters: Optional[dict] = None, use_cube: bool = True):
+    """
+    Readmission counts and rates per cohort.
+
+    params:
+        conn: Database connection object.
+        group_by: Dimensions to group by.
+        filters: Dimension -> value equality filters.
+        use_cube: Answer from the cube when it covers the query and exists.
+
+    Returns: Tuple of (DataFrame of groups and measures, "cube" or "base").
+    """
+    query, params, path = cohort_query(group_by, filters, use_cube and cube_exists(conn))
+    return conn.execute(query, params), path
+
+
+async def query_cohorts_async(
+    conn: AsyncDBConnection, group_by: List[str], filters: Optional[dict] = None, use_cube: bool = True
+) -> Tuple[Dict[str, np.ndarray], str]:
+    """
+    `query_cohorts` without blocking the event loop.
+
+    Returns: Tuple of (mapping of column name to values, "cube" or "base").
+    """
+    if use_cube:
+        use_cube = bool((await conn.fetch_columns(TABLE_EXISTS_SQL, CUBE_EXISTS_PARAMS))["n"][0])
+    query, params, path = cohort_query(group_by, filters, use_cube)
+    return await conn.fetch_columns(query, params), path
+
+
+def parse_filters(items: List[str]) -> dict:
+    """Parse "dimension=value" filters; values are booleans ("true"/"false") or integers."""
+    filters = {}
+    for item in items:
+        name, sep, raw = item.partition("=")
+        if not sep or not raw.strip():
+            raise ValueError(f"Filter '{item}' is not dimension=value")
+        raw = raw.strip().lower()
+        if raw in ("true", "false"):
+            filters[name.strip()] = raw == "true"
+            continue
+        try:
+            filters[name.strip()] = int(raw)
+        except ValueError:
+            raise ValueError(f"Filter value of '{item}' is not a boolean or integer")
+    return filters
+
+
+def dimension_names() -> List[str]:
+    """Every dimension a cohort query may use."""
+    return list(CUBE_DIMENSIONS) + list(BASE_DIMENSIONS)
+
+
+def _cells_sql(source: str, where: str = "TRUE") -> str:
+    """Cube cells of the encounters in source matching where."""
+    dimensions = ", ".join(f"{expr} AS {name}" for name, expr in CUBE_DIMENSIONS.items())
+    return (
+        f"SELECT {dimensions}, count(*) AS encounters, count(readmitted) AS labeled, "
+        f"count(*) FILTER (readmitted) AS readmissions\n"
+        f"FROM {source} WHERE {where} GROUP BY ALL"
+    )
+
+
+def _table_exists(conn: DBConnection, name: str) -> bool:
+    return bool(conn.execute(TABLE_EXISTS_SQL, {"schema": c.Schema.READMISSION, "name": name})["n"][0])
+
+
+def _count(conn: DBConnection, table: str) -> int:
+    return int(conn.execute(f"SELECT count(*) AS n FROM {table}")["n"][0])
@@ -4,8 +4,14 @@ Database connection module. Currently supports DuckDB.
 
 import duckdb
 import pandas as pd
+import pyarrow as pa
+from .snapshot import resolve_reader_database
 from abc import ABC, abstractmethod
 from pathlib import Path
+from typing import Iterator
+
+# Constants
+DEFAULT_ARROW_BATCH_SIZE = 100_000
 
 
 # Abstract base class for DB connections
@@ -77,11 +83,65 @@ class DuckDBConnection(DBConnection):
         sql = Path(filepath).read_text()
         return self.execute(sql, params=params, ddl=ddl)
 
+    def fetch_record_batches(
+        self, query: str, params: dict | None = None, batch_size: int = DEFAULT_ARROW_BATCH_SIZE
+    ) -> Iterator[pa.RecordBatch]:
+        """
+        Stream query results as Arrow record batches without materializing the full result.
+
+        Uses its own cursor, so other statements (e.g. inserts) may run on this
+        connection while the stream is consumed.
+        """
+        params = {} if params is None else params
+
+        if self._conn:
+            cursor = self._conn.cursor()
+            try:
+                yield from _record_batches(cursor, query, params, batch_size)
+            finally:
+                cursor.close()
+            return
+
+        with duckdb.connect(
+            database=self.database, read_only=self._read_only
+        ) as temp_conn:
+            yield from _record_batches(temp_conn, query, params, batch_size)
+
+    def insert_arrow(self, table_name: str, data: pa.Table) -> None:
+        """Bulk insert an Arrow table into an existing table (columns matched by position)."""
+        view_name = "_arrow_insert"
+        conn = self._conn or duckdb.connect(database=self.database, read_only=self._read_only)
+        cursor = conn.cursor()
+        try:
+            cursor.register(view_name, data)
+            cursor.execute(f"INSERT INTO {table_name} SELECT * FROM {view_name}")
+        finally:
+            cursor.unregister(view_name)
+            cursor.close()
+            if conn is not self._conn:
+                conn.close()
+
+
+def _record_batches(conn, query: str, params: dict, batch_size: int) -> Iterator[pa.RecordBatch]:
+    result = conn.execute(query, params)
+    # to_arrow_reader replaces fetch_record_batch in newer DuckDB releases
+    reader_fn = getattr(result, "to_arrow_reader", None) or result.fetch_record_batch
+    yield from reader_fn(batch_size)
+
 
 # Factory function
-def create_db_connection(config: dict) -> DBConnection:
+def create_db_connection(config: dict, snapshot: bool = False) -> DBConnection:
+    """
+    params:
+        config: DB config (db_type, database, read_only, optional snapshot_dir).
+        snapshot: Open the current published snapshot read-only (see `db.snapshot`)
+            instead of the build database. Readers should set this so they never
+            contend with a running build for the database lock.
+    """
     db_type = config.get("db_type", "").lower()
     if db_type == "duckdb":
+        if snapshot:
+            return DuckDBConnection(database=resolve_reader_database(config), read_only=True)
         database = config.get("database", ":memory:")
         read_only = config.get("read_only", False)
         return DuckDBConnection(database=database, read_only=read_only)
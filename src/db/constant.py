@@ -4,9 +4,14 @@
 class Schema:
     CLINICAL = "clinical"
     READMISSION = "readmission"
+    SCORING = "scoring"  # Never dropped by schema builds
 
 
 class Table:
+    COHORT_CUBE = "cohort_cube"
+    COHORT_CUBE_STATE = "cohort_cube_state"
+    ENCOUNTER_FACT = "encounter_fact"
+    ENCOUNTER_FACT_PARTITIONED = "encounter_fact_partitioned"
     ETHINICITY_DIM = "ethnicity_dim"
     GENDER_DIM = "gender_dim"
     RACE_DIM = "race_dim"
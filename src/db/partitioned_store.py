@@ -0,0 +1,277 @@
+"""
+Time-partitioned layout of the feature store.
+
+`readmission.encounter_fact` is materialized as Hive-partitioned Parquet by the year
+and month of `encounter_start`, and exposed as the view
+`readmission.encounter_fact_partitioned`. Queries that filter on the partition
+columns only open the files of the matching months, so a training window, backfill
+or refresh reads its date range instead of the whole table.
+
+DuckDB prunes Hive partitions only on filters over the partition columns themselves
+(not on `encounter_start`, nor on arithmetic over the partition columns), so
+loaders should build their date filter with `range_filter`.
+
+Every write produces a new immutable version of the store, and the view reads that
+version. Published database snapshots (see `db.snapshot`) therefore keep reading
+the files their view was created over while later refreshes run. A refresh of a
+date range writes the new months into a staging directory and hard-links the
+unchanged months from the current version. It then renames the staging directory
+into place and atomically repoints CURRENT. A failed write leaves the current
+version untouched. `prune_versions` deletes versions that neither CURRENT nor
+any published snapshot still reads.
+
+Layout of a partition directory:
+    CURRENT                                                 name of the current version
+    v-20260101T020000123456Z/start_year=2017/start_month=3/data_0.parquet
+"""
+
+import glob
+import logging
+import os
+import shutil
+from datetime import date, datetime, timedelta, timezone
+from db import constant as c
+from db.connection import DBConnection, DuckDBConnection
+from db.snapshot import list_snapshots
+from typing import List, Optional, Tuple
+
+_logger = logging.getLogger(__name__)
+
+# Constants
+FEATURE_TABLE = f"{c.Schema.READMISSION}.{c.Table.ENCOUNTER_FACT}"
+PARTITIONED_VIEW = f"{c.Schema.READMISSION}.{c.Table.ENCOUNTER_FACT_PARTITIONED}"
+DATE_COLUMN = "encounter_start"
+YEAR_COLUMN = "start_year"
+MONTH_COLUMN = "start_month"
+CONFIG_KEY = "feature_partition_dir"
+POINTER_FILE = "CURRENT"
+VERSION_PREFIX = "v-"
+
+
+def materialize_partitions(
+    conn: DBConnection,
+    output_dir: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    source: str = FEATURE_TABLE,
+    view: str = PARTITIONED_VIEW,
+) -> int:
+    """
+    Write the feature store as a new version of year/month partitioned Parquet,
+    make it current and (re)create its view over it.
+
+    Without a date range the new version is written in full. With one, only the
+    months overlapping [start_date, end_date) are rewritten from `source` (a
+    backfill or incremental refresh); other months are linked from the current
+    version. Older versions are kept (see `prune_versions`).
+
+    params:
+        conn: Database connection object.
+        output_dir: Root directory of the partitioned store.
+        start_date: First date to rewrite (inclusive), or None for no lower bound.
+        end_date: Date to rewrite up to (exclusive), or None for no upper bound.
+        source: Feature table to copy from.
+        view: View created over the partitioned files.
+
+    Returns: Number of rows written.
+    """
+    output_dir = os.path.abspath(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    partial = start_date is not None or end_date is not None
+    name = VERSION_PREFIX + datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    staging = os.path.join(output_dir, f".{name}.partial")
+    os.makedirs(staging)
+    try:
+        if partial:
+            start_date, end_date = _month_bounds(start_date, end_date)
+            # Stores written before versioning keep their months in output_dir itself
+            current = current_version(output_dir) or output_dir
+            _link_months_outside(current, staging, start_date, end_date)
+
+        where, params = range_filter(start_date, end_date, partitioned=False)
+        rows = conn.execute(f"SELECT count(*) AS n FROM {source} WHERE {where}", params)["n"][0]
+        conn.execute(
+            f"COPY (SELECT *, year({DATE_COLUMN})::SMALLINT AS {YEAR_COLUMN}, "
+            f"month({DATE_COLUMN})::UTINYINT AS {MONTH_COLUMN} FROM {source} WHERE {where} "
+            f"ORDER BY {DATE_COLUMN}) "
+            f"TO '{staging}' (FORMAT PARQUET, PARTITION_BY ({YEAR_COLUMN}, {MONTH_COLUMN}), APPEND)",
+            params,
+            ddl=True,
+        )
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    path = os.path.join(output_dir, name)
+    os.replace(staging, path)
+    _write_pointer(output_dir, name)
+    create_partitioned_view(conn, output_dir, view)
+    _logger.info(f"Wrote {rows} rows of {source} to partition version {path}")
+    return int(rows)
+
+
+def current_version(output_dir: str) -> Optional[str]:
+    """Directory of the current version of a partitioned store, or None before the first write."""
+    try:
+        with open(os.path.join(output_dir, POINTER_FILE)) as f:
+            name = f.read().strip()
+    except FileNotFoundError:
+        return None
+    return os.path.join(os.path.abspath(output_dir), name) if name else None
+
+
+def list_versions(output_dir: str) -> List[str]:
+    """Version directories in write order (oldest first)."""
+    if not os.path.isdir(output_dir):
+        return []
+    names = sorted(name for name in os.listdir(output_dir) if name.startswith(VERSION_PREFIX))
+    return [os.path.join(os.path.abspath(output_dir), name) for name in names]
+
+
+def prune_versions(output_dir: str, snapshot_dir: Optional[str] = None, view: str = PARTITIONED_VIEW) -> List[str]:
+    """
+    Delete versions that neither CURRENT nor the view of any snapshot in snapshot_dir reads.
+
+    Call it after publishing a snapshot, so the snapshots it replaced have been
+    pruned and the versions only they read can go.
+
+    Returns: Paths of the deleted versions.
+    """
+    current = current_version(output_dir)
+    keep = {current} if current else set()
+    referenced = [_view_sql(path, view) for path in list_snapshots(snapshot_dir)] if snapshot_dir else []
+    removed = []
+    for path in list_versions(output_dir):
+        if path in keep or any(os.path.basename(path) in sql for sql in referenced):
+            continue
+        shutil.rmtree(path)
+        removed.append(path)
+        _logger.info(f"Removed old partition version {path}")
+    return removed
+
+
+def create_partitioned_view(conn: DBConnection, output_dir: str, view: str = PARTITIONED_VIEW) -> None:
+    """Create or replace the view reading every partition of the current version in output_dir."""
+    current = current_version(output_dir)
+    if current is None:
+        _logger.warning(f"No partition version in {output_dir}; not creating {view}")
+        return
+    files = os.path.join(current, "*", "*", "*.parquet")
+    if not glob.glob(files):
+        # DuckDB cannot bind a view over no files
+        _logger.warning(f"No partitions in {output_dir}; not creating {view}")
+        return
+    conn.execute(
+        f"CREATE OR REPLACE VIEW {view} AS SELECT * FROM read_parquet('{files}', hive_partitioning = true, "
+        f"hive_types = {{'{YEAR_COLUMN}': SMALLINT, '{MONTH_COLUMN}': UTINYINT}})",
+        ddl=True,
+    )
+
+
+def is_partitioned(conn: DBConnection, table: str) -> bool:
+    """Whether a table or view exposes the partition columns."""
+    schema, name = table.split(".")
+    found = conn.execute(
+        "SELECT count(*) AS n FROM duckdb_columns() "
+        "WHERE schema_name = $schema AND table_name = $name AND column_name IN ($year, $month)",
+        {"schema": schema, "name": name, "year": YEAR_COLUMN, "month": MONTH_COLUMN},
+    )["n"][0]
+    return found == 2
+
+
+def feature_source(config: dict) -> str:
+    """Feature store readers should query: the partitioned view if the config enables it."""
+    return PARTITIONED_VIEW if config.get(CONFIG_KEY) else FEATURE_TABLE
+
+
+def range_filter(
+    start_date: Optional[str] = None, end_date: Optional[str] = None, partitioned: bool = True
+) -> Tuple[str, dict]:
+    """
+    SQL filter and parameters selecting encounters in [start_date, end_date).
+
+    params:
+        start_date: First encounter_start date (inclusive), or None.
+        end_date: Last encounter_start date (exclusive), or None.
+        partitioned: Also filter on the partition columns so whole months are pruned.
+
+    Returns: Tuple of (where clause, query parameters).
+    """
+    clauses, params = [], {}
+    if start_date is not None:
+        clauses.append(f"{DATE_COLUMN} >= CAST($start_date AS DATE)")
+        params["start_date"] = str(start_date)
+    if end_date is not None:
+        clauses.append(f"{DATE_COLUMN} < CAST($end_date AS DATE)")
+        params["end_date"] = str(end_date)
+    if partitioned:
+        clauses.append(partition_predicate(start_date, end_date))
+    return " AND ".join(clauses) or "TRUE", params
+
+
+def partition_predicate(start_date: Optional[str] = None, end_date: Optional[str] = None) -> str:
+    """Filter on the partition columns keeping the months that overlap [start_date, end_date)."""
+    clauses = []
+    if start_date is not None:
+        first = date.fromisoformat(str(start_date))
+        clauses.append(
+            f"({YEAR_COLUMN} > {first.year} OR ({YEAR_COLUMN} = {first.year} AND {MONTH_COLUMN} >= {first.month}))"
+        )
+    if end_date is not None:
+        last = date.fromisoformat(str(end_date)) - timedelta(days=1)
+        clauses.append(
+            f"({YEAR_COLUMN} < {last.year} OR ({YEAR_COLUMN} = {last.year} AND {MONTH_COLUMN} <= {last.month}))"
+        )
+    return " AND ".join(clauses) or "TRUE"
+
+
+def _month_bounds(start_date: Optional[str], end_date: Optional[str]):
+    """Widen a date range to whole months, the unit partitions are rewritten in."""
+    if start_date is not None:
+        start_date = date.fromisoformat(str(start_date)).replace(day=1).isoformat()
+    if end_date is not None:
+        last = date.fromisoformat(str(end_date)) - timedelta(days=1)
+        end_date = (last.replace(day=1) + timedelta(days=32)).replace(day=1).isoformat()
+    return start_date, end_date
+
+
+def _link_months_outside(version: str, staging: str, start_date: Optional[str], end_date: Optional[str]) -> None:
+    """Hard-link (or copy, across filesystems) a version's months outside [start_date, end_date) into staging."""
+    for year_dir in os.listdir(version):
+        if not year_dir.startswith(f"{YEAR_COLUMN}="):
+            continue
+        year = int(year_dir.split("=", 1)[1])
+        for month_dir in os.listdir(os.path.join(version, year_dir)):
+            month = int(month_dir.split("=", 1)[1])
+            first = date(year, month, 1).isoformat()
+            if (start_date is None or first >= start_date) and (end_date is None or first < end_date):
+                continue
+            relative = os.path.join(year_dir, month_dir)
+            os.makedirs(os.path.join(staging, relative))
+            for filename in os.listdir(os.path.join(version, relative)):
+                source, target = os.path.join(version, relative, filename), os.path.join(staging, relative, filename)
+                try:
+                    # Versions are never modified in place, so sharing their files is safe
+                    os.link(source, target)
+                except OSError:
+                    shutil.copy2(source, target)
+
+
+def _view_sql(database: str, view: str) -> str:
+    """Definition of a view in a database file, or "" if it has none."""
+    schema, name = view.split(".")
+    with DuckDBConnection(database, read_only=True) as conn:
+        sql = conn.execute(
+            "SELECT sql FROM duckdb_views() WHERE schema_name = $schema AND view_name = $name",
+            {"schema": schema, "name": name},
+        )["sql"]
+    return sql.iloc[0] if len(sql) else ""
+
+
+def _write_pointer(output_dir: str, name: str) -> None:
+    pointer = os.path.join(output_dir, POINTER_FILE)
+    partial = f"{pointer}.partial"
+    with open(partial, "w") as f:
+        f.write(name)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(partial, pointer)
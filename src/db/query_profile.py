@@ -0,0 +1,205 @@
+"""
+Per-statement query profiling for SQL scripts.
+
+Splits SQL files into statements with DuckDB's parser, runs each one with the
+query profiler enabled, and records wall time, rows produced, peak buffer memory
+and the operator tree. Reports are JSON files that can be diffed against the
+previous run to flag statements that regressed.
+"""
+
+import duckdb
+import glob
+import hashlib
+import json
+import logging
+import os
+import platform
+import re
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+_logger = logging.getLogger(__name__)
+
+# Constants
+REPORT_PREFIX = "schema_build_"
+DEFAULT_THRESHOLD = 1.25
+DEFAULT_MIN_SECONDS = 0.05
+LABEL_LENGTH = 80
+PROFILING_METRICS = {
+    "LATENCY": "true",
+    "ROWS_RETURNED": "true",
+    "SYSTEM_PEAK_BUFFER_MEMORY": "true",
+    "OPERATOR_TYPE": "true",
+    "OPERATOR_TIMING": "true",
+    "OPERATOR_CARDINALITY": "true",
+    "EXTRA_INFO": "true",
+}
+# Root operators that write their input rather than return it
+SINK_OPERATORS = {"INSERT", "CREATE_TABLE_AS", "UPDATE", "DELETE"}
+
+
+def enable_profiling(conn: duckdb.DuckDBPyConnection) -> None:
+    """Enable the DuckDB profiler on a connection without writing its own output."""
+    conn.execute("SET enable_profiling = 'no_output'")
+    conn.execute(f"SET custom_profiling_settings = '{json.dumps(PROFILING_METRICS)}'")
+
+
+def profile_file(conn: duckdb.DuckDBPyConnection, sql_file: str, base_dir: str = "") -> List[dict]:
+    """
+    Execute every statement in a SQL file with profiling enabled.
+
+    params:
+        conn: Raw DuckDB connection with profiling enabled (see `enable_profiling`).
+        sql_file: Path to the SQL file.
+        base_dir: Directory that report file names are made relative to.
+
+    Returns: List of per-statement profile records in execution order.
+    """
+    with open(sql_file) as f:
+        sql = f.read()
+    name = os.path.relpath(sql_file, base_dir) if base_dir else sql_file
+    records, seen = [], {}
+    for index, statement in enumerate(duckdb.extract_statements(sql)):
+        query = statement.query.strip().rstrip(";")
+        key = _statement_key(name, query, seen)
+
+        start = time.perf_counter()
+        result = conn.execute(query)
+        # Fetch so that SELECTs are fully executed and their profile is finalized
+        if result.description:
+            result.fetchall()
+        wall_time = time.perf_counter() - start
+
+        profile = json.loads(conn.get_profiling_information(format="json"))
+        records.append({
+            "key": key,
+            "file": name,
+            "index": index,
+            "label": _label(query),
+            "wall_time": wall_time,
+            "rows": _rows_produced(profile),
+            "peak_memory": profile.get("system_peak_buffer_memory", 0),
+            "plan": _operator_tree(profile.get("children", [])),
+        })
+    return records
+
+
+def build_report(statements: List[dict]) -> dict:
+    """Wrap statement records with run metadata and totals."""
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "duckdb": duckdb.__version__,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+        },
+        "total_time": sum(s["wall_time"] for s in statements),
+        "statements": statements,
+    }
+
+
+def save_report(report: dict, profile_dir: str) -> str:
+    """Write a report to a timestamped file in profile_dir and return its path."""
+    os.makedirs(profile_dir, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+    path = os.path.join(profile_dir, f"{REPORT_PREFIX}{stamp}.json")
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    return path
+
+
+def latest_report(profile_dir: str) -> Optional[str]:
+    """Path of the most recent report in profile_dir, or None."""
+    reports = sorted(glob.glob(os.path.join(profile_dir, f"{REPORT_PREFIX}*.json")))
+    return reports[-1] if reports else None
+
+
+def load_report(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def diff_reports(
+    current: dict,
+    previous: dict,
+    threshold: float = DEFAULT_THRESHOLD,
+    min_seconds: float = DEFAULT_MIN_SECONDS,
+) -> Dict[str, List[dict]]:
+    """
+    Compare two reports statement by statement.
+
+    params:
+        current: Report of this run.
+        previous: Report of the run to compare against.
+        threshold: Allowed ratio of current / previous wall time.
+        min_seconds: Ignore slowdowns smaller than this many seconds (timer noise).
+
+    Returns: Dict with "regressions" (slower beyond threshold), "new" and "removed" statements.
+    """
+    before = {s["key"]: s for s in previous.get("statements", [])}
+    after = {s["key"]: s for s in current.get("statements", [])}
+
+    regressions = []
+    for key, stmt in after.items():
+        old = before.get(key)
+        if old is None or not old["wall_time"]:
+            continue
+        ratio = stmt["wall_time"] / old["wall_time"]
+        if ratio > threshold and stmt["wall_time"] - old["wall_time"] >= min_seconds:
+            regressions.append({
+                "key": key,
+                "label": stmt["label"],
+                "previous": old["wall_time"],
+                "current": stmt["wall_time"],
+                "ratio": ratio,
+                "previous_rows": old["rows"],
+                "rows": stmt["rows"],
+            })
+    regressions.sort(key=lambda r: r["current"] - r["previous"], reverse=True)
+    return {
+        "regressions": regressions,
+        "new": [after[k] for k in after if k not in before],
+        "removed": [before[k] for k in before if k not in after],
+    }
+
+
+def _statement_key(file_name: str, query: str, seen: dict) -> str:
+    """Stable identity of a statement: file plus a hash of its normalized text."""
+    normalized = re.sub(r"\s+", " ", query).strip().lower()
+    digest = hashlib.sha1(normalized.encode()).hexdigest()[:10]
+    key = f"{file_name}#{digest}"
+    # Identical statements in one file are told apart by occurrence
+    seen[key] = seen.get(key, 0) + 1
+    return key if seen[key] == 1 else f"{key}.{seen[key]}"
+
+
+def _label(query: str) -> str:
+    """Short single-line description of a statement for reports."""
+    lines = [line for line in query.splitlines() if line.strip() and not line.strip().startswith("--")]
+    label = re.sub(r"\s+", " ", " ".join(lines[:2])).strip()
+    return label if len(label) <= LABEL_LENGTH else label[: LABEL_LENGTH - 3] + "..."
+
+
+def _rows_produced(profile: dict) -> int:
+    """Rows written by DML/CTAS statements, or rows returned by queries."""
+    children = profile.get("children", [])
+    if children and children[0].get("operator_type") in SINK_OPERATORS:
+        return sum(c.get("operator_cardinality", 0) for c in children[0].get("children", []))
+    if children:
+        return children[0].get("operator_cardinality", 0)
+    return profile.get("rows_returned", 0)
+
+
+def _operator_tree(operators: List[dict]) -> List[dict]:
+    return [
+        {
+            "operator": op.get("operator_name") or op.get("operator_type"),
+            "time": op.get("operator_timing", 0.0),
+            "rows": op.get("operator_cardinality", 0),
+            "extra_info": op.get("extra_info", {}),
+            "children": _operator_tree(op.get("children", [])),
+        }
+        for op in operators
+    ]
@@ -0,0 +1,138 @@
+"""
+Read-only database snapshots for readers.
+
+DuckDB allows a single writer per database file, so readers (the API, training,
+validation) that open the build database block or fail while a build runs. After a
+successful build the writer publishes an immutable, versioned copy of the database
+into a snapshot directory and atomically repoints a CURRENT file at it. Readers
+only ever open the snapshot CURRENT names, read-only, and old snapshots beyond the
+retention count are removed (processes that still have one open keep reading it,
+since an unlinked file stays valid until closed).
+
+Layout of a snapshot directory:
+    CURRENT                              name of the current snapshot file
+    ehr-20260101T020000123456Z.duckdb    immutable snapshots, newest last
+"""
+
+import duckdb
+import logging
+import os
+import shutil
+import stat
+from datetime import datetime, timezone
+from typing import List, Optional
+
+_logger = logging.getLogger(__name__)
+
+# Constants
+POINTER_FILE = "CURRENT"
+SNAPSHOT_EXTENSION = ".duckdb"
+DEFAULT_RETAIN = 3
+READ_ONLY_MODE = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+
+
+def publish_snapshot(database: str, snapshot_dir: str, retain: int = DEFAULT_RETAIN) -> str:
+    """
+    Copy a database into a new snapshot and make it the current one.
+
+    The source is checkpointed and copied while this process holds its write lock,
+    so the copy is consistent. The copy is verified to open read-only before the
+    CURRENT pointer is replaced, so readers never see a partial snapshot.
+
+    params:
+        database: Path to the build database file.
+        snapshot_dir: Directory holding the snapshots and the CURRENT pointer.
+        retain: Number of snapshots to keep (the current one is always kept).
+
+    Returns: Path to the published snapshot.
+    """
+    os.makedirs(snapshot_dir, exist_ok=True)
+    prefix = os.path.splitext(os.path.basename(database))[0]
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    name = f"{prefix}-{stamp}{SNAPSHOT_EXTENSION}"
+    path = os.path.join(snapshot_dir, name)
+    partial = os.path.join(snapshot_dir, f".{name}.partial")
+
+    with duckdb.connect(database) as conn:
+        # Fold the WAL into the database file so the file alone is complete
+        conn.execute("CHECKPOINT")
+        shutil.copyfile(database, partial)
+    with duckdb.connect(partial, read_only=True):
+        pass
+    os.chmod(partial, READ_ONLY_MODE)
+    os.replace(partial, path)
+    _write_pointer(snapshot_dir, name)
+    _logger.info(f"Published snapshot {path}")
+
+    prune_snapshots(snapshot_dir, retain)
+    return path
+
+
+def current_snapshot(snapshot_dir: str) -> Optional[str]:
+    """Path of the current snapshot, or None if none has been published."""
+    try:
+        with open(os.path.join(snapshot_dir, POINTER_FILE)) as f:
+            name = f.read().strip()
+    except FileNotFoundError:
+        return None
+    return os.path.join(snapshot_dir, name) if name else None
+
+
+def list_snapshots(snapshot_dir: str) -> List[str]:
+    """Snapshot paths in publication order (oldest first)."""
+    if not os.path.isdir(snapshot_dir):
+        return []
+    # Names embed a fixed-width UTC timestamp, so they sort chronologically per prefix
+    names = sorted(
+        (f for f in os.listdir(snapshot_dir) if f.endswith(SNAPSHOT_EXTENSION) and not f.startswith(".")),
+        key=lambda f: f.rsplit("-", 1)[-1],
+    )
+    return [os.path.join(snapshot_dir, f) for f in names]
+
+
+def prune_snapshots(snapshot_dir: str, retain: int = DEFAULT_RETAIN) -> List[str]:
+    """
+    Delete all but the newest `retain` snapshots, never the current one.
+
+    Returns: Paths of the deleted snapshots.
+    """
+    if retain < 1:
+        raise ValueError("retain must be at least 1")
+    current = current_snapshot(snapshot_dir)
+    snapshots = list_snapshots(snapshot_dir)
+    removed = []
+    for path in snapshots[: max(len(snapshots) - retain, 0)]:
+        if current and os.path.samefile(path, current):
+            continue
+        os.remove(path)
+        removed.append(path)
+        _logger.info(f"Removed old snapshot {path}")
+    return removed
+
+
+def resolve_reader_database(config: dict) -> str:
+    """
+    Database path a reader should open for a DB config.
+
+    With a `snapshot_dir` setting this is the current snapshot; without one (or
+    before the first snapshot is published) it is the configured database itself.
+    """
+    database = config.get("database", ":memory:")
+    snapshot_dir = config.get("snapshot_dir")
+    if not snapshot_dir:
+        return database
+    snapshot = current_snapshot(snapshot_dir)
+    if snapshot is None:
+        _logger.warning(f"No snapshot published in {snapshot_dir}; reading {database} directly")
+        return database
+    return snapshot
+
+
+def _write_pointer(snapshot_dir: str, name: str) -> None:
+    pointer = os.path.join(snapshot_dir, POINTER_FILE)
+    partial = f"{pointer}.partial"
+    with open(partial, "w") as f:
+        f.write(name)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(partial, pointer)
@@ -0,0 +1,273 @@
+"""
+Single-pass table profiler.
+
+Profiles every column of a set of tables with one aggregate query per table:
+row count, null rate, approximate distinct count and min / max / mean. Tables are
+profiled in parallel on cursors of one DuckDB connection. Tables larger than
+`sample_rows` are profiled on a block (system) sample so huge tables cost about the
+same as small ones, and a watchdog interrupts whatever is still running when the
+time budget runs out, so a profile always finishes on time.
+
+Results can be saved as JSON and appended to a `staging_profile` table.
+"""
+
+import duckdb
+import json
+import logging
+import os
+import pyarrow as pa
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+_logger = logging.getLogger(__name__)
+
+# Constants
+PROFILE_TABLE = "staging_profile"
+DEFAULT_SAMPLE_ROWS = 1_000_000
+DEFAULT_TIME_BUDGET = 60.0
+DEFAULT_WORKERS = 4
+SAMPLE_SEED = 42
+INTERRUPT_INTERVAL = 0.01
+NUMERIC_TYPES = {
+    "TINYINT", "SMALLINT", "INTEGER", "BIGINT", "HUGEINT",
+    "UTINYINT", "USMALLINT", "UINTEGER", "UBIGINT", "UHUGEINT",
+    "FLOAT", "DOUBLE", "BOOLEAN",
+}
+# Non-numeric types whose min/max are meaningful (plus all TIMESTAMP variants)
+ORDERED_TYPES = {"VARCHAR", "DATE", "TIME", "INTERVAL", "UUID"}
+PROFILE_SCHEMA = pa.schema([
+    ("profiled_at", pa.timestamp("us", tz="UTC")),
+    ("schema_name", pa.string()),
+    ("table_name", pa.string()),
+    ("column_name", pa.string()),
+    ("data_type", pa.string()),
+    ("row_count", pa.int64()),
+    ("sampled_rows", pa.int64()),
+    ("null_rate", pa.float64()),
+    ("approx_distinct", pa.int64()),
+    ("min_value", pa.string()),
+    ("max_value", pa.string()),
+    ("mean", pa.float64()),
+])
+PROFILE_DDL = """
+CREATE TABLE IF NOT EXISTS {schema}.{table} (
+    profiled_at TIMESTAMPTZ,
+    schema_name VARCHAR,
+    table_name VARCHAR,
+    column_name VARCHAR,
+    data_type VARCHAR,
+    row_count BIGINT,
+    sampled_rows BIGINT,
+    null_rate DOUBLE,
+    approx_distinct BIGINT,
+    min_value VARCHAR,
+    max_value VARCHAR,
+    mean DOUBLE
+)
+"""
+
+
+def profile_tables(
+    conn: duckdb.DuckDBPyConnection,
+    schema_name: str,
+    tables: List[str],
+    sample_rows: Optional[int] = DEFAULT_SAMPLE_ROWS,
+    time_budget: float = DEFAULT_TIME_BUDGET,
+    workers: int = DEFAULT_WORKERS,
+) -> dict:
+    """
+    Profile tables in parallel within a time budget.
+
+    params:
+        conn: Raw DuckDB connection; each table is profiled on its own cursor.
+        schema_name: Schema of the tables.
+        tables: Table names; duplicates are profiled once. Missing tables are reported
+            with status "missing".
+        sample_rows: Tables with more (estimated) rows are profiled on a block sample
+            of about this many rows. None profiles every row.
+        time_budget: Seconds after which unfinished tables are interrupted and
+            reported with status "timeout".
+        workers: Number of tables profiled concurrently.
+
+    Returns: Profile report: run metadata plus one entry per table (in input order).
+    """
+    started = time.perf_counter()
+    tables = list(dict.fromkeys(tables))
+    profiled_at = datetime.now(timezone.utc)
+    catalog = _catalog(conn, schema_name)
+
+    cursors = {}
+    timed_out = threading.Event()
+    done = threading.Event()
+    lock = threading.Lock()
+
+    def watchdog():
+        if done.wait(time_budget):
+            return
+        timed_out.set()
+        # Keep interrupting: a cursor may be registered just before its query starts
+        while not done.is_set():
+            with lock:
+                for cursor in cursors.values():
+                    cursor.interrupt()
+            done.wait(INTERRUPT_INTERVAL)
+
+    def run(table: str) -> dict:
+        if table not in catalog:
+            return {"table": table, "status": "missing"}
+        with lock:
+            if timed_out.is_set():
+                return {"table": table, "status": "timeout"}
+            cursor = cursors[table] = conn.cursor()
+        try:
+            return _profile_table(cursor, schema_name, table, catalog[table], sample_rows)
+        except duckdb.InterruptException:
+            return {"table": table, "status": "timeout"}
+        except duckdb.Error as e:
+            _logger.warning(f"Profiling {schema_name}.{table} failed: {e}")
+            return {"table": table, "status": "error", "error": str(e)}
+        finally:
+            with lock:
+                cursors.pop(table).close()
+
+    watchdog_thread = threading.Thread(target=watchdog, name="profile-watchdog", daemon=True)
+    watchdog_thread.start()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(tables)))) as pool:
+            results = list(pool.map(run, tables))
+    finally:
+        done.set()
+        watchdog_thread.join()
+
+    seconds = time.perf_counter() - started
+    _logger.info(f"Profiled {len(tables)} tables in {seconds:.2f}s (budget {time_budget:.0f}s)")
+    return {
+        "profiled_at": profiled_at.isoformat(),
+        "schema": schema_name,
+        "sample_rows": sample_rows,
+        "time_budget": time_budget,
+        "seconds": seconds,
+        "tables": results,
+    }
+
+
+def save_report(report: dict, path: str) -> str:
+    """Write a profile report as JSON and return its path."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, default=str)
+    return path
+
+
+def write_profile_table(conn, report: dict, table_name: str = PROFILE_TABLE) -> int:
+    """
+    Append the column profiles of a report to `<schema>.<table_name>`.
+
+    params:
+        conn: DuckDBConnection opened for writing.
+        report: Report returned by `profile_tables`.
+        table_name: Target table (created if needed) in the report's schema.
+
+    Returns: Number of rows written.
+    """
+    schema_name = report["schema"]
+    profiled_at = datetime.fromisoformat(report["profiled_at"])
+    rows = [
+        {
+            "profiled_at": profiled_at,
+            "schema_name": schema_name,
+            "table_name": table["table"],
+            "column_name": column["column"],
+            "data_type": column["type"],
+            "row_count": table["row_count"],
+            "sampled_rows": table["sampled_rows"],
+            "null_rate": column["null_rate"],
+            "approx_distinct": column["approx_distinct"],
+            "min_value": column["min"],
+            "max_value": column["max"],
+            "mean": column["mean"],
+        }
+        for table in report["tables"]
+        if table["status"] == "ok"
+        for column in table["columns"]
+    ]
+    conn.execute(PROFILE_DDL.format(schema=schema_name, table=table_name), ddl=True)
+    conn.insert_arrow(f"{schema_name}.{table_name}", pa.Table.from_pylist(rows, schema=PROFILE_SCHEMA))
+    return len(rows)
+
+
+def _catalog(conn: duckdb.DuckDBPyConnection, schema_name: str) -> Dict[str, dict]:
+    """Estimated row count and (column, type) list of every table in a schema, in one query."""
+    rows = conn.execute(
+        """
+        SELECT t.table_name, t.estimated_size, list([c.column_name, c.data_type] ORDER BY c.column_index)
+        FROM duckdb_tables() t
+        JOIN duckdb_columns() c ON c.table_oid = t.table_oid
+        WHERE t.schema_name = ?
+        GROUP BY ALL
+        """,
+        [schema_name],
+    ).fetchall()
+    return {
+        name: {"estimated_rows": size, "columns": [tuple(c) for c in columns]}
+        for name, size, columns in rows
+    }
+
+
+def _profile_table(cursor, schema_name: str, table: str, info: dict, sample_rows: Optional[int]) -> dict:
+    """Profile one table with a single aggregate query."""
+    started = time.perf_counter()
+    columns = info["columns"]
+    estimated_rows = info["estimated_rows"]
+    sample = ""
+    if sample_rows and estimated_rows > sample_rows:
+        percent = 100.0 * sample_rows / estimated_rows
+        sample = f" USING SAMPLE {percent:.6f} PERCENT (system, {SAMPLE_SEED})"
+
+    select = ["count(*)"]
+    for name, data_type in columns:
+        select.extend(_column_aggregates(f'"{name}"', data_type))
+    values = cursor.execute(f"SELECT {', '.join(select)} FROM {schema_name}.{table}{sample}").fetchone()
+
+    scanned = values[0]
+    profiles = []
+    for i, (name, data_type) in enumerate(columns):
+        non_null, distinct, minimum, maximum, mean = values[1 + 5 * i: 6 + 5 * i]
+        profiles.append({
+            "column": name,
+            "type": data_type,
+            "null_rate": 1.0 - non_null / scanned if scanned else 0.0,
+            "approx_distinct": distinct,
+            "min": minimum,
+            "max": maximum,
+            "mean": mean,
+        })
+    return {
+        "table": table,
+        "status": "ok",
+        # A sampled scan does not see every row, so the catalog estimate stands in for the count
+        "row_count": estimated_rows if sample else scanned,
+        "sampled_rows": scanned if sample else None,
+        "seconds": time.perf_counter() - started,
+        "columns": profiles,
+    }
+
+
+def _column_aggregates(column: str, data_type: str) -> List[str]:
+    """The five aggregates of a column: non-null count, distinct, min, max, mean (NULL where n/a)."""
+    base_type = data_type.split("(", 1)[0]
+    numeric = base_type in NUMERIC_TYPES or base_type == "DECIMAL"
+    ordered = numeric or base_type in ORDERED_TYPES or base_type.startswith("TIMESTAMP")
+    nested = data_type.endswith("]") or base_type in {"STRUCT", "MAP", "UNION"}
+    return [
+        f"count({column})",
+        "NULL" if nested else f"approx_count_distinct({column})",
+        f"min({column})::VARCHAR" if ordered else "NULL",
+        f"max({column})::VARCHAR" if ordered else "NULL",
+        f"avg({column}::DOUBLE)" if numeric else "NULL",
+    ]
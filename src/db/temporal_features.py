@@ -0,0 +1,98 @@
+"""
+Temporal (patient history) features for the feature store.
+
+History features are declared in `TEMPORAL_FEATURES` as an aggregate over a window
+of the same patient's encounters, and are all computed by one query whose windows
+share a single partition/sort by (patient_key, encounter_start). Frames are RANGE
+frames over the encounter start date, so each encounter looks back a fixed number
+of days (or over the patient's whole history) without self-joins.
+
+Feature spec keys:
+    aggregate: SQL aggregate evaluated over the frame.
+    days: Look-back in days; None for the whole history.
+    include_current: Whether the frame includes the encounter's own start date.
+        Otherwise only encounters that started on earlier days are seen.
+    expression: Optional template applied to the aggregate ("{value}").
+    type: SQL type of the encounter_fact column.
+"""
+
+import logging
+from db import constant as c
+from db.connection import DBConnection
+from typing import Dict
+
+_logger = logging.getLogger(__name__)
+
+# Constants
+FEATURE_TABLE = f"{c.Schema.READMISSION}.{c.Table.ENCOUNTER_FACT}"
+WINDOW_NAME = "patient_history"
+TEMPORAL_FEATURES: Dict[str, dict] = {
+    "prior_encounters_30d": {"aggregate": "count(*)", "days": 30, "type": "USMALLINT"},
+    "prior_encounters_90d": {"aggregate": "count(*)", "days": 90, "type": "USMALLINT"},
+    "prior_encounters_365d": {"aggregate": "count(*)", "days": 365, "type": "USMALLINT"},
+    "days_since_last_discharge": {
+        "aggregate": "max(encounter_end)",
+        "days": None,
+        # Clamped at 0 for stays overlapping this encounter; NULL without prior encounters
+        "expression": "CASE WHEN {value} IS NOT NULL THEN greatest(encounter_start - {value}, 0) END",
+        "type": "INTEGER",
+    },
+    "cumulative_chronic_dx_count": {
+        "aggregate": "sum(chronic_dx_count)",
+        "days": None,
+        "include_current": True,
+        "type": "USMALLINT",
+    },
+}
+
+
+def frame_sql(spec: dict) -> str:
+    """RANGE frame clause of a feature spec."""
+    start = "UNBOUNDED PRECEDING" if spec.get("days") is None else f"INTERVAL {int(spec['days'])} DAYS PRECEDING"
+    end = "CURRENT ROW" if spec.get("include_current", False) else "INTERVAL 1 DAY PRECEDING"
+    return f"RANGE BETWEEN {start} AND {end}"
+
+
+def window_sql(features: Dict[str, dict] = TEMPORAL_FEATURES, source: str = FEATURE_TABLE) -> str:
+    """
+    Query computing every temporal feature per encounter_key from one sorted pass.
+
+    All windows share the partitioning and ordering of `WINDOW_NAME`, so the input
+    is sorted once however many features are declared.
+    """
+    columns = []
+    for name, spec in features.items():
+        value = f"{spec['aggregate']} OVER ({WINDOW_NAME} {frame_sql(spec)})"
+        expression = spec.get("expression", "{value}").format(value=value)
+        columns.append(f"CAST({expression} AS {spec['type']}) AS {name}")
+    return (
+        f"SELECT encounter_key, {', '.join(columns)}\n"
+        f"FROM {source}\n"
+        f"WINDOW {WINDOW_NAME} AS (PARTITION BY patient_key ORDER BY encounter_start)"
+    )
+
+
+def apply_temporal_features(
+    conn: DBConnection, features: Dict[str, dict] = TEMPORAL_FEATURES, table: str = FEATURE_TABLE
+) -> None:
+    """
+    Compute the temporal features and write them into their columns of `table`.
+
+    params:
+        conn: Database connection object.
+        features: Feature specs (see module docstring). Missing columns are added.
+        table: Feature table with patient_key, encounter_start, encounter_end and
+            the columns aggregated by the specs.
+
+    Returns: None
+    """
+    for name, spec in features.items():
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {name} {spec['type']}", ddl=True)
+    assignments = ", ".join(f"{name} = w.{name}" for name in features)
+    conn.execute(
+        f"UPDATE {table} AS f SET {assignments}\n"
+        f"FROM ({window_sql(features, table)}) AS w\n"
+        f"WHERE f.encounter_key = w.encounter_key",
+        ddl=True,
+    )
+    _logger.info(f"Computed {len(features)} temporal features in {table}")
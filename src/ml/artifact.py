@@ -0,0 +1,246 @@
+"""
+Compact inference artifacts for readmission models.
+
+`ml.util.save_model` pickles the whole sklearn-wrapped estimator. This module exports
+only what inference needs into a pickle-free ``.npz`` file:
+    - XGBoost: flattened booster trees with float32 thresholds and leaf values.
+    - Logistic regression: float32 coefficients and intercept.
+Every artifact embeds its feature order and a SHA-256 checksum of its payload.
+Use `ml.model.load_compact_model` to load one.
+"""
+
+import hashlib
+import json
+import logging
+import numpy as np
+import os
+import tempfile
+import time
+from joblib import dump, load
+from typing import Dict, List, Optional, Sequence
+
+_logger = logging.getLogger(__name__)
+
+# Constants
+ARTIFACT_FORMAT = "readmission-compact"
+ARTIFACT_VERSION = 1
+ARTIFACT_EXTENSION = ".npz"
+HEADER_KEY = "header"
+TREE_ARRAYS = ["feature", "threshold", "left", "right", "default_left", "value", "roots"]
+LINEAR_ARRAYS = ["coef", "intercept"]
+
+
+def export_compact_model(
+    model,
+    path: str,
+    feature_names: Optional[Sequence[str]] = None,
+    min_gain_fraction: Optional[float] = None,
+    extras: Optional[dict] = None,
+) -> dict:
+    """
+    Export a trained model to a compact inference artifact.
+
+    params:
+        model: Trained XGBClassifier or binary LogisticRegression.
+        path: Output file path (should end with .npz).
+        feature_names: Feature order expected by the model. Defaults to the names
+            seen during fitting (`feature_names_in_`).
+        min_gain_fraction: If set, drop boosted trees whose total split gain is below
+            this fraction of the ensemble's total gain. Ignored for linear models.
+        extras: Optional JSON-serializable metadata stored in the header.
+
+    Returns: The artifact header (including checksum).
+    """
+    feature_names = _resolve_feature_names(model, feature_names)
+
+    if hasattr(model, "get_booster"):
+        header, arrays = _export_booster(model.get_booster(), min_gain_fraction)
+    elif hasattr(model, "coef_") and hasattr(model, "intercept_"):
+        header, arrays = _export_linear(model)
+    else:
+        raise ValueError(f"Unsupported model type: {type(model).__name__}")
+
+    header.update(
+        {
+            "format": ARTIFACT_FORMAT,
+            "version": ARTIFACT_VERSION,
+            "feature_names": feature_names,
+            "extras": extras or {},
+        }
+    )
+    if len(feature_names) != header["num_features"]:
+        raise ValueError(
+            f"Model expects {header['num_features']} features, got {len(feature_names)} names"
+        )
+    header["checksum"] = compute_checksum(header, arrays)
+
+    encoded = np.frombuffer(json.dumps(header, sort_keys=True).encode("utf-8"), dtype=np.uint8)
+    with open(path, "wb") as f:
+        np.savez(f, **{HEADER_KEY: encoded}, **arrays)
+    _logger.info(f"Compact {header['kind']} artifact saved to {path}")
+    return header
+
+
+def compute_checksum(header: dict, arrays: Dict[str, np.ndarray]) -> str:
+    """
+    Compute the SHA-256 checksum of an artifact's header and arrays.
+
+    The `checksum` key of the header itself is excluded.
+    """
+    digest = hashlib.sha256()
+    meta = {k: v for k, v in header.items() if k != "checksum"}
+    digest.update(json.dumps(meta, sort_keys=True).encode("utf-8"))
+    for name in sorted(arrays):
+        arr = np.ascontiguousarray(arrays[name])
+        digest.update(name.encode("utf-8"))
+        digest.update(arr.dtype.str.encode("utf-8"))
+        digest.update(arr.tobytes())
+    return digest.hexdigest()
+
+
+def compare_artifact(
+    original_model,
+    artifact_path: str,
+    X,
+    original_path: Optional[str] = None,
+    repeats: int = 5,
+) -> dict:
+    """
+    Report artifact size, load time and prediction deltas versus the original model.
+
+    params:
+        original_model: The model the artifact was exported from.
+        artifact_path: Path to the compact artifact.
+        X: Sample feature matrix used to compare predictions.
+        original_path: Path to the joblib file of the original model. If missing,
+            the model is dumped to a temporary file for measurement.
+        repeats: Number of loads to time; the best time is reported.
+
+    Returns: Dictionary with size, load-time and prediction-delta metrics.
+    """
+    from ml.model import load_compact_model
+
+    tmp_path = None
+    if original_path is None:
+        fd, tmp_path = tempfile.mkstemp(suffix=".joblib")
+        os.close(fd)
+        dump(original_model, tmp_path)
+        original_path = tmp_path
+
+    try:
+        original_load_s = _best_time(lambda: load(original_path), repeats)
+        compact_load_s = _best_time(lambda: load_compact_model(artifact_path), repeats)
+        original_bytes = os.path.getsize(original_path)
+    finally:
+        if tmp_path is not None:
+            os.remove(tmp_path)
+
+    compact = load_compact_model(artifact_path)
+    expected = original_model.predict_proba(X)[:, 1]
+    actual = compact.predict_proba(X)[:, 1]
+    delta = np.abs(expected - actual)
+
+    return {
+        "original_bytes": original_bytes,
+        "artifact_bytes": os.path.getsize(artifact_path),
+        "original_load_ms": original_load_s * 1000,
+        "artifact_load_ms": compact_load_s * 1000,
+        "num_trees": compact.header.get("num_trees"),
+        "num_pruned_trees": compact.header.get("num_pruned_trees"),
+        "rows_compared": int(len(delta)),
+        "max_abs_delta": float(delta.max()) if delta.size else 0.0,
+        "mean_abs_delta": float(delta.mean()) if delta.size else 0.0,
+    }
+
+
+def _resolve_feature_names(model, feature_names) -> List[str]:
+    if feature_names is not None:
+        return [str(f) for f in feature_names]
+    names = getattr(model, "feature_names_in_", None)
+    if names is None:
+        raise ValueError("feature_names is required when the model was not fit on a DataFrame")
+    return [str(f) for f in names]
+
+
+def _export_booster(booster, min_gain_fraction: Optional[float]):
+    """Flatten the trees of an XGBoost booster into concatenated node arrays."""
+    learner = json.loads(booster.save_raw("json"))["learner"]
+    objective = learner["objective"]["name"]
+    if objective != "binary:logistic":
+        raise ValueError(f"Unsupported XGBoost objective: {objective}")
+
+    params = learner["learner_model_param"]
+    base_score = float(params["base_score"].strip("[]"))
+    trees = learner["gradient_booster"]["model"]["trees"]
+
+    gains = np.array(
+        [sum(g for g, l in zip(t["loss_changes"], t["left_children"]) if l != -1) for t in trees]
+    )
+    keep = np.ones(len(trees), dtype=bool)
+    if min_gain_fraction and gains.sum() > 0:
+        keep = gains >= min_gain_fraction * gains.sum()
+        if not keep.any():
+            raise ValueError(f"min_gain_fraction={min_gain_fraction} would prune every tree")
+
+    columns = {name: [] for name in TREE_ARRAYS}
+    offset, max_depth = 0, 0
+    for tree, kept in zip(trees, keep):
+        if not kept:
+            continue
+        left = np.asarray(tree["left_children"], dtype=np.int32)
+        right = np.asarray(tree["right_children"], dtype=np.int32)
+        is_leaf = left == -1
+        node_ids = np.arange(len(left), dtype=np.int32)
+        # Leaves point to themselves so traversal can run a fixed number of steps
+        columns["left"].append(np.where(is_leaf, node_ids, left) + offset)
+        columns["right"].append(np.where(is_leaf, node_ids, right) + offset)
+        columns["feature"].append(np.where(is_leaf, 0, tree["split_indices"]).astype(np.int32))
+        conditions = np.asarray(tree["split_conditions"], dtype=np.float32)
+        columns["threshold"].append(conditions)
+        columns["value"].append(np.where(is_leaf, conditions, 0).astype(np.float32))
+        columns["default_left"].append(np.asarray(tree["default_left"], dtype=bool))
+        columns["roots"].append(np.array([offset], dtype=np.int32))
+        max_depth = max(max_depth, _tree_depth(left, right))
+        offset += len(left)
+
+    arrays = {name: np.concatenate(parts) if parts else np.array([]) for name, parts in columns.items()}
+    header = {
+        "kind": "xgboost",
+        "num_features": int(params["num_feature"]),
+        "base_margin": float(np.log(base_score / (1 - base_score))),
+        "max_depth": int(max_depth),
+        "num_trees": int(keep.sum()),
+        "num_pruned_trees": int((~keep).sum()),
+    }
+    return header, arrays
+
+
+def _export_linear(model):
+    coef = np.asarray(model.coef_, dtype=np.float32)
+    if coef.shape[0] != 1:
+        raise ValueError("Only binary linear models are supported")
+    arrays = {
+        "coef": coef.ravel(),
+        "intercept": np.asarray(model.intercept_, dtype=np.float32).ravel(),
+    }
+    header = {"kind": "logreg", "num_features": int(coef.shape[1])}
+    return header, arrays
+
+
+def _tree_depth(left: np.ndarray, right: np.ndarray) -> int:
+    depth, frontier = 0, [0]
+    while True:
+        children = [c for n in frontier for c in (left[n], right[n]) if c != -1]
+        if not children:
+            return depth
+        depth += 1
+        frontier = children
+
+
+def _best_time(fn, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(max(1, repeats)):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
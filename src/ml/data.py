@@ -0,0 +1,111 @@
+"""
+Feature store loading for readmission model training.
+"""
+
+import logging
+import numpy as np
+import pandas as pd
+from db.partitioned_store import is_partitioned, range_filter
+from ml.dtypes import feature_dtype_plan, fill_columns
+from typing import Dict, List, Optional
+
+_logger = logging.getLogger(__name__)
+
+# Constants
+FEATURE_TABLE = "readmission.encounter_fact"
+LABEL = "readmitted"
+SPLIT_DATE = "2018-01-01"
+FEATURES = [
+    "age_at_encounter",
+    "gender_key",
+    "race_key",
+    "ethnicity_key",
+    "has_diabetes",
+    "has_hypertension",
+    "has_copd",
+    "has_asthma",
+    "has_heart_failure",
+    "has_arthritis",
+    "has_depression",
+    "has_kidney_disease",
+    "has_cancer",
+    "has_alzheimers",
+    "chronic_dx_count",
+    "num_meds",
+    "has_anticoagulant",
+    "has_antibiotic",
+    "has_steroid",
+    "num_procedures",
+    "had_surgery",
+    "had_biopsy",
+]
+
+
+# This is pretty specific for the readmission use case
+def load_training_data(
+    conn,
+    features: List[str],
+    split_date: str = SPLIT_DATE,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    table: str = FEATURE_TABLE,
+):
+    """
+    Load the feature store and split it temporally into train and test sets.
+
+    Only the feature and label columns are read, in the compact dtypes of
+    `ml.dtypes.feature_dtype_plan`; the sort and the split run in the database.
+    On a partitioned source (see `db.partitioned_store`) only the months in
+    [start_date, end_date) are scanned.
+
+    params:
+        conn: Database connection object.
+        features: Feature columns to select.
+        split_date: Encounters starting before this date are used for training.
+        start_date: First encounter_start date loaded (inclusive), or None.
+        end_date: Encounter_start date loaded up to (exclusive), or None.
+        table: Feature table or partitioned view to read.
+
+    Returns: Tuple of (X_train, y_train, X_test, y_test), ordered by encounter_start.
+    """
+    partitioned = is_partitioned(conn, table)
+    plan = feature_dtype_plan(conn, features + [LABEL], table, *range_filter(start_date, end_date, partitioned))
+    train = load_feature_frame(conn, plan, *range_filter(start_date, split_date, partitioned), table=table)
+    test = load_feature_frame(conn, plan, *range_filter(split_date, end_date, partitioned), table=table)
+    _logger.info(
+        f"Loaded {len(train)} training and {len(test)} test rows "
+        f"({(_nbytes(train) + _nbytes(test)) / 1e6:.1f} MB)"
+    )
+    return train[features], train[LABEL], test[features], test[LABEL]
+
+
+def load_feature_frame(
+    conn, plan: Dict[str, str], where: str = "TRUE", params: dict | None = None, table: str = FEATURE_TABLE
+) -> pd.DataFrame:
+    """
+    Read planned columns of the feature store into a DataFrame of compact dtypes.
+
+    Columns are filled batch by batch into preallocated arrays, so the only copy
+    held besides the result is one Arrow batch.
+
+    params:
+        conn: Database connection object.
+        plan: Mapping of column to numpy dtype (see `ml.dtypes.feature_dtype_plan`).
+        where: SQL filter on the feature store.
+        params: Query parameters referenced by `where`.
+        table: Feature table or partitioned view to read.
+
+    Returns: DataFrame with one column per plan entry, ordered by encounter_start.
+    """
+    source = f"FROM {table} WHERE {where}"
+    num_rows = int(conn.execute(f"SELECT count(*) AS n {source}", params)["n"][0])
+    arrays = {column: np.empty(num_rows, dtype=dtype) for column, dtype in plan.items()}
+    start = 0
+    for batch in conn.fetch_record_batches(f"SELECT {', '.join(plan)} {source} ORDER BY encounter_start", params):
+        fill_columns(arrays, batch, start)
+        start += batch.num_rows
+    return pd.DataFrame(arrays, copy=False)
+
+
+def _nbytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(index=False).sum())
@@ -0,0 +1,304 @@
+"""
+Constant-memory monitoring of feature drift in live traffic.
+
+At training time `build_reference` summarizes every model feature of the training
+set into a fixed-size sketch, keyed by the feature's name in the API (training
+columns named differently are renamed with SERVING_NAMES), and `save_reference`
+writes the sketches next to the model, as `<name>.drift.json`:
+    - histogram: counts between fixed cut points, for age and the count features.
+      Features with few distinct values get one bin per value; others get
+      quantile bins (at most MAX_BINS). Two more bins count values below and
+      above the training range.
+    - frequency: counts per value, for the dimension keys and the flag features.
+      The most frequent values (at most MAX_CATEGORIES) get their own entry, the
+      rest and any value unseen in training share an "other" entry.
+
+While serving, `DriftMonitor` fills sketches of the same shape from scored feature
+vectors. The request path only enqueues with a non-blocking put (as the shadow
+scorer does); a background thread bins whole batches. Memory depends on the number
+of bins and the queue bounds (submissions and rows), never on the traffic volume. `DriftMonitor.report`
+compares live and reference sketches with the population stability index (PSI) and,
+for histograms, the Kolmogorov-Smirnov distance between the binned distributions.
+"""
+
+import json
+import logging
+import numpy as np
+import os
+import queue
+import threading
+import time
+from typing import List, Optional, Sequence
+
+_logger = logging.getLogger(__name__)
+
+# Constants
+REFERENCE_FORMAT = "readmission-drift-reference"
+REFERENCE_VERSION = 1
+REFERENCE_SUFFIX = ".drift.json"
+SERVING_NAMES = {"age_at_encounter": "age"}  # training column -> API feature name
+HISTOGRAM_FEATURES = ["age", "chronic_dx_count", "num_meds", "num_procedures"]
+HISTOGRAM = "histogram"
+FREQUENCY = "frequency"
+MAX_BINS = 20
+MAX_CATEGORIES = 64
+PSI_EPSILON = 1e-4  # floor on bin shares, so an empty bin does not make PSI infinite
+PSI_WARN = 0.1
+PSI_DRIFT = 0.2
+DEFAULT_MAX_QUEUE = 1024
+DEFAULT_MAX_PENDING_ROWS = 262_144
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_FLUSH_INTERVAL = 0.5
+
+
+def build_reference(X, histogram_features: Sequence[str] = HISTOGRAM_FEATURES) -> dict:
+    """
+    Summarize a training feature matrix into reference sketches.
+
+    params:
+        X: Training features (DataFrame with the model's feature columns).
+        histogram_features: Features (API names) sketched as histograms; all others
+            as frequencies.
+
+    Returns: Reference dict (see `save_reference`), keyed by API feature names.
+    """
+    features = {}
+    for column in X.columns:
+        name = SERVING_NAMES.get(column, column)
+        values = np.asarray(X[column], dtype=np.float64)
+        values = values[~np.isnan(values)]
+        sketch = _histogram(values) if name in histogram_features else _frequency(values)
+        sketch["counts"] = _bin_counts(sketch, values).tolist()
+        features[name] = sketch
+    return {"format": REFERENCE_FORMAT, "version": REFERENCE_VERSION, "rows": len(X), "features": features}
+
+
+def save_reference(reference: dict, path: str) -> None:
+    """Write a reference built by `build_reference` as JSON."""
+    with open(path, "w") as f:
+        json.dump(reference, f)
+    _logger.info(f"Drift reference of {reference['rows']} rows saved to {path}")
+
+
+def load_reference(path: str) -> dict:
+    """Read and check a reference written by `save_reference`."""
+    with open(path) as f:
+        reference = json.load(f)
+    if reference.get("format") != REFERENCE_FORMAT or reference.get("version") != REFERENCE_VERSION:
+        raise ValueError(f"{path} is not a version {REFERENCE_VERSION} drift reference")
+    return reference
+
+
+def reference_path(model_path: str) -> str:
+    """The `<name>.drift.json` reference exported alongside a saved model."""
+    return os.path.splitext(model_path)[0] + REFERENCE_SUFFIX
+
+
+def population_stability_index(expected: np.ndarray, actual: np.ndarray) -> float:
+    """PSI between two count vectors over the same bins."""
+    p = np.maximum(expected / max(expected.sum(), 1), PSI_EPSILON)
+    q = np.maximum(actual / max(actual.sum(), 1), PSI_EPSILON)
+    return float(np.sum((q - p) * np.log(q / p)))
+
+
+def ks_distance(expected: np.ndarray, actual: np.ndarray) -> float:
+    """Largest gap between the cumulative distributions of two ordered count vectors."""
+    p = np.cumsum(expected) / max(expected.sum(), 1)
+    q = np.cumsum(actual) / max(actual.sum(), 1)
+    return float(np.abs(q - p).max())
+
+
+class DriftMonitor:
+    def __init__(
+        self,
+        reference: dict,
+        features: List[str],
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        max_pending_rows: int = DEFAULT_MAX_PENDING_ROWS,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+    ):
+        """
+        params:
+            reference: Reference sketches (see `build_reference`).
+            features: Feature order of the submitted vectors; each needs a reference sketch.
+            max_queue: Maximum number of pending submissions; extra submissions are dropped.
+            max_pending_rows: Maximum number of pending rows (a batch submission holds
+                many); submissions that would exceed it are dropped.
+            batch_size: Maximum number of submissions binned together.
+            flush_interval: Seconds the worker waits to fill a batch before binning it.
+        """
+        missing = [name for name in features if name not in reference["features"]]
+        if missing:
+            raise ValueError(f"Drift reference has no sketch for {missing}")
+        self.reference = reference
+        self.features = list(features)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending_rows = max_pending_rows
+        self._sketches = [reference["features"][name] for name in self.features]
+        self._counts = [np.zeros(len(s["counts"]), dtype=np.int64) for s in self._sketches]
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._submitted = 0
+        self._dropped = 0
+        self._pending_rows = 0
+        self._rows = 0
+
+    def start(self) -> "DriftMonitor":
+        """Start the background binning thread."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="drift-monitor", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """Stop the background thread after it bins what is already queued."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, features) -> bool:
+        """
+        Enqueue scored features without blocking.
+
+        params:
+            features: One feature vector, or a (rows x features) matrix, in `features` order.
+
+        Returns: True if queued, False if dropped because the queue was full.
+        """
+        rows = len(features) if np.ndim(features) == 2 else 1
+        with self._lock:
+            queued = self._pending_rows + rows <= self.max_pending_rows
+            if queued:
+                try:
+                    self._queue.put_nowait(features)
+                except queue.Full:
+                    queued = False
+            if queued:
+                self._submitted += 1
+                self._pending_rows += rows
+            else:
+                self._dropped += 1
+        return queued
+
+    def reset(self) -> None:
+        """Forget the live traffic seen so far (e.g. after deploying a new model)."""
+        with self._lock:
+            for counts in self._counts:
+                counts[:] = 0
+            self._rows = 0
+
+    def report(self) -> dict:
+        """
+        Compare live traffic with the reference.
+
+        Returns: Dictionary with activity counters and, per feature, the sketch kind,
+            PSI, KS distance (histograms only) and a status of "stable", "warn"
+            (PSI >= PSI_WARN) or "drift" (PSI >= PSI_DRIFT). Statistics are None
+            until a row has been binned.
+        """
+        with self._lock:
+            counts = [c.copy() for c in self._counts]
+            report = {
+                "submitted": self._submitted,
+                "dropped": self._dropped,
+                "pending": self._queue.qsize(),
+                "pending_rows": self._pending_rows,
+                "rows": self._rows,
+                "reference_rows": self.reference["rows"],
+            }
+        features = {}
+        for name, sketch, live in zip(self.features, self._sketches, counts):
+            entry = {"kind": sketch["kind"], "psi": None, "ks": None, "status": None}
+            if live.sum():
+                expected = np.asarray(sketch["counts"], dtype=np.float64)
+                entry["psi"] = population_stability_index(expected, live)
+                if sketch["kind"] == HISTOGRAM:
+                    entry["ks"] = ks_distance(expected, live)
+                entry["status"] = _status(entry["psi"])
+            features[name] = entry
+        report["features"] = features
+        report["drifted"] = [name for name, entry in features.items() if entry["status"] == "drift"]
+        return report
+
+    def _run(self) -> None:
+        while not (self._stop.is_set() and self._queue.empty()):
+            batch = self._next_batch()
+            if batch:
+                self._update(batch)
+
+    def _next_batch(self) -> list:
+        # Wait up to flush_interval to fill a batch so rows are binned in bulk
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _update(self, batch: list) -> None:
+        rows = sum(len(item) if np.ndim(item) == 2 else 1 for item in batch)
+        try:
+            X = np.vstack([np.atleast_2d(np.asarray(item, dtype=np.float64)) for item in batch])
+            if X.shape[1] != len(self.features):
+                raise ValueError(f"expected {len(self.features)} features, got {X.shape[1]}")
+        except ValueError as e:
+            _logger.warning(f"Drift monitor skipped a batch of {len(batch)} submissions: {e}")
+            with self._lock:
+                self._pending_rows -= rows
+            return
+        binned = []
+        for column, sketch in enumerate(self._sketches):
+            values = X[:, column]
+            binned.append(_bin_counts(sketch, values[~np.isnan(values)]))
+        with self._lock:
+            for counts, new in zip(self._counts, binned):
+                counts += new
+            self._rows += len(X)
+            self._pending_rows -= rows
+
+
+def _histogram(values: np.ndarray) -> dict:
+    """Histogram sketch: one bin per value if there are few, else quantile bins."""
+    distinct = np.unique(values)
+    if len(distinct) > MAX_BINS:
+        distinct = np.unique(np.quantile(values, np.linspace(0, 1, MAX_BINS + 1)[:-1]))
+    # Bin i holds [cuts[i - 1], cuts[i]); the first bin is below the training minimum
+    # and the last above the training maximum
+    upper = [np.nextafter(values.max(), np.inf)] if len(values) else []
+    return {"kind": HISTOGRAM, "cuts": distinct.tolist() + [float(u) for u in upper]}
+
+
+def _frequency(values: np.ndarray) -> dict:
+    """Frequency sketch over the most frequent values, plus a shared "other" entry."""
+    distinct, counts = np.unique(values, return_counts=True)
+    top = np.sort(distinct[np.argsort(-counts, kind="stable")[:MAX_CATEGORIES]])
+    return {"kind": FREQUENCY, "values": top.tolist()}
+
+
+def _bin_counts(sketch: dict, values: np.ndarray) -> np.ndarray:
+    """Counts of values in each bin of a sketch."""
+    if sketch["kind"] == HISTOGRAM:
+        cuts = np.asarray(sketch["cuts"], dtype=np.float64)
+        return np.bincount(np.searchsorted(cuts, values, side="right"), minlength=len(cuts) + 1)
+    known = np.asarray(sketch["values"], dtype=np.float64)
+    index = np.searchsorted(known, values)
+    matched = known[np.minimum(index, max(len(known) - 1, 0))] == values if len(known) else False
+    # The last bin is "other"
+    return np.bincount(np.where(matched, index, len(known)), minlength=len(known) + 1)
+
+
+def _status(psi: float) -> str:
+    if psi >= PSI_DRIFT:
+        return "drift"
+    return "warn" if psi >= PSI_WARN else "stable"
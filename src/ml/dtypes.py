@@ -0,0 +1,112 @@
+"""
+Compact feature dtypes for training and scoring matrices.
+
+The feature store declares its columns as BOOLEAN/UTINYINT/USMALLINT, so a feature
+matrix only needs one or two bytes per value. A dtype plan maps each feature column
+to the narrowest numpy dtype its SQL type allows; matrices are held in those dtypes
+and widened to float32 only at the model boundary, a bounded number of rows at a time.
+"""
+
+import logging
+import numpy as np
+from typing import Dict, Iterator, List
+
+_logger = logging.getLogger(__name__)
+
+# Constants
+WIDEN_CHUNK_ROWS = 65_536
+# Widened dtype of columns that actually contain NULLs (NaN is the model's missing value)
+MISSING_DTYPE = "float32"
+SQL_DTYPES = {
+    "BOOLEAN": "uint8",
+    "UTINYINT": "uint8",
+    "TINYINT": "int8",
+    "USMALLINT": "uint16",
+    "SMALLINT": "int16",
+    "UINTEGER": "uint32",
+    "INTEGER": "int32",
+    "BIGINT": "int64",
+    "FLOAT": "float32",
+    "DOUBLE": "float32",
+}
+
+
+def feature_dtype_plan(
+    conn, columns: List[str], table: str, where: str = "TRUE", params: dict | None = None
+) -> Dict[str, str]:
+    """
+    Derive the numpy dtype of each column from the table schema.
+
+    Nullable columns that actually hold NULLs are planned as `MISSING_DTYPE`, so
+    every slice of the table (e.g. train and test) gets the same dtypes.
+
+    params:
+        conn: Database connection object.
+        columns: Columns to plan, e.g. the model features and the label.
+        table: Schema-qualified table or view name.
+        where: SQL filter on the rows the plan is for (checked for NULLs).
+        params: Query parameters referenced by `where`.
+
+    Returns: Mapping of column name to numpy dtype name, in `columns` order.
+    """
+    schema, name = table.split(".")
+    types = conn.execute(
+        "SELECT column_name, data_type, is_nullable FROM duckdb_columns() "
+        "WHERE schema_name = $schema AND table_name = $name",
+        {"schema": schema, "name": name},
+    )
+    sql_types = dict(zip(types["column_name"], types["data_type"]))
+    missing = [column for column in columns if column not in sql_types]
+    if missing:
+        raise ValueError(f"Columns not found in {table}: {missing}")
+    unsupported = {c: sql_types[c] for c in columns if sql_types[c] not in SQL_DTYPES}
+    if unsupported:
+        raise ValueError(f"No compact dtype for columns of {table}: {unsupported}")
+    plan = {column: SQL_DTYPES[sql_types[column]] for column in columns}
+
+    nullable = set(types["column_name"][types["is_nullable"]])
+    checked = [column for column in columns if column in nullable]
+    if checked:
+        counts = conn.execute(
+            f"SELECT {', '.join(f'count(*) - count({column}) AS {column}' for column in checked)} "
+            f"FROM {table} WHERE {where}",
+            params,
+        )
+        for column in checked:
+            if counts[column][0]:
+                plan[column] = MISSING_DTYPE
+    return plan
+
+
+def fill_columns(arrays: Dict[str, np.ndarray], batch, start: int) -> None:
+    """
+    Copy an Arrow batch into preallocated column arrays at row offset `start`.
+
+    A column holding NULLs that its plan did not expect is widened to
+    `MISSING_DTYPE` (once, in place in `arrays`) so the NULLs can be stored as NaN.
+    """
+    stop = start + batch.num_rows
+    for name, array in arrays.items():
+        column = batch.column(name)
+        if column.null_count and array.dtype != np.dtype(MISSING_DTYPE):
+            _logger.debug(f"Column {name} has NULLs; widening it to {MISSING_DTYPE}")
+            array = arrays[name] = array.astype(MISSING_DTYPE)
+        if column.null_count:
+            array[start:stop] = column.to_numpy(zero_copy_only=False).astype(MISSING_DTYPE)
+        else:
+            array[start:stop] = column.to_numpy(zero_copy_only=False)
+
+
+def widen_chunks(X, chunk_rows: int = WIDEN_CHUNK_ROWS) -> Iterator[np.ndarray]:
+    """
+    Yield consecutive row chunks of a feature matrix as float32 arrays.
+
+    params:
+        X: 2-D array or DataFrame, in any numeric dtypes.
+        chunk_rows: Rows widened at a time; bounds the float32 copy held at once.
+
+    Returns: Iterator of (rows x features) float32 arrays covering X in order.
+    """
+    rows = X.iloc if hasattr(X, "iloc") else X
+    for start in range(0, len(X), chunk_rows):
+        yield np.asarray(rows[start:start + chunk_rows], dtype=np.float32)
@@ -2,20 +2,31 @@
 Readmission model loading and prediction logic.
 """
 
+import hashlib
 import joblib
+import json
 import logging
 import numpy as np
 import os
+from ml.artifact import (
+    ARTIFACT_EXTENSION,
+    ARTIFACT_FORMAT,
+    HEADER_KEY,
+    LINEAR_ARRAYS,
+    TREE_ARRAYS,
+    compute_checksum,
+)
+from ml.dtypes import widen_chunks
 from typing import List
 
 # Configure module-level _logger
 _logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
 
 # Constants
 MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
 # Note: this is hardcoded for simplicity; in production, consider using environment variables or config files.
 DEFAULT_MODEL_PATH = os.path.join(MODULE_DIR, "..", "..", "ml_model", "xgboost_readmission_model.joblib")
+PREDICT_CHUNK_ROWS = 4096
 
 
 class ReadmissionModel:
@@ -27,6 +38,7 @@ class ReadmissionModel:
             model_path (str): Path to the serialized model file.
         """
         self.model = self._load_model(model_path)
+        self.version = model_version(model_path)
 
     def predict(self, features: List[float]) -> float:
         """
@@ -39,11 +51,112 @@ class ReadmissionModel:
         """
         X = np.array([features], dtype=np.float32)
         prob = self.model.predict_proba(X)[0][1]
-        _logger.debug(f"Input features: {features}, Predicted probability: {prob:.4f}")
+        # Lazy %-formatting: the feature list is only rendered when DEBUG is enabled
+        _logger.debug("Input features: %s, Predicted probability: %.4f", features, prob)
         return float(prob)
-    
+
+    def predict_batch(self, X) -> np.ndarray:
+        """
+        Predict readmission probabilities for a matrix of feature rows.
+
+        params:
+            X: 2-D array or DataFrame of numerical features, one row per patient. Compact
+                dtypes are widened to float32 in chunks (see `ml.dtypes.widen_chunks`).
+
+        Returns: 1-D array of probabilities.
+        """
+        probs = [self.model.predict_proba(chunk)[:, 1] for chunk in widen_chunks(X)]
+        return np.concatenate(probs) if probs else np.empty(0, dtype=np.float32)
+
     def _load_model(self, path: str):
         if not os.path.exists(path):
             raise FileNotFoundError(f"Model file not found at: {path}")
         _logger.info(f"Loading model from {path}")
+        if path.endswith(ARTIFACT_EXTENSION):
+            return load_compact_model(path)
         return joblib.load(path)
+
+
+def model_version(path: str) -> str:
+    """Version identifier for a model file: its name plus a short content hash."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    name = os.path.splitext(os.path.basename(path))[0]
+    return f"{name}-{digest.hexdigest()[:12]}"
+
+
+class CompactTreeModel:
+    """Boosted tree ensemble evaluated from flattened float32 node arrays."""
+
+    def __init__(self, header: dict, arrays: dict):
+        self.header = header
+        self.feature_names = header["feature_names"]
+        self.base_margin = np.float32(header["base_margin"])
+        self.max_depth = header["max_depth"]
+        for name in TREE_ARRAYS:
+            setattr(self, name, arrays[name])
+
+    def predict_proba(self, X) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float32)
+        margins = np.empty(X.shape[0], dtype=np.float32)
+        for start in range(0, X.shape[0], PREDICT_CHUNK_ROWS):
+            margins[start:start + PREDICT_CHUNK_ROWS] = self._margin(X[start:start + PREDICT_CHUNK_ROWS])
+        return _to_proba(margins)
+
+    def _margin(self, X: np.ndarray) -> np.ndarray:
+        rows = np.arange(X.shape[0])[:, None]
+        idx = np.broadcast_to(self.roots, (X.shape[0], self.roots.shape[0])).copy()
+        for _ in range(self.max_depth):
+            x = X[rows, self.feature[idx]]
+            go_left = np.where(np.isnan(x), self.default_left[idx], x < self.threshold[idx])
+            idx = np.where(go_left, self.left[idx], self.right[idx])
+        return self.base_margin + self.value[idx].sum(axis=1, dtype=np.float32)
+
+
+class CompactLinearModel:
+    """Binary logistic regression evaluated from float32 coefficients."""
+
+    def __init__(self, header: dict, arrays: dict):
+        self.header = header
+        self.feature_names = header["feature_names"]
+        self.coef = arrays["coef"]
+        self.intercept = arrays["intercept"][0]
+
+    def predict_proba(self, X) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float32)
+        return _to_proba(X @ self.coef + self.intercept)
+
+
+def load_compact_model(path: str, verify: bool = True):
+    """
+    Load a compact inference artifact written by `ml.artifact.export_compact_model`.
+
+    params:
+        path: Path to the .npz artifact.
+        verify: Recompute and check the embedded checksum if True.
+
+    Returns: CompactTreeModel or CompactLinearModel exposing `predict_proba`.
+    """
+    with np.load(path, allow_pickle=False) as data:
+        header = json.loads(data[HEADER_KEY].tobytes().decode("utf-8"))
+        if header.get("format") != ARTIFACT_FORMAT:
+            raise ValueError(f"Not a compact model artifact: {path}")
+        kind = header["kind"]
+        names = TREE_ARRAYS if kind == "xgboost" else LINEAR_ARRAYS
+        arrays = {name: data[name] for name in names}
+
+    if verify and compute_checksum(header, arrays) != header["checksum"]:
+        raise ValueError(f"Checksum mismatch for model artifact: {path}")
+
+    if kind == "xgboost":
+        return CompactTreeModel(header, arrays)
+    if kind == "logreg":
+        return CompactLinearModel(header, arrays)
+    raise ValueError(f"Unsupported artifact kind: {kind}")
+
+
+def _to_proba(margins: np.ndarray) -> np.ndarray:
+    pos = 1.0 / (1.0 + np.exp(-margins.astype(np.float64)))
+    return np.column_stack([1.0 - pos, pos])
@@ -0,0 +1,235 @@
+"""
+Registry of servable model versions with on-demand loading.
+
+`ModelRegistry` discovers model artifacts in a directory (joblib models and compact
+`.npz` artifacts, see `ml.artifact`) and describes each with its file metadata, the
+header of compact artifacts, and an optional `<name>.meta.json` sidecar written at
+training time. A model is loaded the first time it is requested, by name (the file
+name without extension), and kept resident in an LRU bounded by estimated memory:
+loading a model evicts the least recently used ones until the total fits the budget.
+Concurrent requests for a model that is being loaded wait for that one load.
+
+The memory of a model is estimated from its file: compact artifacts load to their
+array size, joblib models to about `JOBLIB_MEMORY_FACTOR` times their file size.
+"""
+
+import json
+import logging
+import numpy as np
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from ml.artifact import ARTIFACT_EXTENSION, ARTIFACT_FORMAT, HEADER_KEY
+from ml.model import ReadmissionModel
+from typing import Callable, Dict, List, Optional
+
+_logger = logging.getLogger(__name__)
+
+# Constants
+MODEL_EXTENSIONS = (".joblib", ARTIFACT_EXTENSION)
+METADATA_SUFFIX = ".meta.json"
+JOBLIB_MEMORY_FACTOR = 1.5  # resident / file size measured for the XGBoost models
+DEFAULT_MAX_BYTES = 512 * 2**20
+
+
+class ModelRegistry:
+    def __init__(
+        self,
+        model_dir: str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        listener: Optional[Callable[[str, str, float], None]] = None,
+        loader: Callable[[str], object] = ReadmissionModel,
+    ):
+        """
+        params:
+            model_dir: Directory holding the model artifacts.
+            max_bytes: Estimated memory the resident models may use together. The most
+                recently loaded model is kept even if it alone exceeds the budget.
+            listener: Called as listener(event, name, value) on "load" (seconds),
+                "load_error" (seconds) and "evict" (estimated bytes), e.g. to record metrics.
+            loader: Loads a model from a path (ReadmissionModel by default).
+        """
+        self.model_dir = model_dir
+        self.max_bytes = max_bytes
+        self._listener = listener
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._artifacts: Dict[str, dict] = {}
+        self._resident: "OrderedDict[str, object]" = OrderedDict()
+        # Estimated bytes of each resident model, as counted when it was loaded
+        self._resident_sizes: Dict[str, int] = {}
+        self._loading: Dict[str, Future] = {}
+        self._resident_bytes = 0
+        self._stats = {"hits": 0, "misses": 0, "loads": 0, "load_errors": 0, "evictions": 0}
+        self.discover()
+
+    def discover(self) -> List[str]:
+        """
+        (Re)scan the model directory. Resident models stay loaded; a model whose file
+        was removed can no longer be requested.
+
+        Returns: Names of the discovered models.
+        """
+        artifacts = {}
+        for filename in sorted(os.listdir(self.model_dir)):
+            name, extension = os.path.splitext(filename)
+            if extension not in MODEL_EXTENSIONS:
+                continue
+            if name in artifacts:
+                _logger.warning(f"Ignoring {filename}: another artifact is already named {name}")
+                continue
+            artifacts[name] = describe_artifact(os.path.join(self.model_dir, filename))
+        with self._lock:
+            self._artifacts = artifacts
+        _logger.info(f"Discovered {len(artifacts)} models in {self.model_dir}")
+        return list(artifacts)
+
+    def get(self, name: str):
+        """
+        Return a model, loading it (once, however many callers ask) if not resident.
+
+        params:
+            name: Model name (artifact file name without extension).
+
+        Returns: The loaded model (ReadmissionModel by default).
+        """
+        with self._lock:
+            model = self._resident.get(name)
+            if model is not None:
+                self._resident.move_to_end(name)
+                self._stats["hits"] += 1
+                return model
+            if name not in self._artifacts:
+                raise KeyError(f"Unknown model '{name}'; available: {sorted(self._artifacts)}")
+            self._stats["misses"] += 1
+            future = self._loading.get(name)
+            owner = future is None
+            if owner:
+                future = self._loading[name] = Future()
+                artifact = self._artifacts[name]
+        if not owner:
+            return future.result()
+
+        started = time.perf_counter()
+        try:
+            model = self._loader(artifact["path"])
+        except Exception as e:
+            with self._lock:
+                self._stats["load_errors"] += 1
+                del self._loading[name]
+            _logger.error(f"Failed to load model {name}: {e}")
+            self._notify("load_error", name, time.perf_counter() - started)
+            future.set_exception(e)
+            raise
+        seconds = time.perf_counter() - started
+        with self._lock:
+            self._resident[name] = model
+            self._resident_sizes[name] = artifact["memory_bytes"]
+            self._resident_bytes += artifact["memory_bytes"]
+            self._stats["loads"] += 1
+            evicted = self._evict_over_budget()
+            del self._loading[name]
+        _logger.info(f"Loaded model {name} in {seconds:.3f}s")
+        self._notify("load", name, seconds)
+        for evicted_name, size in evicted:
+            _logger.info(f"Evicted model {evicted_name} ({size} bytes estimated)")
+            self._notify("evict", evicted_name, size)
+        future.set_result(model)
+        return model
+
+    def resident(self, name: str):
+        """Return a model if it is loaded (marking it recently used), else None."""
+        with self._lock:
+            model = self._resident.get(name)
+            if model is not None:
+                self._resident.move_to_end(name)
+                self._stats["hits"] += 1
+            return model
+
+    def evict(self, name: str) -> bool:
+        """Drop a resident model. Returns False if it was not loaded."""
+        with self._lock:
+            if name not in self._resident:
+                return False
+            del self._resident[name]
+            size = self._resident_sizes.pop(name)
+            self._resident_bytes -= size
+            self._stats["evictions"] += 1
+        self._notify("evict", name, size)
+        return True
+
+    def models(self) -> List[dict]:
+        """Metadata of every discovered model, with whether it is resident."""
+        with self._lock:
+            return [
+                {"name": name, "resident": name in self._resident, **artifact}
+                for name, artifact in self._artifacts.items()
+            ]
+
+    def stats(self) -> dict:
+        """Cache counters, resident models (least recently used first) and their estimated bytes."""
+        with self._lock:
+            return {
+                **self._stats,
+                "resident": list(self._resident),
+                "resident_bytes": self._resident_bytes,
+                "max_bytes": self.max_bytes,
+                "loading": list(self._loading),
+            }
+
+    def _evict_over_budget(self) -> list:
+        # Called with the lock held; the model loaded last is the most recently used
+        evicted = []
+        while self._resident_bytes > self.max_bytes and len(self._resident) > 1:
+            name, _ = self._resident.popitem(last=False)
+            size = self._resident_sizes.pop(name)
+            self._resident_bytes -= size
+            self._stats["evictions"] += 1
+            evicted.append((name, size))
+        return evicted
+
+    def _notify(self, event: str, name: str, value: float) -> None:
+        if self._listener is not None:
+            try:
+                self._listener(event, name, value)
+            except Exception as e:
+                _logger.warning(f"Model registry listener failed on {event} of {name}: {e}")
+
+
+def describe_artifact(path: str) -> dict:
+    """
+    Metadata of a model artifact, read without loading the model.
+
+    Returns: Dictionary with path, format, file and estimated memory bytes,
+        modification time, and for compact artifacts the model kind and feature
+        names, merged with the `<name>.meta.json` sidecar if present.
+    """
+    stat = os.stat(path)
+    compact = path.endswith(ARTIFACT_EXTENSION)
+    info = {
+        "path": path,
+        "format": "compact" if compact else "joblib",
+        "file_bytes": stat.st_size,
+        "memory_bytes": int(stat.st_size * (1 if compact else JOBLIB_MEMORY_FACTOR)),
+        "modified": stat.st_mtime,
+    }
+    if compact:
+        with np.load(path, allow_pickle=False) as data:
+            header = json.loads(data[HEADER_KEY].tobytes().decode("utf-8"))
+        if header.get("format") == ARTIFACT_FORMAT:
+            info.update({"kind": header["kind"], "feature_names": header["feature_names"]})
+    sidecar = os.path.splitext(path)[0] + METADATA_SUFFIX
+    if os.path.exists(sidecar):
+        with open(sidecar) as f:
+            info["metadata"] = json.load(f)
+    return info
+
+
+def save_metadata(model_path: str, metadata: dict) -> str:
+    """Write the `<name>.meta.json` sidecar the registry reports for a model."""
+    path = os.path.splitext(model_path)[0] + METADATA_SUFFIX
+    with open(path, "w") as f:
+        json.dump(metadata, f, indent=2, sort_keys=True)
+    return path
@@ -0,0 +1,80 @@
+"""
+Multi-process bulk scoring of Arrow record batches.
+
+Each worker process loads the model once at start-up and scores whole batches,
+so the model is never re-loaded or pickled per batch.
+"""
+
+import logging
+import multiprocessing
+import numpy as np
+import pyarrow as pa
+from collections import deque
+from ml.model import ReadmissionModel
+from typing import Iterable, Iterator, List, Tuple
+
+_logger = logging.getLogger(__name__)
+
+# Constants
+KEY_COLUMN = "encounter_key"
+MAX_PENDING_PER_WORKER = 2
+
+# Per-process model, set by _init_worker
+_worker_model = None
+
+
+def batch_to_matrix(batch: pa.RecordBatch, features: List[str]) -> np.ndarray:
+    """Convert the feature columns of an Arrow batch into a float32 matrix (rows x features)."""
+    X = np.empty((batch.num_rows, len(features)), dtype=np.float32)
+    for i, name in enumerate(features):
+        X[:, i] = batch.column(name).to_numpy(zero_copy_only=False)
+    return X
+
+
+def score_batches(
+    batches: Iterable[pa.RecordBatch],
+    model_path: str,
+    features: List[str],
+    workers: int = 1,
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Score record batches with a pool of worker processes.
+
+    params:
+        batches: Arrow batches containing `encounter_key` and the feature columns.
+        model_path: Path to the model each worker loads once.
+        features: Feature columns in model order.
+        workers: Number of worker processes (1 scores in-process).
+
+    Returns: Iterator of (encounter_keys, probabilities) in input batch order.
+    """
+    if workers <= 1:
+        _init_worker(model_path)
+        for batch in batches:
+            yield _score_batch((batch, features))
+        return
+
+    # spawn avoids forking a process that holds DuckDB threads and locks
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(workers, initializer=_init_worker, initargs=(model_path,)) as pool:
+        # A bounded window of in-flight batches keeps memory flat, and yielding
+        # in submission order keeps inserts in key order, which makes resuming safe
+        pending = deque()
+        for batch in batches:
+            pending.append(pool.apply_async(_score_batch, ((batch, features),)))
+            if len(pending) >= MAX_PENDING_PER_WORKER * workers:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+
+
+def _init_worker(model_path: str) -> None:
+    global _worker_model
+    _worker_model = ReadmissionModel(model_path)
+
+
+def _score_batch(task: Tuple[pa.RecordBatch, List[str]]) -> Tuple[np.ndarray, np.ndarray]:
+    batch, features = task
+    keys = batch.column(KEY_COLUMN).to_numpy(zero_copy_only=False)
+    probs = _worker_model.predict_batch(batch_to_matrix(batch, features))
+    return keys, probs.astype(np.float32)
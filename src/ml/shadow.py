@@ -0,0 +1,153 @@
+"""
+Asynchronous shadow scoring of a candidate model against live traffic.
+
+The primary request path only enqueues the encoded feature vector and the primary
+probability with a non-blocking put. A background thread drains the bounded queue,
+scores batches with the candidate model, and records score deltas. When the queue is
+full, shadow work is dropped instead of slowing the primary path.
+"""
+
+import logging
+import math
+import numpy as np
+import queue
+import threading
+import time
+from collections import deque
+from typing import List, Optional
+
+_logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_MAX_QUEUE = 1024
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_FLUSH_INTERVAL = 0.05
+DEFAULT_MAX_RECENT = 1000
+
+
+class ShadowScorer:
+    def __init__(
+        self,
+        candidate,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_recent: int = DEFAULT_MAX_RECENT,
+    ):
+        """
+        params:
+            candidate: Candidate model exposing `predict_batch(X)` (e.g. ReadmissionModel).
+            max_queue: Maximum number of pending vectors; extra submissions are dropped.
+            batch_size: Maximum number of vectors scored per candidate call.
+            flush_interval: Seconds the worker waits to fill a batch before scoring it.
+            max_recent: Number of recent (primary, shadow) score pairs kept for inspection.
+        """
+        self.candidate = candidate
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._recent = deque(maxlen=max_recent)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._submitted = 0
+        self._dropped = 0
+        self._scored = 0
+        self._errors = 0
+        self._sum_delta = 0.0
+        self._sum_sq_delta = 0.0
+        self._max_abs_delta = 0.0
+
+    def start(self) -> "ShadowScorer":
+        """Start the background scoring thread."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="shadow-scorer", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """Stop the background thread after it scores what is already queued."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, features: List[float], primary_prob: float) -> bool:
+        """
+        Enqueue a feature vector for shadow scoring without blocking.
+
+        params:
+            features: Encoded feature vector sent to the primary model.
+            primary_prob: Probability returned by the primary model.
+
+        Returns: True if queued, False if dropped because the queue was full.
+        """
+        try:
+            self._queue.put_nowait((features, primary_prob))
+            queued = True
+        except queue.Full:
+            queued = False
+        with self._lock:
+            if queued:
+                self._submitted += 1
+            else:
+                self._dropped += 1
+        return queued
+
+    def stats(self) -> dict:
+        """Summary of shadow activity and candidate-minus-primary score deltas."""
+        with self._lock:
+            scored = self._scored
+            mean = self._sum_delta / scored if scored else 0.0
+            rmse = math.sqrt(self._sum_sq_delta / scored) if scored else 0.0
+            return {
+                "submitted": self._submitted,
+                "dropped": self._dropped,
+                "scored": scored,
+                "errors": self._errors,
+                "pending": self._queue.qsize(),
+                "mean_delta": mean,
+                "rmse_delta": rmse,
+                "max_abs_delta": self._max_abs_delta,
+                "recent": [list(pair) for pair in self._recent],
+            }
+
+    def _run(self) -> None:
+        while not (self._stop.is_set() and self._queue.empty()):
+            batch = self._next_batch()
+            if batch:
+                self._score(batch)
+
+    def _next_batch(self) -> list:
+        # Wait up to flush_interval to fill a batch so the candidate is called rarely
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _score(self, batch: list) -> None:
+        X = np.array([features for features, _ in batch], dtype=np.float32)
+        primary = np.array([prob for _, prob in batch], dtype=np.float64)
+        try:
+            shadow = np.asarray(self.candidate.predict_batch(X), dtype=np.float64)
+        except Exception as e:
+            _logger.warning(f"Shadow scoring failed for batch of {len(batch)}: {e}")
+            with self._lock:
+                self._errors += len(batch)
+            return
+
+        delta = shadow - primary
+        with self._lock:
+            self._scored += len(batch)
+            self._sum_delta += float(delta.sum())
+            self._sum_sq_delta += float(np.square(delta).sum())
+            self._max_abs_delta = max(self._max_abs_delta, float(np.abs(delta).max()))
+            self._recent.extend(zip(primary.tolist(), shadow.tolist()))
@@ -5,14 +5,14 @@ including hyperparameter tuning and evaluation using AUC.
 """
 
 import logging
+import time
 import xgboost as xgb
 from sklearn.linear_model import LogisticRegression
-from sklearn.model_selection import GridSearchCV
+from sklearn.model_selection import GridSearchCV, ParameterGrid
 from sklearn.metrics import make_scorer, roc_auc_score
-from typing import Tuple, Union
+from typing import Optional, Tuple, Union
 
 # Configure module-level _logger
-logging.basicConfig(level=logging.INFO)
 _logger = logging.getLogger(__name__)
 
 
@@ -60,6 +60,107 @@ def train_xgboost(X_train, y_train, X_test, y_test) -> Tuple[xgb.XGBClassifier,
     return _train_model(model, param_grid, X_train, y_train, X_test, y_test, "XGBoost")
 
 
+def train_xgboost_early_stopping(
+    X_train,
+    y_train,
+    X_test,
+    y_test,
+    validation_fraction: float = 0.2,
+    time_budget: Optional[float] = None,
+    early_stopping_rounds: int = 20,
+    max_rounds: int = 1000,
+    eval_metric: str = "auc",
+) -> Tuple[xgb.XGBClassifier, float]:
+    """
+    Train an XGBoost model with early stopping on a temporal validation split.
+
+    The most recent `validation_fraction` of the training rows is held out for
+    validation, so X_train must be ordered by encounter_start (as returned by
+    `ml.data.load_training_data`). Each candidate boosts until the validation
+    metric stops improving. If `time_budget` runs out, the candidate in progress
+    stops at its best round so far and the remaining candidates are skipped.
+
+    params:
+        X_train: Training feature set, ordered by time
+        y_train: Training labels
+        X_test: Test feature set
+        y_test: Test labels
+        validation_fraction: Fraction of the latest training rows used for validation.
+        time_budget: Overall wall-clock limit in seconds for the search (None = unlimited).
+        early_stopping_rounds: Rounds without validation improvement before stopping.
+        max_rounds: Upper bound on boosting rounds per candidate.
+        eval_metric: Validation metric used for early stopping ("auc" or "logloss").
+
+    Returns: Tuple of trained model and test AUC score.
+    """
+    param_grid = {
+        "max_depth": [3, 6],
+        "learning_rate": [0.01, 0.1],
+        "subsample": [0.8, 1.0],
+    }
+    split = int(len(X_train) * (1 - validation_fraction))
+    if not 0 < split < len(X_train):
+        raise ValueError(
+            f"validation_fraction {validation_fraction} leaves no fit or validation rows of {len(X_train)}"
+        )
+    X_fit, X_val = _split_rows(X_train, split)
+    y_fit, y_val = _split_rows(y_train, split)
+
+    start = time.monotonic()
+    deadline = None if time_budget is None else start + time_budget
+    best_model, best_auc, best_params = None, -1.0, None
+
+    for params in ParameterGrid(param_grid):
+        if deadline is not None and time.monotonic() >= deadline and best_model is not None:
+            _logger.info(f"Time budget of {time_budget}s exhausted; skipping remaining candidates")
+            break
+
+        candidate_start = time.monotonic()
+        model = xgb.XGBClassifier(
+            n_estimators=max_rounds,
+            early_stopping_rounds=early_stopping_rounds,
+            eval_metric=eval_metric,
+            callbacks=[_TimeBudget(deadline)] if deadline is not None else None,
+            **params,
+        )
+        model.fit(X_fit, y_fit, eval_set=[(X_val, y_val)], verbose=False)
+        val_auc = roc_auc_score(y_val, model.predict_proba(X_val)[:, 1])
+        _logger.info(
+            f"XGBoost candidate {params}: best round {_best_round(model)} of "
+            f"{model.get_booster().num_boosted_rounds()} trained, validation AUC {val_auc:.4f}, "
+            f"{time.monotonic() - candidate_start:.2f}s"
+        )
+        if val_auc > best_auc:
+            best_model, best_auc, best_params = model, val_auc, params
+
+    _logger.info(
+        f"Best XGBoost (early stopping) params: {best_params}, "
+        f"search took {time.monotonic() - start:.2f}s"
+    )
+    preds = best_model.predict_proba(X_test)[:, 1]
+    auc = roc_auc_score(y_test, preds)
+    _logger.info(f"XGBoost (early stopping) Test AUC: {auc:.4f}")
+    return best_model, auc
+
+
+def _best_round(model: xgb.XGBClassifier) -> int:
+    """Best boosting round, or all rounds if the time budget stopped training first."""
+    if hasattr(model, "best_iteration"):
+        return model.best_iteration + 1
+    return model.get_booster().num_boosted_rounds()
+
+
+class _TimeBudget(xgb.callback.TrainingCallback):
+    """Stop boosting once a wall-clock deadline (time.monotonic) has passed."""
+
+    def __init__(self, deadline: float):
+        super().__init__()
+        self.deadline = deadline
+
+    def after_iteration(self, model, epoch, evals_log) -> bool:
+        return time.monotonic() >= self.deadline
+
+
 def _train_model(
     model,
     param_grid: dict,
@@ -83,4 +184,10 @@ def _train_model(
     auc = roc_auc_score(y_test, preds)
     _logger.info(f"{model_name} Test AUC: {auc:.4f}")
 
-    return best_model, auc
\ No newline at end of file
+    return best_model, auc
+
+
+def _split_rows(data, split: int):
+    """First `split` rows and the rest, by position (pandas objects may have any index)."""
+    rows = data.iloc if hasattr(data, "iloc") else data
+    return rows[:split], rows[split:]
@@ -3,7 +3,6 @@ import os
 from joblib import dump
 
 # Configure module-level _logger
-logging.basicConfig(level=logging.INFO)
 _logger = logging.getLogger(__name__)
 
 
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+from api import endpoint
+from api.bundle import export_bundle, read_bundle
+from ml.artifact import export_compact_model
+from ml.model import ReadmissionModel
+from sklearn.linear_model import LogisticRegression
+
+MAPPINGS = {
+    "gender_key": {"m": 1, "f": 2},
+    "race_key": {"white": 1, "black": 2},
+    "ethnicity_key": {"hispanic": 1, "nonhispanic": 2},
+}
+
+
+@pytest.fixture
+def api_model():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(200, len(endpoint.FEATURES))), columns=endpoint.FEATURES)
+    y = (X["age"] > 0).astype(int)
+    return LogisticRegression().fit(X, y)
+
+
+@pytest.fixture
+def serving_globals(monkeypatch):
+    # load_serving_state replaces these module globals; restore them after the test
+    for name in ("model", "DEFAULTS", "GENDER_MAP", "RACE_MAP", "ETHNICITY_MAP"):
+        monkeypatch.setattr(endpoint, name, getattr(endpoint, name))
+
+
+def test_bundle_round_trip(api_model, tmp_path):
+    path = str(tmp_path / "bundle.npz")
+    export_bundle(api_model, path, endpoint.FEATURES, endpoint.DEFAULTS, MAPPINGS, source="test")
+
+    bundle = read_bundle(ReadmissionModel(path))
+
+    assert bundle["features"] == endpoint.FEATURES
+    assert bundle["mappings"] == MAPPINGS
+    assert bundle["source"] == "test"
+
+
+def test_export_requires_all_mappings(api_model, tmp_path):
+    with pytest.raises(ValueError, match="ethnicity_key"):
+        export_bundle(
+            api_model, str(tmp_path / "bundle.npz"), endpoint.FEATURES, endpoint.DEFAULTS,
+            {k: v for k, v in MAPPINGS.items() if k != "ethnicity_key"},
+        )
+
+
+def test_read_bundle_rejects_plain_artifact(api_model, tmp_path):
+    path = str(tmp_path / "model.npz")
+    export_compact_model(api_model, path)
+
+    with pytest.raises(ValueError, match="not a serving bundle"):
+        read_bundle(ReadmissionModel(path))
+
+
+def test_load_serving_state_from_bundle_skips_database(api_model, tmp_path, serving_globals):
+    path = str(tmp_path / "bundle.npz")
+    export_bundle(api_model, path, endpoint.FEATURES, endpoint.DEFAULTS, MAPPINGS)
+
+    # A config pointing at a missing file proves the database is never opened
+    endpoint.load_serving_state(tmp_path / "missing.yaml", bundle_path=path)
+
+    assert endpoint.GENDER_MAP == MAPPINGS["gender_key"]
+    assert endpoint.ETHNICITY_MAP == MAPPINGS["ethnicity_key"]
+    features = pd.DataFrame([np.ones(len(endpoint.FEATURES))], columns=endpoint.FEATURES)
+    assert endpoint.model.predict(list(features.iloc[0])) == pytest.approx(
+        api_model.predict_proba(features)[0, 1], abs=1e-5
+    )
+
+
+def test_load_serving_state_rejects_feature_order_mismatch(api_model, tmp_path, serving_globals):
+    path = str(tmp_path / "bundle.npz")
+    reordered = endpoint.FEATURES[1:] + endpoint.FEATURES[:1]
+    export_bundle(api_model, path, reordered, endpoint.DEFAULTS, MAPPINGS)
+
+    with pytest.raises(ValueError, match="feature order"):
+        endpoint.load_serving_state(bundle_path=path)
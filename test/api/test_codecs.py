@@ -0,0 +1,104 @@
+import json
+import numpy as np
+import pyarrow as pa
+import pytest
+from api.codecs import (
+    ARROW,
+    JSON,
+    MSGPACK,
+    PACKED,
+    BatchDecodeError,
+    FastJSONResponse,
+    accepted_type,
+    decode_batch,
+    decode_dense,
+    encode_predictions,
+)
+
+FEATURES = ["age", "gender_key", "has_diabetes", "num_meds"]
+MAPS = {"gender_key": {"m": 1, "f": 2}}
+DEFAULTS = {"age": 0, "gender_key": 0, "has_diabetes": False, "num_meds": 0}
+COLUMNS = {"age": [70, None, 45], "gender": ["F", None, "m"], "has_diabetes": [True, None, False]}
+EXPECTED = [[70, 2, 1, 0], [0, 0, 0, 0], [45, 1, 0, 0]]
+
+
+def _arrow(columns):
+    table = pa.table(columns)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def test_formats_decode_to_the_same_matrix():
+    msgpack = pytest.importorskip("msgpack")
+    bodies = {
+        JSON: json.dumps(COLUMNS).encode(),
+        ARROW: _arrow(COLUMNS),
+        MSGPACK: msgpack.packb(COLUMNS),
+    }
+    for content_type, body in bodies.items():
+        X = decode_batch(body, content_type, FEATURES, MAPS, DEFAULTS)
+        assert X.dtype == np.float32
+        assert X.tolist() == EXPECTED, content_type
+
+
+@pytest.mark.parametrize(
+    "columns",
+    [{"age": [70, 70.5]}, {"has_diabetes": [1, 2]}, {"has_diabetes": [0.5, None]}],
+)
+def test_decode_batch_rejects_values_predict_rejects(columns):
+    # The same values fail PatientFeatures validation on /predict
+    for body, content_type in ((json.dumps(columns).encode(), JSON), (_arrow(columns), ARROW)):
+        with pytest.raises(BatchDecodeError, match="must contain only") as e:
+            decode_batch(body, content_type, FEATURES, MAPS, DEFAULTS)
+        assert e.value.status_code == 422
+    # JSON has no infinity, Arrow does
+    with pytest.raises(BatchDecodeError, match="must contain only"):
+        decode_batch(_arrow({"num_meds": [float("inf")]}), ARROW, FEATURES, MAPS, DEFAULTS)
+
+
+@pytest.mark.parametrize("gender", [[1, 2], ["f", True], [None, 2.5]])
+def test_decode_batch_rejects_non_string_categories(gender):
+    # /predict rejects gender=1 with 422 as well
+    with pytest.raises(BatchDecodeError, match="strings or nulls") as e:
+        decode_batch(json.dumps({"gender": gender}).encode(), JSON, FEATURES, MAPS, DEFAULTS)
+    assert e.value.status_code == 422
+    # Arrow columns have one type, so only a non-string typed column can carry them
+    if all(isinstance(value, (int, type(None))) for value in gender):
+        with pytest.raises(BatchDecodeError, match="strings or nulls"):
+            decode_batch(_arrow({"gender": gender}), ARROW, FEATURES, MAPS, DEFAULTS)
+
+
+def test_accept_negotiation_and_encoding():
+    assert accepted_type(None) == JSON
+    assert accepted_type("text/html, application/vnd.apache.arrow.stream;q=0.9") == ARROW
+    response = encode_predictions(np.array([0.5, 0.25]), JSON)
+    assert json.loads(response.body) == {"readmission_probability": [0.5, 0.25]}
+    assert FastJSONResponse({"p": np.float32(0.5)}).body == b'{"p":0.5}'
+
+
+def test_decode_dense_json_and_packed_rows():
+    rows = np.array([[70, 2, 1, 0], [45, 1, 0, 3]], dtype=np.float32)
+
+    np.testing.assert_array_equal(decode_dense(json.dumps(rows.tolist()).encode(), JSON, 4), rows)
+    np.testing.assert_array_equal(decode_dense(rows.astype("<f4").tobytes(), PACKED, 4), rows)
+    np.testing.assert_array_equal(decode_dense(b"[70, 2, 1, 0]", None, 4), rows[:1])
+
+
+@pytest.mark.parametrize(
+    "body, content_type, status",
+    [
+        (b"[1, 2, 3]", JSON, 422),
+        (b"[1, 2, 3, NaN]", JSON, 400),
+        (b'[1, 2, 3, "x"]', JSON, 422),
+        (b"[[1, 2, 3, 4], [1, 2]]", JSON, 422),
+        (np.array([1, 2, 3, np.inf], dtype="<f4").tobytes(), PACKED, 422),
+        (b"\x00" * 12, PACKED, 422),
+        (b"1,2,3,4", "text/csv", 415),
+    ],
+)
+def test_decode_dense_rejects_bad_rows(body, content_type, status):
+    with pytest.raises(BatchDecodeError) as e:
+        decode_dense(body, content_type, 4)
+    assert e.value.status_code == status
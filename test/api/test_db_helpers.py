@@ -1,4 +1,6 @@
-from api.db_helpers import load_dimension_mapping  # Adjust this import
+import asyncio
+from api.db_helpers import load_dimension_mapping, load_dimension_mappings  # Adjust this import
+from db.async_connection import AsyncDBConnection
 
 
 def test_load_dimension_mapping(db, setup_dimension_table):
@@ -18,3 +20,21 @@ def test_load_dimension_mapping(db, setup_dimension_table):
         "gamma": 3,
     }
     assert result == expected
+
+
+def test_load_dimension_mappings_async(tmp_path):
+    async def main():
+        async with AsyncDBConnection(str(tmp_path / "dims.duckdb")) as conn:
+            await conn.execute("CREATE SCHEMA clinical")
+            await conn.execute("CREATE TABLE clinical.gender_dim (gender_key INTEGER, description TEXT)")
+            await conn.execute("INSERT INTO clinical.gender_dim VALUES (1, 'Female'), (2, 'Male')")
+            await conn.execute("CREATE TABLE clinical.race_dim (race_key INTEGER, description TEXT)")
+            await conn.execute("INSERT INTO clinical.race_dim VALUES (7, 'Asian')")
+            return await load_dimension_mappings(
+                conn, {"gender_key": ("gender_dim", "gender_key"), "race_key": ("race_dim", "race_key")}
+            )
+
+    mappings = asyncio.run(main())
+
+    assert mappings == {"gender_key": {"female": 1, "male": 2}, "race_key": {"asian": 7}}
+    assert all(type(key) is int for key in mappings["gender_key"].values())
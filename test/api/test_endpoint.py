@@ -1,7 +1,12 @@
+import asyncio
+import numpy as np
+import pyarrow as pa
+import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from api.endpoint import router
-from unittest.mock import patch
+from api.codecs import ARROW
+from api.endpoint import FEATURES, router
+from unittest.mock import MagicMock, patch
 
 
 app = FastAPI()
@@ -101,3 +106,322 @@ def test_build_feature_vector_defaults():
     # Check defaults applied for keys
     assert vector[0] == DEFAULTS["age"]
     assert vector[1] == DEFAULTS["gender_key"]  # Because GENDER_MAP is empty
+
+
+def test_shadow_stats_disabled():
+    response = client.get("/shadow")
+    assert response.status_code == 200
+    assert response.json() == {"enabled": False}
+
+
+@patch("api.endpoint.model")
+def test_predict_submits_to_shadow(mock_model):
+    mock_model.predict.return_value = 0.4
+    mock_shadow = MagicMock()
+
+    with patch("api.endpoint.shadow", mock_shadow):
+        response = client.post("/predict", json={"age": 70})
+
+    assert response.status_code == 200
+    vector, prob = mock_shadow.submit.call_args[0]
+    assert vector[0] == 70
+    assert prob == 0.4
+
+
+@patch("api.endpoint.model")
+def test_drift_reports_scored_traffic(mock_model):
+    from api import endpoint
+    from ml.drift import build_reference
+    import pandas as pd
+
+    mock_model.predict.return_value = 0.3
+    reference = build_reference(pd.DataFrame([[60] + [0] * (len(FEATURES) - 1)] * 100, columns=FEATURES))
+    assert client.get("/drift").json() == {"enabled": False}
+
+    with patch("api.endpoint.load_reference", return_value=reference):
+        endpoint.enable_drift("reference.json", flush_interval=0.01)
+    try:
+        for _ in range(10):
+            client.post("/predict", json={"age": 90})
+        endpoint.drift.stop()
+        body = client.get("/drift").json()
+        metrics_text = client.get("/metrics").text
+    finally:
+        endpoint.disable_drift()
+
+    assert body["enabled"] is True
+    assert body["rows"] == 10
+    assert body["features"]["age"]["status"] == "drift"
+    assert body["features"]["num_meds"]["psi"] == 0.0
+    assert 'readmission_feature_drift_psi{feature="age"}' in metrics_text
+
+
+def test_drift_accepts_a_reference_built_from_training_data(tmp_path):
+    from api import endpoint
+    from bench.synthetic import generate_encounter_fact
+    from db.connection import DuckDBConnection
+    from ml.data import FEATURES as TRAINING_FEATURES, load_training_data
+    from ml.drift import build_reference, save_reference
+
+    with DuckDBConnection() as conn:
+        generate_encounter_fact(conn, 2000)
+        X_train, _, _, _ = load_training_data(conn, TRAINING_FEATURES)
+    path = str(tmp_path / "v1.drift.json")
+    save_reference(build_reference(X_train), path)
+
+    monitor = endpoint.enable_drift(path)
+    endpoint.disable_drift()
+
+    assert monitor.features == FEATURES
+    assert monitor.reference["features"]["age"]["kind"] == "histogram"
+
+
+def test_cohorts_answers_from_the_cube(tmp_path):
+    from bench.synthetic import generate_encounter_fact
+    from db.cohort_cube import build_cohort_cube
+    from db.connection import DuckDBConnection
+
+    database = str(tmp_path / "cohorts.duckdb")
+    with DuckDBConnection(database) as conn:
+        generate_encounter_fact(conn, 1000)
+        build_cohort_cube(conn)
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(f"db_type: duckdb\ndatabase: {database}\n")
+
+    from api import endpoint
+
+    assert client.get("/cohorts").status_code == 503
+    endpoint.open_database(config_path)
+    try:
+        by_gender = client.get("/cohorts", params={"group_by": "gender_key", "where": "has_diabetes=true"}).json()
+        by_year = client.get("/cohorts", params={"group_by": "start_year"}).json()
+        invalid = client.get("/cohorts", params={"group_by": "patient_key"})
+    finally:
+        asyncio.run(endpoint.close_database())
+
+    assert by_gender["source"] == "cube"
+    assert by_gender["filters"] == {"has_diabetes": True}
+    assert [row["gender_key"] for row in by_gender["cohorts"]] == [1, 2, 3]
+    first = by_gender["cohorts"][0]
+    assert first["readmission_rate"] == pytest.approx(first["readmissions"] / first["labeled"])
+    assert by_year["source"] == "base"
+    assert sum(row["encounters"] for row in by_year["cohorts"]) == 1000
+    assert invalid.status_code == 422
+
+
+@patch("api.endpoint.model")
+def test_metrics_exposes_stage_latency(mock_model):
+    mock_model.predict.return_value = 0.5
+    mock_model.version = "test-model"
+    client.post("/predict", json={"age": 60})
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'readmission_stage_duration_seconds_count{route="/predict",stage="model_predict"}' in body
+    assert 'readmission_http_requests_total{route="/predict",status="200"}' in body
+    assert 'readmission_model_info{version="test-model"} 1' in body
+
+
+def test_admin_profile_requires_token():
+    response = client.post("/admin/profile?seconds=1", headers={"X-Profile-Token": "guess"})
+    assert response.status_code == 403
+
+
+@pytest.mark.parametrize("seconds", ["0", "-5", "100000", "nan"])
+def test_admin_profile_rejects_out_of_range_durations(seconds):
+    with patch("api.endpoint.PROFILER") as profiler:
+        response = client.post(f"/admin/profile?seconds={seconds}", headers={"X-Profile-Token": "secret"})
+    assert response.status_code == 422
+    profiler.profile_process.assert_not_called()
+
+
+@patch("api.endpoint.GENDER_MAP", {"m": 1, "f": 2})
+@patch("api.endpoint.model")
+def test_predict_batch_json_columns(mock_model):
+    mock_model.predict_batch.side_effect = lambda X: X[:, 0] / 100
+    payload = {"age": [50, 80.0, None], "gender": ["M", "f", "x"], "has_diabetes": [True, False, None]}
+    response = client.post("/predict/batch", json=payload)
+
+    assert response.status_code == 200
+    assert response.json() == {"readmission_probability": pytest.approx([0.5, 0.8, 0.0])}
+    X = mock_model.predict_batch.call_args[0][0]
+    assert X.shape == (3, len(FEATURES))
+    assert X[:, FEATURES.index("gender_key")].tolist() == [1, 2, 0]
+    assert X[:, FEATURES.index("has_diabetes")].tolist() == [1, 0, 0]
+
+
+@patch("api.endpoint.model")
+def test_predict_batch_arrow_round_trip(mock_model):
+    mock_model.predict_batch.side_effect = lambda X: np.full(len(X), 0.25)
+    table = pa.table({"age": pa.array([60, None], pa.int32()), "num_meds": [3, 4]})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+
+    response = client.post(
+        "/predict/batch",
+        content=sink.getvalue().to_pybytes(),
+        headers={"Content-Type": ARROW, "Accept": ARROW},
+    )
+    assert response.status_code == 200
+    result = pa.ipc.open_stream(response.content).read_all()
+    assert result.column("readmission_probability").to_pylist() == [0.25, 0.25]
+    X = mock_model.predict_batch.call_args[0][0]
+    assert X[:, FEATURES.index("age")].tolist() == [60, 0]
+
+
+def test_predict_batch_rejects_bad_payloads():
+    assert client.post("/predict/batch", json={"age": [1, 2], "num_meds": [1]}).status_code == 422
+    assert client.post("/predict/batch", json={"agee": [1]}).status_code == 422
+    assert client.post("/predict/batch", json={"age": ["old"]}).status_code == 422
+    assert client.post("/predict/batch", content=b"{", headers={"Content-Type": "application/json"}).status_code == 400
+    assert client.post("/predict/batch", content=b"x", headers={"Content-Type": "text/csv"}).status_code == 415
+
+
+@patch("api.endpoint.INTERNAL_TOKEN", "secret")
+@patch("api.endpoint.model")
+def test_predict_fast_scores_dense_rows(mock_model):
+    mock_model.predict_batch.side_effect = lambda X: X[:, 0] / 100
+    row = [50.0] + [0.0] * (len(FEATURES) - 1)
+    headers = {"X-Internal-Token": "secret"}
+
+    response = client.post("/predict/fast", json=row, headers=headers)
+    assert response.status_code == 200
+    assert response.json() == {"readmission_probability": 0.5}
+
+    packed = np.array([row, row], dtype="<f4").tobytes()
+    response = client.post(
+        "/predict/fast", content=packed, headers={**headers, "Content-Type": "application/octet-stream"}
+    )
+    assert response.json() == {"readmission_probability": [0.5, 0.5]}
+    assert client.post("/predict/fast", json=row[:-1], headers=headers).status_code == 422
+
+
+@patch("api.endpoint.INTERNAL_TOKEN", "secret")
+def test_predict_fast_requires_internal_token():
+    row = [0.0] * len(FEATURES)
+    assert client.post("/predict/fast", json=row).status_code == 403
+    assert client.post("/predict/fast", json=row, headers={"X-Internal-Token": "wrong"}).status_code == 403
+    assert client.post("/predict/fast", json=row, headers={"X-Internal-Token": "sécret".encode()}).status_code == 403
+
+
+@patch("api.endpoint.INTERNAL_TOKEN", "secret")
+@patch("api.endpoint.model")
+def test_predict_fast_scores_large_batches_off_the_event_loop(mock_model):
+    import threading
+    from api.endpoint import FAST_INLINE_MAX_ROWS
+
+    threads = []
+    mock_model.predict_batch.side_effect = lambda X: threads.append(threading.current_thread()) or np.zeros(len(X))
+    headers = {"X-Internal-Token": "secret"}
+    small = [[0.0] * len(FEATURES)] * FAST_INLINE_MAX_ROWS
+    large = [[0.0] * len(FEATURES)] * (FAST_INLINE_MAX_ROWS + 1)
+
+    assert client.post("/predict/fast", json=small, headers=headers).status_code == 200
+    assert client.post("/predict/fast", json=large, headers=headers).status_code == 200
+
+    # The event loop runs in the portal thread; run_in_threadpool uses a separate worker
+    assert threads[0] is not threads[1]
+
+
+def test_predict_fast_disabled_without_token():
+    row = [0.0] * len(FEATURES)
+    assert client.post("/predict/fast", json=row, headers={"X-Internal-Token": ""}).status_code == 403
+
+
+@patch("api.endpoint.GENDER_MAP", {"m": 1, "f": 2})
+@patch("api.endpoint.model")
+def test_predict_whatif_curves_in_one_model_call(mock_model):
+    meds, gender = FEATURES.index("num_meds"), FEATURES.index("gender_key")
+    mock_model.predict_batch.side_effect = lambda X: X[:, meds] / 100 + X[:, gender] / 10
+
+    response = client.post("/predict/whatif", json={
+        "patient": {"num_meds": 5, "gender": "m"},
+        "sweeps": [
+            {"feature": "num_meds", "start": 5, "stop": 15, "step": 5},
+            {"feature": "gender", "values": ["f"]},
+        ],
+    })
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["baseline"] == pytest.approx(0.15)
+    meds_curve, gender_curve = body["curves"]
+    assert meds_curve["values"] == [5, 10, 15]
+    assert meds_curve["readmission_probability"] == pytest.approx([0.15, 0.2, 0.25])
+    # Only the swept feature changes; the rest stays at the patient's values
+    assert gender_curve["readmission_probability"] == pytest.approx([0.25])
+    assert body["rows"] == 5 and set(body["latency_ms"]) == {"build", "predict", "total"}
+    mock_model.predict_batch.assert_called_once()
+
+
+@patch("api.endpoint.model")
+def test_predict_whatif_crossed_grid(mock_model):
+    meds, diabetes = FEATURES.index("num_meds"), FEATURES.index("has_diabetes")
+    mock_model.predict_batch.side_effect = lambda X: X[:, meds] / 100 + X[:, diabetes] / 2
+
+    response = client.post("/predict/whatif", json={
+        "sweeps": [
+            {"feature": "has_diabetes", "values": [False, True]},
+            {"feature": "num_meds", "values": [0, 10, 20]},
+        ],
+        "cross": True,
+    })
+
+    assert response.status_code == 200
+    grid = response.json()["grid"]
+    assert grid["features"] == ["has_diabetes", "num_meds"]
+    np.testing.assert_allclose(grid["readmission_probability"], [[0.0, 0.1, 0.2], [0.5, 0.6, 0.7]], rtol=1e-6)
+
+
+@pytest.mark.parametrize("sweeps,cross,status", [
+    ([{"feature": "num_meds", "start": 0, "stop": 10_000_000}], False, 413),
+    ([{"feature": "num_meds", "start": 0, "stop": 999}, {"feature": "age", "start": 0, "stop": 99}], True, 413),
+    ([{"feature": "blood_type", "values": [1]}], False, 422),
+    ([{"feature": "gender", "values": ["zz"]}], False, 422),
+    ([{"feature": "age", "values": [1], "start": 0, "stop": 3}], False, 422),
+    ([{"feature": "age", "values": [1]}, {"feature": "age", "values": [2]}], False, 422),
+])
+@patch("api.endpoint.model")
+def test_predict_whatif_rejects_bad_sweeps(mock_model, sweeps, cross, status):
+    response = client.post("/predict/whatif", json={"sweeps": sweeps, "cross": cross})
+
+    assert response.status_code == status
+    mock_model.predict_batch.assert_not_called()
+
+
+@patch("api.endpoint.model")
+def test_predict_routes_to_registry_model(mock_model, tmp_path):
+    from api import endpoint
+    from joblib import dump
+    from sklearn.linear_model import LogisticRegression
+
+    mock_model.predict.return_value = 0.5
+    X = np.random.default_rng(0).random((100, len(FEATURES)))
+    dump(LogisticRegression().fit(X, (X[:, 0] > 0.5).astype(int)), tmp_path / "v2.joblib")
+    dump(LogisticRegression().fit(X[:, :3], (X[:, 0] > 0.5).astype(int)), tmp_path / "narrow.joblib")
+    assert client.post("/predict", json={"age": 70}, headers={"X-Model": "v2"}).status_code == 404
+
+    endpoint.enable_registry(str(tmp_path))
+    try:
+        routed = client.post("/predict", json={"age": 70}, headers={"X-Model": "v2"})
+        default = client.post("/predict", json={"age": 70})
+        unknown = client.post("/predict", json={"age": 70}, headers={"X-Model": "v9"})
+        batch = client.post("/predict/batch", json={"age": [70, 40]}, headers={"X-Model": "v2"})
+        narrow = client.post("/predict", json={"age": 70}, headers={"X-Model": "narrow"})
+        listing = client.get("/models").json()
+        metrics_text = client.get("/metrics").text
+    finally:
+        endpoint.disable_registry()
+
+    assert routed.status_code == 200
+    assert routed.json()["readmission_probability"] != 0.5
+    assert default.json()["readmission_probability"] == 0.5
+    assert unknown.status_code == 404
+    assert narrow.status_code == 503
+    assert len(batch.json()["readmission_probability"]) == 2
+    assert {m["name"]: m["resident"] for m in listing["models"]} == {"narrow": False, "v2": True}
+    assert listing["loads"] == 1 and listing["load_errors"] == 1
+    assert 'readmission_model_loads_total{model="v2"} 1.0' in metrics_text
@@ -0,0 +1,79 @@
+import io
+import json
+import logging
+import queue
+import pytest
+from api.log import (
+    DeferredQueueHandler,
+    JsonFormatter,
+    RouteSampler,
+    configure_logging,
+    log_request,
+    shutdown_logging,
+)
+
+
+class _CountingArg:
+    def __init__(self):
+        self.renders = 0
+
+    def __str__(self):
+        self.renders += 1
+        return "arg"
+
+
+@pytest.fixture
+def log_stream():
+    root = logging.getLogger()
+    level = root.level
+    stream = io.StringIO()
+    yield stream
+    shutdown_logging()
+    root.setLevel(level)
+
+
+def _records(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_json_formatter_includes_fields():
+    record = logging.LogRecord("api", logging.INFO, __file__, 1, "hello %s", ("world",), None)
+    record.fields = {"route": "/predict"}
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["msg"] == "hello world"
+    assert entry["route"] == "/predict"
+    assert entry["level"] == "INFO"
+
+
+def test_queue_handler_defers_formatting_and_drops_when_full():
+    handler = DeferredQueueHandler(queue.Queue(1))
+    arg = _CountingArg()
+    record = logging.LogRecord("api", logging.INFO, __file__, 1, "value %s", (arg,), None)
+    handler.handle(record)
+    handler.handle(record)
+    assert arg.renders == 0
+    assert handler.dropped == 1
+
+
+def test_route_sampler_rates():
+    sampler = RouteSampler.from_string("/predict=0, /healthz=1, *=0")
+    assert not sampler.keep("/predict")
+    assert sampler.keep("/healthz")
+    assert not sampler.keep("/other")
+    with pytest.raises(ValueError):
+        RouteSampler.from_string("0.5")
+
+
+def test_configured_logging_writes_json(log_stream):
+    configure_logging(level="INFO", log_format="json", sample_rates="/predict=0", stream=log_stream)
+    logging.getLogger("ml.model").debug("hidden %s", "debug")
+    logging.getLogger("ml.model").info("Loading model from %s", "model.joblib")
+    log_request("/predict", 200, 0.002)
+    log_request("/predict", 503, 0.004)
+    log_request("/healthz", 200, 0.001)
+    shutdown_logging()
+
+    records = _records(log_stream)
+    assert [r["msg"] for r in records] == ["Loading model from model.joblib", "request", "request"]
+    assert [(r["route"], r["status"]) for r in records[1:]] == [("/predict", 503), ("/healthz", 200)]
+    assert records[1]["duration_ms"] == 4.0
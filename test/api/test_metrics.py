@@ -0,0 +1,51 @@
+from api.metrics import STAGE_LATENCY, Counter, Histogram, InstrumentedRoute, MetricsRegistry, stage
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("test_seconds", "Test.", ["route"], buckets=(0.1, 1.0))
+    histogram.observe(0.05, ("/a",))
+    histogram.observe(0.5, ("/a",))
+    histogram.observe(5.0, ("/a",))
+
+    lines = histogram.render()
+    assert 'test_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{route="/a",le="1.0"} 2' in lines
+    assert 'test_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'test_seconds_count{route="/a"} 3' in lines
+
+
+def test_registry_renders_metrics_and_process_stats():
+    registry = MetricsRegistry()
+    counter = registry.register(Counter("test_total", "Test.", ["route"]))
+    counter.inc(("/a",))
+    counter.inc(("/a",))
+
+    text = registry.render()
+    assert "# TYPE test_total counter" in text
+    assert 'test_total{route="/a"} 2.0' in text
+    assert "process_resident_memory_bytes" in text
+    assert "process_cpu_seconds_total" in text
+
+
+def test_stage_is_noop_outside_request():
+    with stage("anything"):
+        pass
+
+
+def test_instrumented_route_records_stages():
+    router = APIRouter(route_class=InstrumentedRoute)
+
+    @router.get("/stages")
+    def stages():
+        with stage("work"):
+            pass
+        return {}
+
+    app = FastAPI()
+    app.include_router(router)
+    TestClient(app).get("/stages")
+
+    for name in ["validate", "work", "serialize"]:
+        assert STAGE_LATENCY.count(("/stages", name)) == 1
@@ -0,0 +1,72 @@
+import os
+import threading
+import time
+from api.metrics import InstrumentedRoute
+from api.profiling import PROFILE_HEADER, Profiler
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+
+def _busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        sum(range(1000))
+
+
+def test_profiler_disabled_by_default():
+    profiler = Profiler()
+    assert not profiler.enabled
+    assert profiler.start_request("anything", "/predict") is None
+
+
+def test_profiler_requires_matching_token():
+    profiler = Profiler(token="secret")
+    assert profiler.enabled
+    assert profiler.authorized("secret")
+    assert not profiler.authorized("wrong")
+    assert not profiler.authorized(None)
+
+
+def test_session_samples_only_tracked_threads(tmp_path):
+    profiler = Profiler(token="secret", output_dir=str(tmp_path), interval=0.001)
+    session = profiler.start_request("secret", "/busy")
+    _busy(0.05)
+    path = profiler.finish(session)
+
+    with open(path) as f:
+        lines = f.read().splitlines()
+    assert session.samples > 0
+    assert any("_busy" in line for line in lines)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+
+def test_process_profile_writes_file(tmp_path):
+    profiler = Profiler(token="secret", output_dir=str(tmp_path), interval=0.001)
+    path = profiler.profile_process(0.05)
+    _busy(0.1)
+    time.sleep(0.05)
+    assert os.path.exists(path)
+
+
+def test_instrumented_route_profiles_sync_endpoint(tmp_path):
+    profiler = Profiler(token="secret", output_dir=str(tmp_path), interval=0.001)
+    router = APIRouter(route_class=InstrumentedRoute)
+
+    @router.get("/busy")
+    def busy():
+        _busy(0.05)
+        return {"thread": threading.get_ident()}
+
+    app = FastAPI()
+    app.include_router(router)
+    with patch("api.metrics.PROFILER", profiler):
+        client = TestClient(app)
+        client.get("/busy")
+        assert os.listdir(tmp_path) == []
+        client.get("/busy", headers={PROFILE_HEADER: "secret"})
+
+    files = os.listdir(tmp_path)
+    assert len(files) == 1
+    with open(tmp_path / files[0]) as f:
+        assert "busy" in f.read()
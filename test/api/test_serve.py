@@ -0,0 +1,67 @@
+import httpx
+import os
+import pytest
+import signal
+import socket
+import subprocess
+import sys
+import textwrap
+import yaml
+from api.serve import DEFAULT_SERVING, PreforkServer, load_serving_config
+from bench.load import wait_until_healthy
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "src")
+
+SERVER_SCRIPT = textwrap.dedent(
+    """
+    import os, sys
+    from fastapi import FastAPI
+    from api.serve import PreforkServer
+
+    app = FastAPI()
+
+    @app.get("/healthz")
+    def health():
+        return {"pid": os.getpid()}
+
+    sys.exit(PreforkServer(app, host="127.0.0.1", port=int(sys.argv[1]), workers=2, log_level="warning").run())
+    """
+)
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_load_serving_config_defaults_and_overrides(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.safe_dump({"db_type": "duckdb", "serving": {"workers": 4}}))
+    settings = load_serving_config(str(path))
+    assert settings["workers"] == 4
+    assert settings["port"] == DEFAULT_SERVING["port"]
+
+    path.write_text(yaml.safe_dump({"serving": {"wrokers": 4}}))
+    with pytest.raises(ValueError):
+        load_serving_config(str(path))
+
+
+def test_prefork_server_requires_a_worker():
+    with pytest.raises(ValueError):
+        PreforkServer(app=None, workers=0)
+
+
+def test_prefork_workers_share_socket_and_stop_cleanly():
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}"
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([SRC_DIR, os.getenv("PYTHONPATH", "")])}
+    server = subprocess.Popen([sys.executable, "-c", SERVER_SCRIPT, str(port)], env=env)
+    try:
+        wait_until_healthy(url, server, timeout=30)
+        pids = {httpx.get(f"{url}/healthz", headers={"Connection": "close"}).json()["pid"] for _ in range(40)}
+        assert server.pid not in pids
+        assert 1 <= len(pids) <= 2
+    finally:
+        server.send_signal(signal.SIGTERM)
+        assert server.wait(timeout=30) == 0
@@ -0,0 +1,24 @@
+from bench.harness import compare_to_baseline, load_results, measure, save_results
+
+
+def test_measure_returns_time_and_result():
+    seconds, result = measure(lambda: sum(range(100)), repeats=3)
+    assert seconds >= 0.0
+    assert result == 4950
+
+
+def test_compare_to_baseline_flags_regressions():
+    baseline = {"fast@10k": 1.0, "slow@10k": 1.0, "new@10k": 0.0}
+    results = {"fast@10k": 1.1, "slow@10k": 2.0, "new@10k": 5.0, "missing@10k": 1.0}
+
+    regressions = compare_to_baseline(results, baseline, threshold=1.25)
+
+    assert [r["name"] for r in regressions] == ["slow@10k"]
+    assert regressions[0]["ratio"] == 2.0
+
+
+def test_save_and_load_results_round_trip(tmp_path):
+    path = str(tmp_path / "baseline.json")
+    save_results(path, {"load_data@10k": 0.5})
+    assert load_results(path) == {"load_data@10k": 0.5}
+    assert load_results(str(tmp_path / "missing.json")) == {}
@@ -0,0 +1,62 @@
+import asyncio
+import json
+import httpx
+import pytest
+from api.model import PatientFeatures
+from bench.load import flatten, load_payloads, run_load, summarize, synthetic_payloads
+from collections import Counter
+from fastapi import FastAPI, HTTPException
+
+
+def _app():
+    app = FastAPI()
+
+    @app.post("/predict")
+    async def predict(features: PatientFeatures):
+        if features.age == 13:
+            raise HTTPException(status_code=503)
+        return {"readmission_probability": 0.5}
+
+    return app
+
+
+def test_synthetic_payloads_are_valid_patient_features():
+    payloads = synthetic_payloads(50, seed=1)
+    assert payloads == synthetic_payloads(50, seed=1)
+    for payload in payloads:
+        PatientFeatures(**payload)
+
+
+def test_load_payloads_skips_blank_lines(tmp_path):
+    path = tmp_path / "traffic.jsonl"
+    path.write_text(json.dumps({"age": 60}) + "\n\n" + json.dumps({"age": 70}) + "\n")
+    assert load_payloads(str(path)) == [{"age": 60}, {"age": 70}]
+
+
+@pytest.mark.parametrize("mode", [{"rate": 200}, {"concurrency": 4}])
+def test_run_load_reports_latency_and_errors(mode):
+    payloads = [{"age": 60}, {"age": 13}]
+    summary = asyncio.run(
+        run_load(
+            "http://test", payloads, duration=0.3, warmup=0.05,
+            transport=httpx.ASGITransport(app=_app()), **mode,
+        )
+    )
+    assert summary["requests"] > 10
+    assert summary["outcomes"].keys() == {"200", "503"}
+    assert summary["error_rate"] == pytest.approx(0.5, abs=0.1)
+    assert 0 < summary["latency"]["p50"] <= summary["latency"]["p99"] <= summary["latency"]["max"]
+
+
+def test_run_load_requires_one_mode():
+    with pytest.raises(ValueError):
+        asyncio.run(run_load("http://test", [{}], duration=1, rate=10, concurrency=2))
+
+
+def test_summarize_and_flatten():
+    summary = summarize([0.1, 0.2, 0.3], Counter({"200": 3, "ReadTimeout": 1}), elapsed=2.0)
+    assert summary["errors"] == 1
+    assert summary["throughput"] == 1.5
+    results = flatten(summary)
+    assert results["latency_max"] == 0.3
+    assert results["error_rate"] == 0.25
@@ -0,0 +1,24 @@
+from bench.synthetic import format_size, generate_encounter_fact, parse_size
+from ml.data import FEATURES, load_training_data
+
+
+def test_parse_and_format_size():
+    assert parse_size("10k") == 10_000
+    assert parse_size("1M") == 1_000_000
+    assert parse_size("250") == 250
+    assert format_size(100_000) == "100k"
+    assert format_size(10_000_000) == "10M"
+
+
+def test_generate_encounter_fact(db):
+    generate_encounter_fact(db, 2_000)
+
+    stats = db.execute(
+        "SELECT COUNT(*) AS n, AVG(readmitted::INT) AS rate FROM readmission.encounter_fact"
+    )
+    assert stats["n"][0] == 2_000
+    assert 0.02 < stats["rate"][0] < 0.4
+
+    X_train, y_train, X_test, y_test = load_training_data(db, FEATURES)
+    assert len(X_train) + len(X_test) == 2_000
+    assert list(X_train.columns) == FEATURES
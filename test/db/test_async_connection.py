@@ -0,0 +1,80 @@
+import asyncio
+import numpy as np
+import pytest
+import time
+from db.async_connection import AsyncDBConnection
+
+# Runs far longer than any test timeout unless interrupted
+ENDLESS_QUERY = "SELECT count(*) FROM range(1000000000000) t(i) WHERE hash(i) % 7 = 0"
+TICK = 0.01
+
+
+async def _ticker(ticks: list):
+    """Record how often the event loop gets to run while other work is in flight."""
+    while True:
+        ticks.append(time.perf_counter())
+        await asyncio.sleep(TICK)
+
+
+def test_fetch_columns_returns_arrays():
+    async def main():
+        async with AsyncDBConnection() as conn:
+            return await conn.fetch_columns("SELECT i, i * 2 AS doubled FROM range(5) t(i)")
+
+    columns = asyncio.run(main())
+
+    assert list(columns) == ["i", "doubled"]
+    assert isinstance(columns["doubled"], np.ndarray)
+    assert columns["doubled"].tolist() == [0, 2, 4, 6, 8]
+
+
+def test_event_loop_stays_responsive_and_timeout_frees_worker():
+    async def main():
+        ticks = []
+        async with AsyncDBConnection(max_workers=1) as conn:
+            ticker = asyncio.create_task(_ticker(ticks))
+            start = time.perf_counter()
+            with pytest.raises(TimeoutError):
+                await conn.fetch_columns(ENDLESS_QUERY, timeout=0.5)
+            timed_out = time.perf_counter() - start
+            # The only worker is free again once the interrupt lands
+            columns = await conn.fetch_columns("SELECT 42 AS answer", timeout=5)
+            ticker.cancel()
+        return ticks, timed_out, columns
+
+    ticks, timed_out, columns = asyncio.run(main())
+
+    assert timed_out < 1.0
+    assert columns["answer"][0] == 42
+    # The loop kept ticking while the query ran (a blocking call would allow one tick)
+    assert len(ticks) > 20
+    assert max(np.diff(ticks)) < 0.25
+
+
+def test_cancelled_query_is_interrupted():
+    async def main():
+        async with AsyncDBConnection(max_workers=1, timeout=None) as conn:
+            task = asyncio.create_task(conn.fetch_columns(ENDLESS_QUERY))
+            await asyncio.sleep(0.2)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            return await conn.fetch_columns("SELECT 1 AS one", timeout=5)
+
+    assert asyncio.run(main())["one"][0] == 1
+
+
+def test_queries_wait_for_a_bounded_pool(tmp_path):
+    async def main():
+        async with AsyncDBConnection(str(tmp_path / "pool.duckdb"), max_workers=2) as conn:
+            await conn.execute("CREATE TABLE t AS SELECT range AS i FROM range(10)")
+            results = await asyncio.gather(
+                *(conn.fetch_columns("SELECT sum(i) AS total FROM t WHERE i < $n", {"n": n}) for n in range(1, 9))
+            )
+            workers = len(conn._pool._threads)
+        return [r["total"][0] for r in results], workers
+
+    totals, workers = asyncio.run(main())
+
+    assert totals == [sum(range(n)) for n in range(1, 9)]
+    assert workers <= 2
@@ -0,0 +1,106 @@
+import pandas as pd
+import pytest
+from bench.synthetic import generate_encounter_fact
+from db.cohort_cube import (
+    CUBE_TABLE,
+    FEATURE_TABLE,
+    build_cohort_cube,
+    cohort_query,
+    parse_filters,
+    query_cohorts,
+    refresh_cohort_cube,
+)
+
+
+@pytest.fixture
+def feature_store(db):
+    generate_encounter_fact(db, 5000)
+    return db
+
+
+def _cube(db):
+    return db.execute(f"SELECT * FROM {CUBE_TABLE} ORDER BY ALL")
+
+
+@pytest.mark.parametrize(
+    "group_by, filters",
+    [
+        ([], {}),
+        (["gender_key", "age_band"], {}),
+        (["race_key"], {"has_diabetes": True, "age_band": 70}),
+    ],
+)
+def test_cube_answers_like_the_base_table(feature_store, group_by, filters):
+    build_cohort_cube(feature_store)
+
+    from_cube, source = query_cohorts(feature_store, group_by, filters)
+    from_base, _ = query_cohorts(feature_store, group_by, filters, use_cube=False)
+
+    assert source == "cube"
+    assert from_cube["encounters"].sum() > 0
+    pd.testing.assert_frame_equal(from_cube, from_base, check_dtype=False)
+
+
+def test_other_dimensions_fall_back_to_the_base_table(feature_store):
+    build_cohort_cube(feature_store)
+
+    by_year, source = query_cohorts(feature_store, ["start_year"], {"has_copd": True})
+    _, uncovered_filter = query_cohorts(feature_store, ["gender_key"], {"had_surgery": True})
+
+    assert source == "base" and uncovered_filter == "base"
+    assert cohort_query(["gender_key"], use_cube=False)[2] == "base"
+    copd = feature_store.execute(f"SELECT count(*) AS n FROM {FEATURE_TABLE} WHERE has_copd")["n"][0]
+    assert by_year["encounters"].sum() == copd
+
+
+def test_refresh_adds_appended_encounters(feature_store):
+    assert refresh_cohort_cube(feature_store)["mode"] == "full"
+    feature_store.execute(
+        f"INSERT INTO {FEATURE_TABLE} SELECT * REPLACE (encounter_key + 100000 AS encounter_key) "
+        f"FROM {FEATURE_TABLE} WHERE encounter_key <= 50",
+        ddl=True,
+    )
+
+    result = refresh_cohort_cube(feature_store)
+    refreshed = _cube(feature_store)
+    build_cohort_cube(feature_store)
+
+    assert result == {"mode": "incremental", "new": 50, "cells": len(refreshed)}
+    pd.testing.assert_frame_equal(refreshed, _cube(feature_store))
+    assert refresh_cohort_cube(feature_store)["new"] == 0
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        "UPDATE {table} SET readmitted = NOT readmitted WHERE encounter_key = 7",
+        "UPDATE {table} SET readmitted = NULL WHERE encounter_key = 7",
+        "DELETE FROM {table} WHERE encounter_key <= 100",
+        # Counted encounters moved to other cube cells (e.g. by an upsert of the load)
+        "UPDATE {table} SET has_diabetes = NOT has_diabetes WHERE encounter_key % 2 = 0",
+        "UPDATE {table} SET age_at_encounter = age_at_encounter + 10 WHERE encounter_key = 7",
+        "UPDATE {table} SET gender_key = 3 - gender_key WHERE encounter_key = 7",
+        # Below the watermark, so an append would miss it
+        "INSERT INTO {table} SELECT * REPLACE (-encounter_key AS encounter_key) FROM {table} WHERE encounter_key = 1",
+    ],
+)
+def test_refresh_rebuilds_when_counted_encounters_change(feature_store, change):
+    build_cohort_cube(feature_store)
+    feature_store.execute(change.format(table=FEATURE_TABLE), ddl=True)
+
+    assert refresh_cohort_cube(feature_store)["mode"] == "full"
+    from_cube, _ = query_cohorts(feature_store, ["age_band"])
+    from_base, _ = query_cohorts(feature_store, ["age_band"], use_cube=False)
+    pd.testing.assert_frame_equal(from_cube, from_base, check_dtype=False)
+
+
+def test_invalid_queries_are_rejected():
+    assert parse_filters(["has_diabetes=True", "age_band=70"]) == {"has_diabetes": True, "age_band": 70}
+    with pytest.raises(ValueError, match="not dimension=value"):
+        parse_filters(["has_diabetes"])
+    with pytest.raises(ValueError, match="boolean or integer"):
+        parse_filters(["gender_key=f"])
+    with pytest.raises(ValueError, match="Unknown cohort dimensions"):
+        cohort_query(["patient_key"])
+    with pytest.raises(ValueError, match="Unknown cohort dimensions"):
+        cohort_query([], {"1=1 OR gender_key": 1})
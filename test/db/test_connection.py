@@ -60,3 +60,19 @@ def test_create_db_connection_invalid():
     config = {"db_type": "unknown"}
     with pytest.raises(ValueError, match="Unsupported database type"):
         create_db_connection(config)
+
+
+def test_fetch_record_batches_streams_in_batches(db):
+    batches = list(db.fetch_record_batches("SELECT range AS id FROM range(10)", batch_size=4))
+    assert sum(b.num_rows for b in batches) == 10
+    assert all(b.num_rows <= 4 for b in batches)
+
+
+def test_insert_arrow(db):
+    import pyarrow as pa
+
+    db.execute("CREATE TABLE scores (id INTEGER, score FLOAT);", ddl=True)
+    db.insert_arrow("scores", pa.table({"id": [1, 2], "score": [0.25, 0.75]}))
+    df = db.execute("SELECT * FROM scores ORDER BY id;")
+    assert df["id"].tolist() == [1, 2]
+    assert df["score"].tolist() == [0.25, 0.75]
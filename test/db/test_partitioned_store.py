@@ -0,0 +1,119 @@
+import glob
+import os
+import pytest
+from bench.synthetic import generate_encounter_fact
+from db import snapshot
+from db.connection import DuckDBConnection
+from db.partitioned_store import (
+    FEATURE_TABLE,
+    PARTITIONED_VIEW,
+    current_version,
+    is_partitioned,
+    list_versions,
+    materialize_partitions,
+    partition_predicate,
+    prune_versions,
+)
+from ml.data import FEATURES, load_training_data
+
+
+@pytest.fixture
+def partitioned(db, tmp_path):
+    generate_encounter_fact(db, 2000)
+    materialize_partitions(db, str(tmp_path))
+    return db, tmp_path
+
+
+def _count(db, table, where="TRUE"):
+    return int(db.execute(f"SELECT count(*) AS n FROM {table} WHERE {where}")["n"][0])
+
+
+def test_materialize_writes_every_row_by_month(partitioned):
+    db, tmp_path = partitioned
+
+    assert _count(db, PARTITIONED_VIEW) == _count(db, FEATURE_TABLE)
+    assert is_partitioned(db, PARTITIONED_VIEW) and not is_partitioned(db, FEATURE_TABLE)
+    march = glob.glob(os.path.join(current_version(tmp_path), "start_year=2015", "start_month=3", "*.parquet"))
+    assert march
+    assert _count(db, f"read_parquet('{march[0]}')", "month(encounter_start) != 3") == 0
+
+
+def test_partition_predicate_covers_overlapping_months():
+    predicate = partition_predicate("2016-03-15", "2017-02-01")
+
+    assert "start_year = 2016 AND start_month >= 3" in predicate
+    # The end date is exclusive, so January 2017 is the last month kept
+    assert "start_year = 2017 AND start_month <= 1" in predicate
+    assert partition_predicate() == "TRUE"
+
+
+def test_window_load_skips_other_partitions(partitioned):
+    db, tmp_path = partitioned
+    expected = load_training_data(db, FEATURES, "2016-10-01", "2016-01-01", "2017-01-01")
+    # A file outside the window that cannot be read: the load only succeeds if it is pruned
+    for path in glob.glob(os.path.join(current_version(tmp_path), "start_year=2012", "*", "*.parquet")):
+        with open(path, "wb") as f:
+            f.write(b"not parquet")
+
+    X_train, y_train, X_test, y_test = load_training_data(
+        db, FEATURES, "2016-10-01", "2016-01-01", "2017-01-01", table=PARTITIONED_VIEW
+    )
+
+    assert len(X_train) == len(expected[0]) and len(X_test) == len(expected[2])
+    assert X_train.dtypes.equals(expected[0].dtypes)
+    assert y_train.sum() == expected[1].sum()
+
+
+def test_range_refresh_rewrites_only_its_months(partitioned):
+    db, tmp_path = partitioned
+    previous = current_version(tmp_path)
+    untouched = glob.glob(os.path.join(previous, "start_year=2013", "*", "*.parquet"))
+    db.execute(
+        f"UPDATE {FEATURE_TABLE} SET num_meds = 99 WHERE encounter_start >= DATE '2016-01-01'", ddl=True
+    )
+
+    materialize_partitions(db, str(tmp_path), "2016-02-10", "2016-03-05")
+
+    # February and March are rewritten in full; other months share the previous version's files
+    refreshed = "encounter_start >= DATE '2016-02-01' AND encounter_start < DATE '2016-04-01'"
+    assert _count(db, PARTITIONED_VIEW, f"{refreshed} AND num_meds != 99") == 0
+    assert _count(db, PARTITIONED_VIEW, "encounter_start >= DATE '2016-04-01' AND num_meds = 99") == 0
+    assert _count(db, PARTITIONED_VIEW) == _count(db, FEATURE_TABLE)
+    assert current_version(tmp_path) != previous
+    linked = [path.replace(previous, current_version(tmp_path)) for path in untouched]
+    assert all(os.path.samefile(old, new) for old, new in zip(untouched, linked))
+
+
+def test_refresh_leaves_published_snapshots_unchanged(tmp_path):
+    database, partitions, snapshots = (str(tmp_path / name) for name in ("build.duckdb", "parts", "snaps"))
+    with DuckDBConnection(database) as conn:
+        generate_encounter_fact(conn, 1000)
+        materialize_partitions(conn, partitions)
+    published = snapshot.publish_snapshot(database, snapshots, retain=1)
+    with DuckDBConnection(database) as conn:
+        conn.execute(f"UPDATE {FEATURE_TABLE} SET num_meds = 99", ddl=True)
+        materialize_partitions(conn, partitions, "2016-01-01", "2017-01-01")
+
+    # Both versions are still read: CURRENT by the build database, the first by the snapshot
+    assert prune_versions(partitions, snapshots) == []
+    with DuckDBConnection(published, read_only=True) as reader:
+        assert _count(reader, PARTITIONED_VIEW, "num_meds = 99") == 0
+        assert _count(reader, PARTITIONED_VIEW) == 1000
+
+    snapshot.publish_snapshot(database, snapshots, retain=1)
+    removed = prune_versions(partitions, snapshots)
+
+    assert len(removed) == 1 and list_versions(partitions) == [current_version(partitions)]
+
+
+def test_failed_refresh_keeps_the_current_version(partitioned):
+    db, tmp_path = partitioned
+    previous = current_version(tmp_path)
+
+    with pytest.raises(Exception):
+        materialize_partitions(db, str(tmp_path), "2016-01-01", "2016-02-01", source="readmission.missing")
+
+    assert current_version(tmp_path) == previous
+    assert list_versions(tmp_path) == [previous]
+    assert sorted(os.listdir(tmp_path)) == ["CURRENT", os.path.basename(previous)]
+    assert _count(db, PARTITIONED_VIEW) == _count(db, FEATURE_TABLE)
@@ -0,0 +1,71 @@
+import duckdb
+import pytest
+
+from db.query_profile import (
+    diff_reports,
+    enable_profiling,
+    latest_report,
+    load_report,
+    profile_file,
+    save_report,
+    build_report,
+)
+
+
+@pytest.fixture
+def sql_file(tmp_path):
+    path = tmp_path / "build.sql"
+    path.write_text(
+        """
+        -- numbers
+        CREATE TABLE numbers AS SELECT range AS i FROM range(1000);
+        INSERT INTO numbers SELECT range FROM range(10);
+        SELECT count(*) FROM numbers WHERE i % 2 = 0;
+        INSERT INTO numbers SELECT range FROM range(10);
+        """
+    )
+    return path
+
+
+def test_profile_file_records_each_statement(sql_file, tmp_path):
+    conn = duckdb.connect()
+    enable_profiling(conn)
+    statements = profile_file(conn, str(sql_file), str(tmp_path))
+    conn.close()
+
+    assert [s["index"] for s in statements] == [0, 1, 2, 3]
+    assert [s["rows"] for s in statements] == [1000, 10, 1, 10]
+    assert all(s["file"] == "build.sql" for s in statements)
+    assert all(s["wall_time"] > 0 for s in statements)
+    assert statements[0]["plan"][0]["operator"] == "CREATE_TABLE_AS"
+    # Identical statements get distinct, stable keys
+    assert len({s["key"] for s in statements}) == 4
+    assert statements[3]["key"] == statements[1]["key"] + ".2"
+
+
+def _report(times):
+    return build_report([
+        {"key": k, "label": k, "wall_time": t, "rows": 1} for k, t in times.items()
+    ])
+
+
+def test_diff_reports_flags_regressions():
+    previous = _report({"a": 1.0, "b": 1.0, "c": 0.001, "gone": 1.0})
+    current = _report({"a": 1.1, "b": 2.0, "c": 0.01, "added": 1.0})
+
+    diff = diff_reports(current, previous, threshold=1.25, min_seconds=0.05)
+
+    # "c" is 10x slower but below the noise floor
+    assert [r["key"] for r in diff["regressions"]] == ["b"]
+    assert diff["regressions"][0]["ratio"] == pytest.approx(2.0)
+    assert [s["key"] for s in diff["new"]] == ["added"]
+    assert [s["key"] for s in diff["removed"]] == ["gone"]
+
+
+def test_save_and_find_latest_report(tmp_path):
+    assert latest_report(str(tmp_path)) is None
+    save_report(_report({"a": 1.0}), str(tmp_path))
+    path = save_report(_report({"a": 2.0}), str(tmp_path))
+
+    assert latest_report(str(tmp_path)) == path
+    assert load_report(path)["statements"][0]["wall_time"] == 2.0
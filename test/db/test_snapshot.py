@@ -0,0 +1,64 @@
+import duckdb
+import os
+import pytest
+import stat
+from db import snapshot
+from db.connection import create_db_connection
+
+
+@pytest.fixture
+def build_db(tmp_path):
+    database = str(tmp_path / "ehr.duckdb")
+    with duckdb.connect(database) as conn:
+        conn.execute("CREATE TABLE t AS SELECT range AS i FROM range(100)")
+    return database
+
+
+def test_publish_creates_read_only_current_snapshot(build_db, tmp_path):
+    snapshot_dir = str(tmp_path / "snapshots")
+
+    path = snapshot.publish_snapshot(build_db, snapshot_dir)
+
+    assert snapshot.current_snapshot(snapshot_dir) == path
+    assert stat.S_IMODE(os.stat(path).st_mode) == snapshot.READ_ONLY_MODE
+    with duckdb.connect(path, read_only=True) as conn:
+        assert conn.execute("SELECT count(*) FROM t").fetchone()[0] == 100
+    assert not [f for f in os.listdir(snapshot_dir) if f.endswith(".partial")]
+
+
+def test_snapshot_is_isolated_from_later_builds(build_db, tmp_path):
+    snapshot_dir = str(tmp_path / "snapshots")
+    first = snapshot.publish_snapshot(build_db, snapshot_dir)
+
+    # A build holding the write lock does not block snapshot readers
+    with duckdb.connect(build_db) as writer:
+        writer.execute("INSERT INTO t SELECT range FROM range(50)")
+        with duckdb.connect(first, read_only=True) as reader:
+            assert reader.execute("SELECT count(*) FROM t").fetchone()[0] == 100
+
+    second = snapshot.publish_snapshot(build_db, snapshot_dir)
+    assert second != first
+    assert snapshot.current_snapshot(snapshot_dir) == second
+    with duckdb.connect(second, read_only=True) as reader:
+        assert reader.execute("SELECT count(*) FROM t").fetchone()[0] == 150
+
+
+def test_retention_keeps_newest_snapshots(build_db, tmp_path):
+    snapshot_dir = str(tmp_path / "snapshots")
+    published = [snapshot.publish_snapshot(build_db, snapshot_dir, retain=2) for _ in range(4)]
+
+    assert snapshot.list_snapshots(snapshot_dir) == published[-2:]
+    assert snapshot.current_snapshot(snapshot_dir) == published[-1]
+
+
+def test_reader_connection_uses_current_snapshot(build_db, tmp_path):
+    config = {"db_type": "duckdb", "database": build_db, "snapshot_dir": str(tmp_path / "snapshots")}
+
+    # Before the first publish, readers fall back to the build database
+    assert create_db_connection(config, snapshot=True).database == build_db
+
+    path = snapshot.publish_snapshot(build_db, config["snapshot_dir"])
+    reader = create_db_connection(config, snapshot=True)
+    assert reader.database == path
+    assert reader.execute("SELECT count(*) AS n FROM t")["n"][0] == 100
+    assert create_db_connection(config).database == build_db
@@ -0,0 +1,81 @@
+import json
+import pytest
+from db import table_profile
+
+
+@pytest.fixture
+def staging(db):
+    db.execute("CREATE SCHEMA staging", ddl=True)
+    db.execute(
+        """
+        CREATE TABLE staging.patients AS
+        SELECT
+            range AS id,
+            CASE WHEN range % 4 = 0 THEN NULL ELSE 'p' || (range % 10) END AS name,
+            DATE '2020-01-01' + (range % 365)::INT AS birth_date,
+            range % 2 = 0 AS flag
+        FROM range(1000)
+        """,
+        ddl=True,
+    )
+    db.execute("CREATE TABLE staging.big AS SELECT range AS id FROM range(500000)", ddl=True)
+    return db
+
+
+def test_profile_computes_column_statistics(staging):
+    report = table_profile.profile_tables(staging.connect(), "staging", ["patients", "absent"])
+
+    patients, absent = report["tables"]
+    assert absent["status"] == "missing"
+    assert patients["status"] == "ok"
+    assert patients["row_count"] == 1000
+    assert patients["sampled_rows"] is None
+    columns = {c["column"]: c for c in patients["columns"]}
+    assert columns["id"]["min"] == "0" and columns["id"]["max"] == "999"
+    assert columns["id"]["mean"] == pytest.approx(499.5)
+    assert columns["name"]["null_rate"] == pytest.approx(0.25)
+    assert columns["name"]["mean"] is None
+    assert 8 <= columns["name"]["approx_distinct"] <= 12
+    assert columns["birth_date"]["min"] == "2020-01-01"
+    assert columns["flag"]["mean"] == pytest.approx(0.5)
+
+
+def test_duplicate_tables_are_profiled_once(staging):
+    report = table_profile.profile_tables(staging.connect(), "staging", ["patients", "big", "patients"])
+
+    assert [t["table"] for t in report["tables"]] == ["patients", "big"]
+    assert all(t["status"] == "ok" for t in report["tables"])
+
+
+def test_large_tables_are_sampled(staging):
+    report = table_profile.profile_tables(staging.connect(), "staging", ["big"], sample_rows=100_000)
+
+    big = report["tables"][0]
+    assert big["row_count"] == 500_000
+    assert 0 < big["sampled_rows"] < 500_000
+
+
+def test_time_budget_interrupts_unfinished_tables(db):
+    db.execute("CREATE SCHEMA staging", ddl=True)
+    db.execute("CREATE TABLE staging.huge AS SELECT range AS id, range::VARCHAR AS s FROM range(5000000)", ddl=True)
+
+    report = table_profile.profile_tables(
+        db.connect(), "staging", ["huge"], sample_rows=None, time_budget=0.001
+    )
+
+    assert report["tables"][0]["status"] == "timeout"
+
+
+def test_profile_is_saved_as_table_and_json(staging, tmp_path):
+    report = table_profile.profile_tables(staging.connect(), "staging", ["patients"])
+
+    written = table_profile.write_profile_table(staging, report)
+    path = table_profile.save_report(report, str(tmp_path / "profile.json"))
+
+    assert written == 4
+    rows = staging.execute(
+        "SELECT column_name, null_rate FROM staging.staging_profile WHERE table_name = 'patients' ORDER BY column_name"
+    )
+    assert list(rows["column_name"]) == ["birth_date", "flag", "id", "name"]
+    with open(path) as f:
+        assert json.load(f)["tables"][0]["row_count"] == 1000
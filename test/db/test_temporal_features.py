@@ -0,0 +1,68 @@
+import pytest
+from db.temporal_features import TEMPORAL_FEATURES, apply_temporal_features, window_sql
+
+ENCOUNTERS = [
+    # encounter_key, patient_key, start, end, chronic_dx_count
+    (1, 1, "2020-01-01", "2020-01-05", 1),
+    (2, 1, "2020-01-20", "2020-01-21", 2),
+    (3, 1, "2020-01-20", "2020-01-22", 0),
+    (4, 1, "2020-03-15", "2020-03-16", 1),
+    (5, 1, "2021-03-20", "2021-03-25", 3),
+    (6, 2, "2020-01-10", "2020-01-11", 4),
+]
+
+
+@pytest.fixture
+def feature_table(db):
+    db.execute("CREATE SCHEMA readmission", ddl=True)
+    db.execute(
+        """
+        CREATE TABLE readmission.encounter_fact (
+            encounter_key INTEGER PRIMARY KEY,
+            patient_key INTEGER,
+            encounter_start DATE,
+            encounter_end DATE,
+            chronic_dx_count USMALLINT
+        )
+        """,
+        ddl=True,
+    )
+    values = ", ".join(f"({k}, {p}, DATE '{s}', DATE '{e}', {c})" for k, p, s, e, c in ENCOUNTERS)
+    db.execute(f"INSERT INTO readmission.encounter_fact VALUES {values}", ddl=True)
+    return db
+
+
+def test_history_features(feature_table):
+    apply_temporal_features(feature_table)
+
+    df = feature_table.execute("SELECT * FROM readmission.encounter_fact ORDER BY encounter_key")
+    rows = df.set_index("encounter_key")
+
+    assert list(rows["prior_encounters_30d"]) == [0, 1, 1, 0, 0, 0]
+    assert list(rows["prior_encounters_90d"]) == [0, 1, 1, 3, 0, 0]
+    assert list(rows["prior_encounters_365d"]) == [0, 1, 1, 3, 0, 0]
+    # Encounters on the same day do not see each other
+    assert rows.loc[2, "days_since_last_discharge"] == 15
+    assert rows.loc[4, "days_since_last_discharge"] == 53
+    assert rows[["days_since_last_discharge"]].isna().loc[[1, 6]].all().all()
+    # Cumulative counts include the encounter's own date
+    assert list(rows["cumulative_chronic_dx_count"]) == [1, 3, 3, 4, 7, 4]
+
+
+def test_windows_share_one_sort():
+    sql = window_sql()
+
+    assert sql.count("PARTITION BY") == 1
+    assert all(f"AS {name}" in sql for name in TEMPORAL_FEATURES)
+
+
+def test_custom_feature_adds_column(feature_table):
+    features = {"max_chronic_dx_30d": {"aggregate": "max(chronic_dx_count)", "days": 30, "type": "USMALLINT"}}
+
+    apply_temporal_features(feature_table, features)
+
+    df = feature_table.execute(
+        "SELECT max_chronic_dx_30d FROM readmission.encounter_fact ORDER BY encounter_key"
+    )
+    assert df["max_chronic_dx_30d"].isna().tolist() == [True, False, False, True, True, True]
+    assert df["max_chronic_dx_30d"][1] == 1
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from ml.artifact import compare_artifact, export_compact_model
+from ml.model import CompactLinearModel, CompactTreeModel, ReadmissionModel, load_compact_model
+from ml.train import train_logistic_regression, train_xgboost
+
+
+def test_xgboost_artifact_matches_original(synthetic_data, tmp_path):
+    X_train, y_train, X_test, y_test = synthetic_data
+    model, _ = train_xgboost(X_train, y_train, X_test, y_test)
+    path = str(tmp_path / "model.npz")
+
+    header = export_compact_model(model, path)
+    compact = load_compact_model(path)
+
+    assert isinstance(compact, CompactTreeModel)
+    assert header["feature_names"] == list(X_train.columns)
+    np.testing.assert_allclose(
+        compact.predict_proba(X_test)[:, 1], model.predict_proba(X_test)[:, 1], atol=1e-5
+    )
+
+
+def test_logreg_artifact_matches_original(synthetic_data, tmp_path):
+    X_train, y_train, X_test, y_test = synthetic_data
+    model, _ = train_logistic_regression(X_train, y_train, X_test, y_test)
+    path = str(tmp_path / "model.npz")
+
+    export_compact_model(model, path)
+    compact = load_compact_model(path)
+
+    assert isinstance(compact, CompactLinearModel)
+    np.testing.assert_allclose(
+        compact.predict_proba(X_test)[:, 1], model.predict_proba(X_test)[:, 1], atol=1e-5
+    )
+
+
+def test_pruning_drops_trees_and_reports_delta(synthetic_data, tmp_path):
+    X_train, y_train, X_test, y_test = synthetic_data
+    model, _ = train_xgboost(X_train, y_train, X_test, y_test)
+    path = str(tmp_path / "model.npz")
+
+    # Trees below the mean gain are dropped
+    num_trees = model.get_booster().num_boosted_rounds()
+    header = export_compact_model(model, path, min_gain_fraction=1.0 / num_trees)
+    report = compare_artifact(model, path, X_test, repeats=1)
+
+    assert header["num_pruned_trees"] > 0
+    assert header["num_trees"] + header["num_pruned_trees"] == num_trees
+    assert report["num_pruned_trees"] == header["num_pruned_trees"]
+    assert report["artifact_bytes"] > 0
+    assert report["rows_compared"] == len(X_test)
+
+
+def test_checksum_mismatch_raises(synthetic_data, tmp_path):
+    X_train, y_train, X_test, y_test = synthetic_data
+    model, _ = train_logistic_regression(X_train, y_train, X_test, y_test)
+    path = str(tmp_path / "model.npz")
+    export_compact_model(model, path)
+
+    with np.load(path) as data:
+        arrays = dict(data)
+    arrays["coef"] = arrays["coef"] + 1
+    np.savez(path, **arrays)
+
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        load_compact_model(path)
+
+
+def test_readmission_model_loads_artifact(synthetic_data, tmp_path):
+    X_train, y_train, X_test, y_test = synthetic_data
+    model, _ = train_logistic_regression(X_train, y_train, X_test, y_test)
+    path = str(tmp_path / "model.npz")
+    export_compact_model(model, path)
+
+    prob = ReadmissionModel(path).predict(list(X_test.iloc[0]))
+    assert prob == pytest.approx(model.predict_proba(X_test.iloc[:1])[0, 1], abs=1e-5)
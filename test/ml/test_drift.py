@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+from ml.drift import DriftMonitor, build_reference, load_reference, reference_path, save_reference
+
+FEATURES = ["age", "num_meds", "gender_key", "has_diabetes"]
+
+
+def _frame(rng, rows, age_mean=60.0, female_share=0.5):
+    return pd.DataFrame({
+        "age": rng.normal(age_mean, 12, rows).round().clip(18, 100),
+        "num_meds": rng.poisson(4, rows).astype(float),
+        "gender_key": np.where(rng.random(rows) < female_share, 1.0, 2.0),
+        "has_diabetes": (rng.random(rows) < 0.3).astype(float),
+    })
+
+
+def _monitor(reference, X):
+    monitor = DriftMonitor(reference, FEATURES, batch_size=16, flush_interval=0.01).start()
+    for start in range(0, len(X), 100):
+        assert monitor.submit(X[start:start + 100])
+    monitor.stop()
+    return monitor
+
+
+def test_reference_round_trips_and_has_fixed_size_sketches(tmp_path):
+    rng = np.random.default_rng(0)
+    reference = build_reference(_frame(rng, 5_000))
+    path = reference_path(str(tmp_path / "v1.joblib"))
+    save_reference(reference, path)
+    assert path == str(tmp_path / "v1.drift.json")
+
+    loaded = load_reference(path)
+
+    assert loaded == reference
+    assert loaded["features"]["age"]["kind"] == "histogram"
+    # Quantile bins plus the bins below and above the training range
+    assert len(loaded["features"]["age"]["counts"]) <= 22
+    assert loaded["features"]["gender_key"]["values"] == [1.0, 2.0]
+    assert sum(loaded["features"]["has_diabetes"]["counts"]) == 5_000
+
+
+def test_matching_traffic_is_stable_and_shifted_traffic_drifts():
+    rng = np.random.default_rng(1)
+    reference = build_reference(_frame(rng, 20_000))
+
+    stable = _monitor(reference, _frame(rng, 5_000).to_numpy()).report()
+    shifted = _monitor(reference, _frame(rng, 5_000, age_mean=75.0, female_share=0.9).to_numpy()).report()
+
+    assert stable["rows"] == 5_000
+    assert stable["drifted"] == []
+    assert all(f["psi"] < 0.05 for f in stable["features"].values())
+    assert set(shifted["drifted"]) == {"age", "gender_key"}
+    assert shifted["features"]["age"]["ks"] > 0.3
+    assert shifted["features"]["gender_key"]["ks"] is None
+    assert shifted["features"]["num_meds"]["status"] == "stable"
+
+
+def test_unseen_values_count_as_other():
+    rng = np.random.default_rng(2)
+    reference = build_reference(_frame(rng, 1_000))
+    X = _frame(rng, 500).to_numpy(copy=True)
+    X[:, FEATURES.index("gender_key")] = 9.0
+
+    report = _monitor(reference, X).report()
+
+    assert report["features"]["gender_key"]["status"] == "drift"
+
+
+def test_memory_is_bounded_by_the_queue():
+    reference = build_reference(_frame(np.random.default_rng(3), 1_000))
+    # Not started, so nothing drains the queue
+    monitor = DriftMonitor(reference, FEATURES, max_queue=2)
+    results = [monitor.submit([60, 4, 1, 0]) for _ in range(5)]
+
+    assert results == [True, True, False, False, False]
+    report = monitor.report()
+    assert report["dropped"] == 3
+    assert report["features"]["age"]["psi"] is None
+
+
+def test_batch_submissions_are_bounded_by_rows():
+    reference = build_reference(_frame(np.random.default_rng(5), 1_000))
+    monitor = DriftMonitor(reference, FEATURES, max_pending_rows=250)
+    X = np.zeros((100, len(FEATURES)))
+
+    assert [monitor.submit(X) for _ in range(3)] == [True, True, False]
+    assert monitor.submit(X[:50])
+    assert monitor.report()["pending_rows"] == 250
+
+
+def test_monitor_requires_a_sketch_per_feature():
+    reference = build_reference(_frame(np.random.default_rng(4), 100))
+
+    with pytest.raises(ValueError, match="num_procedures"):
+        DriftMonitor(reference, FEATURES + ["num_procedures"])
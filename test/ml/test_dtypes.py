@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+from ml.data import load_training_data
+from ml.dtypes import feature_dtype_plan, widen_chunks
+
+
+@pytest.fixture
+def feature_store(db):
+    db.execute("CREATE SCHEMA readmission", ddl=True)
+    db.execute(
+        """
+        CREATE TABLE readmission.encounter_fact (
+            encounter_start DATE,
+            age_at_encounter INTEGER,
+            race_key UTINYINT,
+            num_meds USMALLINT,
+            has_diabetes BOOLEAN,
+            readmitted BOOLEAN,
+            notes VARCHAR
+        )
+        """,
+        ddl=True,
+    )
+    db.execute(
+        """
+        INSERT INTO readmission.encounter_fact VALUES
+            (DATE '2018-03-01', 70, 2, 300, TRUE, TRUE, 'x'),
+            (DATE '2016-05-01', NULL, 1, 4, FALSE, FALSE, 'y'),
+            (DATE '2017-01-01', 50, 3, 0, TRUE, FALSE, 'z')
+        """,
+        ddl=True,
+    )
+    return db
+
+
+def test_plan_follows_schema(feature_store):
+    plan = feature_dtype_plan(
+        feature_store, ["has_diabetes", "race_key", "num_meds", "age_at_encounter"], "readmission.encounter_fact"
+    )
+
+    # age_at_encounter holds a NULL, so it is planned as float32 (NaN)
+    assert plan == {"has_diabetes": "uint8", "race_key": "uint8", "num_meds": "uint16", "age_at_encounter": "float32"}
+
+
+def test_plan_rejects_unknown_and_text_columns(feature_store):
+    with pytest.raises(ValueError, match="not found"):
+        feature_dtype_plan(feature_store, ["missing"], "readmission.encounter_fact")
+    with pytest.raises(ValueError, match="notes"):
+        feature_dtype_plan(feature_store, ["notes"], "readmission.encounter_fact")
+
+
+def test_training_data_is_compact_sorted_and_split(feature_store):
+    features = ["age_at_encounter", "race_key", "num_meds", "has_diabetes"]
+
+    X_train, y_train, X_test, y_test = load_training_data(feature_store, features)
+
+    assert list(X_train["race_key"]) == [1, 3]
+    assert list(X_test["num_meds"]) == [300]
+    assert X_train["race_key"].dtype == np.uint8 and X_train["num_meds"].dtype == np.uint16
+    assert y_train.dtype == np.uint8 and list(y_test) == [1]
+    # The column holding a NULL is widened in both splits, with NaN as the missing value
+    assert X_train["age_at_encounter"].dtype == X_test["age_at_encounter"].dtype == np.float32
+    assert np.isnan(X_train["age_at_encounter"][0])
+
+
+def test_widen_chunks_covers_matrix_in_order():
+    X = pd.DataFrame({"a": np.arange(10, dtype=np.uint8), "b": np.arange(10, 20, dtype=np.uint16)})
+
+    chunks = list(widen_chunks(X, chunk_rows=4))
+
+    assert [len(c) for c in chunks] == [4, 4, 2]
+    assert all(c.dtype == np.float32 for c in chunks)
+    np.testing.assert_array_equal(np.vstack(chunks), X.to_numpy(dtype=np.float32))
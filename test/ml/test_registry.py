@@ -0,0 +1,134 @@
+import threading
+import time
+import numpy as np
+import pytest
+from joblib import dump
+from ml.artifact import export_compact_model
+from ml.model import ReadmissionModel
+from ml.registry import JOBLIB_MEMORY_FACTOR, ModelRegistry, save_metadata
+from sklearn.linear_model import LogisticRegression
+
+
+def _write(path, size):
+    with open(path, "wb") as f:
+        f.write(b"\0" * size)
+
+
+def _logreg():
+    rng = np.random.default_rng(0)
+    X = rng.random((200, 3))
+    return LogisticRegression().fit(X, (X[:, 0] > 0.5).astype(int))
+
+
+def test_discovers_artifacts_with_metadata(tmp_path):
+    model = _logreg()
+    dump(model, tmp_path / "v1.joblib")
+    export_compact_model(model, str(tmp_path / "v2.npz"), feature_names=["a", "b", "c"])
+    save_metadata(str(tmp_path / "v1.joblib"), {"auc": 0.7})
+    (tmp_path / "notes.txt").write_text("not a model")
+
+    registry = ModelRegistry(str(tmp_path))
+    described = {m["name"]: m for m in registry.models()}
+
+    assert set(described) == {"v1", "v2"}
+    assert described["v1"]["format"] == "joblib"
+    assert described["v1"]["metadata"] == {"auc": 0.7}
+    assert described["v1"]["memory_bytes"] == int(described["v1"]["file_bytes"] * JOBLIB_MEMORY_FACTOR)
+    assert described["v2"]["kind"] == "logreg"
+    assert described["v2"]["feature_names"] == ["a", "b", "c"]
+    assert not any(m["resident"] for m in described.values())
+
+
+def test_loads_on_first_request_and_then_hits(tmp_path):
+    dump(_logreg(), tmp_path / "v1.joblib")
+    events = []
+    registry = ModelRegistry(str(tmp_path), listener=lambda *event: events.append(event))
+
+    model = registry.get("v1")
+
+    assert isinstance(model, ReadmissionModel)
+    assert registry.get("v1") is model
+    assert registry.resident("v1") is model
+    stats = registry.stats()
+    assert (stats["loads"], stats["misses"], stats["hits"]) == (1, 1, 2)
+    assert [event[:2] for event in events] == [("load", "v1")]
+    with pytest.raises(KeyError, match="Unknown model"):
+        registry.get("v9")
+
+
+def test_evicts_least_recently_used_over_the_byte_budget(tmp_path):
+    # Only the file size matters: the loader does not read the files
+    for name in ("a", "b", "c"):
+        _write(tmp_path / f"{name}.joblib", 1000)
+    events = []
+    registry = ModelRegistry(
+        str(tmp_path), max_bytes=3500, listener=lambda *event: events.append(event), loader=lambda path: object()
+    )
+
+    registry.get("a")
+    registry.get("b")
+    registry.get("a")  # b is now the least recently used
+    registry.get("c")
+
+    stats = registry.stats()
+    assert stats["resident"] == ["a", "c"]
+    assert stats["resident_bytes"] == 3000
+    assert stats["evictions"] == 1
+    assert ("evict", "b", 1500) in events
+
+
+def test_eviction_releases_the_size_counted_at_load(tmp_path):
+    _write(tmp_path / "a.joblib", 1000)
+    _write(tmp_path / "b.joblib", 1000)
+    registry = ModelRegistry(str(tmp_path), max_bytes=3500, loader=lambda path: object())
+    registry.get("a")
+    registry.get("b")
+
+    # Rediscovery after the files changed must not skew the resident byte count
+    _write(tmp_path / "a.joblib", 5000)
+    (tmp_path / "b.joblib").unlink()
+    registry.discover()
+    registry.evict("a")
+    registry.evict("b")
+
+    assert registry.stats()["resident_bytes"] == 0
+
+
+def test_concurrent_requests_share_one_load(tmp_path):
+    dump(_logreg(), tmp_path / "v1.joblib")
+    loads = []
+
+    def slow_loader(path):
+        loads.append(path)
+        time.sleep(0.2)
+        return ReadmissionModel(path)
+
+    registry = ModelRegistry(str(tmp_path), loader=slow_loader)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("v1"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(loads) == 1
+    assert len(results) == 8 and all(model is results[0] for model in results)
+    assert registry.stats()["loading"] == []
+
+
+def test_failed_load_is_reported_and_retried(tmp_path):
+    dump(_logreg(), tmp_path / "v1.joblib")
+    attempts = []
+
+    def flaky_loader(path):
+        attempts.append(path)
+        if len(attempts) == 1:
+            raise ValueError("corrupt")
+        return ReadmissionModel(path)
+
+    registry = ModelRegistry(str(tmp_path), loader=flaky_loader)
+
+    with pytest.raises(ValueError, match="corrupt"):
+        registry.get("v1")
+    assert registry.get("v1") is not None
+    assert registry.stats()["load_errors"] == 1
@@ -0,0 +1,35 @@
+import numpy as np
+import pyarrow as pa
+from joblib import dump
+from ml.scoring import batch_to_matrix, score_batches
+from ml.train import train_logistic_regression
+
+
+def _batches(X, batch_size):
+    for start in range(0, len(X), batch_size):
+        chunk = X.iloc[start:start + batch_size]
+        yield pa.RecordBatch.from_pydict(
+            {"encounter_key": np.arange(start, start + len(chunk)), **{c: chunk[c].values for c in X.columns}}
+        )
+
+
+def test_batch_to_matrix_orders_features():
+    batch = pa.RecordBatch.from_pydict({"b": [True, False], "a": [1, 2], "encounter_key": [7, 8]})
+    X = batch_to_matrix(batch, ["a", "b"])
+    assert X.dtype == np.float32
+    np.testing.assert_array_equal(X, [[1, 1], [2, 0]])
+
+
+def test_score_batches_matches_model(synthetic_data, tmp_path):
+    X_train, y_train, X_test, y_test = synthetic_data
+    model, _ = train_logistic_regression(X_train, y_train, X_test, y_test)
+    model_path = str(tmp_path / "model.joblib")
+    dump(model, model_path)
+    features = list(X_test.columns)
+
+    results = list(score_batches(_batches(X_test, 15), model_path, features, workers=2))
+
+    keys = np.concatenate([k for k, _ in results])
+    probs = np.concatenate([p for _, p in results])
+    np.testing.assert_array_equal(keys, np.arange(len(X_test)))
+    np.testing.assert_allclose(probs, model.predict_proba(X_test.values)[:, 1], atol=1e-5)
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+from ml.shadow import ShadowScorer
+
+
+class ConstantModel:
+    def __init__(self, value):
+        self.value = value
+        self.batch_sizes = []
+
+    def predict_batch(self, X):
+        self.batch_sizes.append(len(X))
+        return np.full(len(X), self.value)
+
+
+class FailingModel:
+    def predict_batch(self, X):
+        raise RuntimeError("boom")
+
+
+def test_shadow_scorer_records_deltas():
+    candidate = ConstantModel(0.6)
+    scorer = ShadowScorer(candidate, batch_size=8).start()
+    for _ in range(20):
+        assert scorer.submit([1.0, 2.0, 3.0], 0.5)
+    scorer.stop()
+
+    stats = scorer.stats()
+    assert stats["submitted"] == 20
+    assert stats["scored"] == 20
+    assert stats["dropped"] == 0
+    assert stats["mean_delta"] == pytest.approx(0.1)
+    assert stats["max_abs_delta"] == pytest.approx(0.1)
+    assert max(candidate.batch_sizes) <= 8
+
+
+def test_shadow_scorer_drops_when_queue_full():
+    # Not started, so nothing drains the queue
+    scorer = ShadowScorer(ConstantModel(0.5), max_queue=2)
+    results = [scorer.submit([1.0], 0.5) for _ in range(5)]
+
+    assert results == [True, True, False, False, False]
+    assert scorer.stats()["dropped"] == 3
+
+
+def test_shadow_scorer_counts_candidate_errors():
+    scorer = ShadowScorer(FailingModel()).start()
+    scorer.submit([1.0], 0.5)
+    scorer.stop()
+
+    stats = scorer.stats()
+    assert stats["errors"] == 1
+    assert stats["scored"] == 0
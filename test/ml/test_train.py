@@ -1,4 +1,5 @@
-from ml.train import train_logistic_regression, train_xgboost
+import pytest
+from ml.train import train_logistic_regression, train_xgboost, train_xgboost_early_stopping
 
 
 def test_train_logistic_regression_runs(synthetic_data):
@@ -13,3 +14,30 @@ def test_train_xgboost_runs(synthetic_data):
     model, auc = train_xgboost(X_train, y_train, X_test, y_test)
     assert hasattr(model, "predict_proba")
     assert 0.0 <= auc <= 1.0
+
+
+def test_train_xgboost_early_stopping_runs(synthetic_data):
+    X_train, y_train, X_test, y_test = synthetic_data
+    model, auc = train_xgboost_early_stopping(
+        X_train, y_train, X_test, y_test, early_stopping_rounds=5, max_rounds=200
+    )
+    assert hasattr(model, "predict_proba")
+    assert model.best_iteration < 200
+    assert 0.0 <= auc <= 1.0
+
+
+def test_train_xgboost_early_stopping_respects_time_budget(synthetic_data):
+    X_train, y_train, X_test, y_test = synthetic_data
+    model, auc = train_xgboost_early_stopping(
+        X_train, y_train, X_test, y_test, time_budget=0.0, max_rounds=200
+    )
+    # The first candidate stops after one round and the rest are skipped
+    assert model.get_booster().num_boosted_rounds() == 1
+    assert 0.0 <= auc <= 1.0
+
+
+@pytest.mark.parametrize("fraction", [0.0, 1.0])
+def test_train_xgboost_early_stopping_rejects_empty_splits(synthetic_data, fraction):
+    X_train, y_train, X_test, y_test = synthetic_data
+    with pytest.raises(ValueError, match="validation_fraction"):
+        train_xgboost_early_stopping(X_train, y_train, X_test, y_test, validation_fraction=fraction)